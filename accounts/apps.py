@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class AccountsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "accounts"
+
+    def ready(self):
+        # drf-spectacular authentication extension'ini ro'yxatdan o'tkazish
+        from . import schema  # noqa: F401
+        from . import signals  # noqa: F401
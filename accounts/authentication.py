@@ -0,0 +1,229 @@
+"""
+Authentication
+==============
+
+SchemeDispatchAuthentication - Authorization sarlavhasi sxemasiga qarab
+faqat bitta authenticator'ni ishga tushiradi:
+
+    Authorization: Bearer <jwt>     -> StatelessJWTAuthentication
+    Authorization: Token <key>      -> CachedTokenAuthentication
+    Authorization: Basic <b64>      -> CachedBasicAuthentication
+    boshqa holda + session cookie   -> SessionAuthentication (CSRF bilan)
+    sarlavha ham, cookie ham yo'q   -> anonim (hech qanday so'rov yo'q)
+
+Oldingi zanjir (JWT -> Token -> Session -> Basic) har so'rovda hammasini
+aylanib chiqardi; masalan, Basic so'rovda cookie bo'lsa session ham
+bazadan o'qilardi.
+
+StatelessJWTAuthentication - foydalanuvchi bazadan emas, imzosi tekshirilgan
+token claim'laridan (user_id, username, email, is_staff) quriladi. Bekor
+qilingan tokenlar accounts/revocation.py deny-list'i orqali rad etiladi.
+To'liq User qatori kerak bo'lgan view'lar (profil, parol) full_user() ni
+chaqiradi.
+
+CachedTokenAuthentication - Token -> User natijasi accounts/token_cache.py
+(jarayon ichidagi LRU + umumiy cache) orqali.
+CachedBasicAuthentication - tasdiqlangan login/parol accounts/credential_cache.py
+orqali (har so'rovda PBKDF2 yo'q).
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import router
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import (
+    BaseAuthentication,
+    BasicAuthentication,
+    SessionAuthentication,
+    TokenAuthentication,
+    get_authorization_header,
+)
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from . import credential_cache, revocation, token_cache
+
+
+# ============================================
+# STATELESS JWT
+# ============================================
+
+class ClaimsUser(TokenUser):
+    """
+    Token claim'laridan qurilgan foydalanuvchi.
+    Claim'da yo'q atributlar (first_name, date_joined, auth_token ...)
+    birinchi murojaatda bazadan yuklanadigan User'dan olinadi.
+    """
+
+    @cached_property
+    def id(self):
+        # simplejwt claim'ni satr qilib yozadi - maydon turiga qaytaramiz
+        field = get_user_model()._meta.get_field(jwt_settings.USER_ID_FIELD)
+        return field.to_python(self.token[jwt_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def instance(self):
+        user_model = get_user_model()
+        try:
+            return user_model._default_manager.get(**{jwt_settings.USER_ID_FIELD: self.id})
+        except user_model.DoesNotExist:
+            raise AuthenticationFailed('User not found', code='user_not_found')
+
+    def __eq__(self, other):
+        if isinstance(other, get_user_model()):
+            return self.pk == other.pk
+        return super().__eq__(other)
+
+    __hash__ = TokenUser.__hash__
+
+    def __getattr__(self, attr):
+        if attr.startswith('_') or attr == 'token':
+            raise AttributeError(attr)
+        if attr in self.token:
+            return self.token[attr]
+        return getattr(self.instance, attr)
+
+
+def full_user(user):
+    """request.user ni o'zgartirish/saqlash uchun haqiqiy User obyektiga aylantirish"""
+    if isinstance(user, ClaimsUser):
+        return user.instance
+    return user
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """JWT: bazaga so'rovsiz, faqat deny-list tekshiruvi (cache)"""
+
+    def get_user(self, validated_token):
+        if jwt_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken('Token contained no recognizable user identification')
+        if revocation.is_revoked(validated_token):
+            raise InvalidToken('Token is revoked')
+        return ClaimsUser(validated_token)
+
+
+# ============================================
+# CACHED TOKEN / BASIC
+# ============================================
+
+# Cache'ga faqat autentifikatsiya, ruxsatlar va /basic/me/ javobi uchun
+# kerakli maydonlar yoziladi - parol xeshi (password) hech qachon cache
+# fayliga tushmaydi. Qolgan maydonlar (password, last_login, date_joined)
+# deferred: murojaat qilinsa bazadan yuklanadi.
+CACHED_USER_FIELDS = (
+    'id', 'username', 'email', 'is_active', 'is_staff', 'is_superuser',
+    'first_name', 'last_name',
+)
+
+
+def _user_field_names():
+    # from_db() qiymatlarni modeldagi maydonlar tartibida kutadi
+    return [
+        field.attname for field in get_user_model()._meta.concrete_fields
+        if field.attname in CACHED_USER_FIELDS
+    ]
+
+
+def user_values(user):
+    """Cache'ga yoziladigan User maydonlari (model obyekti emas, parolsiz)"""
+    return tuple(getattr(user, name) for name in _user_field_names())
+
+
+def user_from_values(values):
+    """Har so'rov uchun alohida User obyekti - cache'dagi qiymat o'zgarmaydi"""
+    user_model = get_user_model()
+    return user_model.from_db(router.db_for_read(user_model), _user_field_names(), values)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication bilan bir xil natija va xatolar; cache'da User
+    maydonlari saqlanadi, har so'rov uchun yangi User obyekti quriladi
+    """
+
+    def authenticate_credentials(self, key):
+        model = self.get_model()
+
+        def load():
+            token = model.objects.select_related('user').filter(key=key).first()
+            if token is None:
+                return None
+            return user_values(token.user), token.created
+
+        cached = token_cache.get_token(key, load)
+        if cached is None:
+            raise AuthenticationFailed(_('Invalid token.'))
+
+        values, created = cached
+        user = user_from_values(values)
+        if not user.is_active:
+            raise AuthenticationFailed(_('User inactive or deleted.'))
+        return user, model(key=key, user=user, created=created)
+
+
+class CachedBasicAuthentication(BasicAuthentication):
+    """
+    BasicAuthentication + accounts/credential_cache.py: takroriy so'rovlarda
+    parol xeshlanmaydi
+    """
+
+    def authenticate_credentials(self, userid, password, request=None):
+        values, generation = credential_cache.lookup(userid, password)
+        if values is not None:
+            user = user_from_values(values)
+            if user.is_active:
+                return user, None
+
+        user, auth = super().authenticate_credentials(userid, password, request)
+        credential_cache.store(userid, password, generation, user_values(user))
+        return user, auth
+
+
+# ============================================
+# SCHEME DISPATCH
+# ============================================
+
+
+class SchemeDispatchAuthentication(BaseAuthentication):
+    jwt_class = StatelessJWTAuthentication
+    token_class = CachedTokenAuthentication
+    basic_class = CachedBasicAuthentication
+    session_class = SessionAuthentication
+
+    def __init__(self):
+        self.jwt = self.jwt_class()
+        self.session = self.session_class()
+        # Sxema (kichik harf) -> authenticator; kalit so'zlar sozlamalardan
+        # (SIMPLE_JWT['AUTH_HEADER_TYPES'], TokenAuthentication.keyword)
+        self.schemes = {
+            header_type.lower().encode(): self.jwt
+            for header_type in jwt_settings.AUTH_HEADER_TYPES
+        }
+        self.schemes[self.token_class.keyword.lower().encode()] = self.token_class()
+        self.schemes[b'basic'] = self.basic_class()
+
+    def select(self, request):
+        """So'rov uchun yagona authenticator yoki None"""
+        header = get_authorization_header(request)
+        if header:
+            authenticator = self.schemes.get(header.split(b' ', 1)[0].lower())
+            if authenticator is not None:
+                return authenticator
+        # Noma'lum sxema ham zanjirdagidek session'ga o'tadi
+        if settings.SESSION_COOKIE_NAME in request.COOKIES:
+            return self.session
+        return None
+
+    def authenticate(self, request):
+        authenticator = self.select(request)
+        if authenticator is None:
+            return None
+        return authenticator.authenticate(request)
+
+    def authenticate_header(self, request):
+        # 401 javobidagi WWW-Authenticate: avvalgidek zanjirdagi birinchisi (JWT)
+        return self.jwt.authenticate_header(request)
@@ -0,0 +1,79 @@
+"""
+Basic auth: tasdiqlangan login/parol cache'i
+===========================================
+
+CachedBasicAuthentication (accounts/authentication.py) uchun: har so'rovda
+PBKDF2 (~100 ms CPU) o'rniga muvaffaqiyatli tekshiruv natijasi TTL soniya
+cache'da turadi.
+
+- Kalit: SECRET_KEY bilan HMAC(username:password) - parol yoki uning oddiy
+  xeshi cache'ga tushmaydi
+- Faqat muvaffaqiyatli tekshiruvlar saqlanadi (noto'g'ri parol har doim
+  to'liq tekshiriladi)
+- Har bir username uchun "avlod" (generation): User saqlanganda (parol
+  o'zgardi/tiklandi, deaktivatsiya) yangilanadi va eski yozuvlar yaroqsiz
+  bo'ladi. Yozuv va avlod bitta cache.get_many() bilan o'qiladi. Avlod
+  yo'q bo'lsa (muddati o'tgan, cull) - miss va yangi avlod: yozuv hech
+  qachon avlodsiz saqlanmaydi, eski yozuv esa qayta mos kelmaydi.
+"""
+
+import secrets
+
+from django.core.cache import cache
+from django.utils.crypto import salted_hmac
+
+TTL = 60
+# Avlod yozuvlardan uzoqroq yashaydi (yo'qolsa - miss, xavfsiz tomonga)
+GENERATION_TTL = 60 * 60
+
+# v2: yozuvlarda faqat CACHED_USER_FIELDS (parol xeshisiz)
+ENTRY_KEY = 'accounts:basic:v2:{}'
+GENERATION_KEY = 'accounts:basic:gen:{}'
+
+
+def entry_key(username, password):
+    digest = salted_hmac('accounts.credential_cache', f'{username}:{password}', algorithm='sha256')
+    return ENTRY_KEY.format(digest.hexdigest())
+
+
+def generation_key(username):
+    digest = salted_hmac('accounts.credential_cache.user', username, algorithm='sha256')
+    return GENERATION_KEY.format(digest.hexdigest())
+
+
+def _new_generation(gen_key):
+    """Avlod yo'q bo'lsa yaratiladi (add - parallel invalidate'ni bosib ketmaydi)"""
+    token = secrets.token_hex(8)
+    if cache.add(gen_key, token, timeout=GENERATION_TTL):
+        return token
+    return cache.get(gen_key)
+
+
+def lookup(username, password):
+    """
+    (values, generation): values - cache'dagi User maydonlari yoki None,
+    generation - miss bo'lsa store() ga uzatiladi
+    """
+    key, gen_key = entry_key(username, password), generation_key(username)
+    cached = cache.get_many([key, gen_key])
+    generation = cached.get(gen_key)
+    if generation is None:
+        return None, _new_generation(gen_key)
+    entry = cached.get(key)
+    if entry is not None and entry[0] == generation:
+        return entry[1], generation
+    return None, generation
+
+
+def store(username, password, generation, values):
+    # generation tekshiruvdan oldin o'qilgan: shu orada parol o'zgargan bo'lsa yozuv yaroqsiz
+    if generation is None:
+        return
+    cache.set(entry_key(username, password), (generation, values), timeout=TTL)
+
+
+def invalidate(*usernames):
+    cache.set_many(
+        {generation_key(username): secrets.token_hex(8) for username in usernames if username},
+        timeout=GENERATION_TTL,
+    )
@@ -0,0 +1,200 @@
+"""
+Parol xeshlash uchun cheklangan pool
+====================================
+
+Login/ro'yxatdan o'tishdagi PBKDF2 (~100+ ms CPU) so'rov oqimida emas,
+alohida thread pool'da bajariladi (hashlib.pbkdf2_hmac GIL'ni bo'shatadi):
+
+- bir vaqtda ko'pi bilan PASSWORD_HASH_WORKERS ta xeshlash
+- navbatda ko'pi bilan PASSWORD_HASH_QUEUE_SIZE ta so'rov; navbat to'lsa
+  HashingBusy -> 503 + Retry-After (login to'lqini katalog GET'larini
+  siqib chiqarmaydi)
+- async view'lar natijani event loop'ni band qilmasdan kutadi (arun),
+  sync kod esa pool.call() bilan
+
+Bazaga murojaatlar (user qidirish, saqlash) chaqiruvchi oqimda qoladi -
+pool faqat xesh hisoblaydi.
+
+Chegara har bir jarayon uchun. Navbat faqat jarayonda bir vaqtda
+workers + queue_size dan ko'p login bo'lsa to'ladi: ASGI (uvicorn) worker'da
+shunday bo'ladi, WSGI'da esa so'rovlar soni thread'lar bilan cheklangan -
+gunicorn.conf.py WSGI uchun chegarani GUNICORN_THREADS ga moslaydi.
+"""
+
+import asyncio
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model, hashers, user_login_failed
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+DEFAULT_WORKERS = 2
+DEFAULT_QUEUE_SIZE = 16
+
+
+class HashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Server band, birozdan keyin qayta urinib ko'ring."
+    default_code = 'hashing_busy'
+
+    def __init__(self, wait):
+        super().__init__()
+        # DRF exception_handler `wait` bo'yicha Retry-After qo'yadi
+        self.wait = wait
+
+
+class HashingPool:
+    def __init__(self, workers, queue_size):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix='password-hash')
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.max_in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.hash_seconds = 0.0
+        self.wait_seconds = 0.0
+        self.max_hash_seconds = 0.0
+
+    def _retry_after(self):
+        average = self.hash_seconds / self.completed if self.completed else 1.0
+        # Hozirgi navbat tugashi uchun taxminiy vaqt
+        return max(1, math.ceil(average * self._in_flight / self.workers))
+
+    def submit(self, func, *args):
+        with self._lock:
+            if self._in_flight >= self.workers + self.queue_size:
+                self.rejected += 1
+                raise HashingBusy(self._retry_after())
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            return self._executor.submit(self._run, func, args, time.perf_counter())
+        except BaseException:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+
+    def _run(self, func, args, queued_at):
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._in_flight -= 1
+                self.completed += 1
+                self.hash_seconds += elapsed
+                self.wait_seconds += started - queued_at
+                self.max_hash_seconds = max(self.max_hash_seconds, elapsed)
+
+    def call(self, func, *args):
+        return self.submit(func, *args).result()
+
+    async def arun(self, func, *args):
+        return await asyncio.wrap_future(self.submit(func, *args))
+
+    def stats(self):
+        with self._lock:
+            in_flight = self._in_flight
+            return {
+                'workers': self.workers,
+                'queue_size': self.queue_size,
+                'running': min(in_flight, self.workers),
+                'queued': max(0, in_flight - self.workers),
+                'max_in_flight': self.max_in_flight,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'avg_hash_ms': round(self.hash_seconds / self.completed * 1000, 1) if self.completed else None,
+                'max_hash_ms': round(self.max_hash_seconds * 1000, 1),
+                'avg_wait_ms': round(self.wait_seconds / self.completed * 1000, 1) if self.completed else None,
+            }
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Har bir jarayon (gunicorn worker) uchun bitta pool - fork'dan keyin qayta yaratiladi"""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = HashingPool(
+                getattr(settings, 'PASSWORD_HASH_WORKERS', DEFAULT_WORKERS),
+                getattr(settings, 'PASSWORD_HASH_QUEUE_SIZE', DEFAULT_QUEUE_SIZE),
+            )
+            _pool_pid = os.getpid()
+        return _pool
+
+
+# ============================================
+# ASYNC (view'lar uchun)
+# ============================================
+
+async def amake_password(raw_password):
+    return await get_pool().arun(hashers.make_password, raw_password)
+
+
+async def acheck_password(user, raw_password):
+    """
+    User.check_password() bilan bir xil: eskirgan xesh (masalan, iteratsiyalar
+    soni oshgan) to'g'ri paroldan keyin qayta xeshlanib saqlanadi
+    """
+    encoded = user.password
+    if not await get_pool().arun(hashers.check_password, raw_password, encoded):
+        return False
+    if encoded and hashers.identify_hasher(encoded).must_update(encoded):
+        user.password = await amake_password(raw_password)
+        await user.asave(update_fields=['password'])
+    return True
+
+
+async def aauthenticate(request, username, password):
+    """
+    django.contrib.auth.authenticate() (ModelBackend) ning async varianti:
+    foydalanuvchi topilmasa ham bitta xesh hisoblanadi (timing)
+    """
+    user_model = get_user_model()
+    user = None
+    if username and password:
+        try:
+            user = await user_model._default_manager.aget_by_natural_key(username)
+        except user_model.DoesNotExist:
+            await amake_password(password)
+        else:
+            if not (await acheck_password(user, password) and getattr(user, 'is_active', True)):
+                user = None
+    if user is None:
+        await user_login_failed.asend(
+            sender=__name__, credentials={'username': username, 'password': '********'}, request=request,
+        )
+        return None
+    user.backend = 'django.contrib.auth.backends.ModelBackend'
+    return user
+
+
+# ============================================
+# SYNC
+# ============================================
+
+def make_password(raw_password):
+    return get_pool().call(hashers.make_password, raw_password)
+
+
+def stats():
+    return get_pool().stats()
+
+
+def reset():
+    """Testlar uchun: sozlamalar o'zgargandan keyin pool qayta yaratiladi"""
+    global _pool
+    with _pool_lock:
+        _pool = None
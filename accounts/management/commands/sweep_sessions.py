@@ -0,0 +1,71 @@
+"""
+Eskirgan session qatorlarini bo'laklab o'chirish
+
+python manage.py sweep_sessions                  # bir marta
+python manage.py sweep_sessions --interval 3600  # fon jarayoni: har soatda
+
+clearsessions bitta katta DELETE qiladi - SQLite'da u tugaguncha boshqa
+yozuvlar (login, kitob saqlash) kutib turadi. Bu buyruq --batch-size tadan
+o'chiradi va bo'laklar orasida lock'ni bo'shatadi.
+"""
+
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = "Muddati o'tgan session'larni bo'laklab o'chiradi (ixtiyoriy: davriy)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--pause', type=float, default=0.05,
+            help="Bo'laklar orasidagi tanaffus (soniya) - boshqa yozuvlarga navbat",
+        )
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help="0 dan katta bo'lsa har N soniyada qayta ishlaydi (to'xtatish: Ctrl+C)",
+        )
+
+    def handle(self, *args, **options):
+        engine = import_module(settings.SESSION_ENGINE)
+        get_model_class = getattr(engine.SessionStore, 'get_model_class', None)
+        if get_model_class is None:
+            # cache / signed_cookies: bazada qator yo'q
+            try:
+                engine.SessionStore.clear_expired()
+            except NotImplementedError:
+                raise CommandError(f"{settings.SESSION_ENGINE} eskirgan session'larni tozalamaydi")
+            return
+
+        model = get_model_class()
+        while True:
+            start = time.perf_counter()
+            deleted = self.sweep(model, options['batch_size'], options['pause'])
+            self.stdout.write(
+                f"{deleted} ta eskirgan session o'chirildi ({time.perf_counter() - start:.2f}s)"
+            )
+            if options['interval'] <= 0:
+                return
+            try:
+                time.sleep(options['interval'])
+            except KeyboardInterrupt:
+                return
+
+    def sweep(self, model, batch_size, pause):
+        deleted = 0
+        now = timezone.now()
+        while True:
+            keys = list(
+                model.objects.filter(expire_date__lt=now).values_list('pk', flat=True)[:batch_size]
+            )
+            if not keys:
+                return deleted
+            deleted += model.objects.filter(pk__in=keys).delete()[0]
+            if len(keys) < batch_size:
+                return deleted
+            time.sleep(pause)
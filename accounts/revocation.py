@@ -0,0 +1,70 @@
+"""
+JWT deny-list
+=============
+
+Stateless JWT autentifikatsiyasi (accounts/authentication.py) foydalanuvchini
+bazadan o'qimaydi, shuning uchun bekor qilingan tokenlar cache'da saqlanadi:
+
+    jwt:deny:<jti>       -> bitta token (logout), token muddati tugaguncha
+    jwt:revoked:<id>     -> shu vaqtdan oldin berilgan barcha tokenlar
+                            (parol o'zgardi, user o'chirildi/deaktiv qilindi)
+
+Har so'rovda bitta get_many() - SQL so'rov yo'q. Yozuvlar alohida
+'revocations' cache'ida (settings.CACHES): LRU bo'yicha tozalanmaydi, umumiy
+cache to'lib ketsa ham bekor qilingan token qayta yaroqli bo'lib qolmaydi.
+
+Vaqtlar soniya ulushlari bilan: login'da berilgan tokenlarda ISSUED_CLAIM
+(aniq berilgan vaqt) bor. 'iat' butun soniya (pastga yaxlitlangan), shuning
+uchun faqat 'iat' bo'lgan token bekor qilingan soniyada berilgan bo'lsa ham
+bekor hisoblanadi.
+"""
+
+import time
+
+from django.core.cache import caches
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+CACHE_ALIAS = 'revocations'
+TOKEN_KEY = 'jwt:deny:{}'
+USER_KEY = 'jwt:revoked:{}'
+ISSUED_CLAIM = 'issued_at'
+
+
+def _cache():
+    return caches[CACHE_ALIAS]
+
+
+def stamp(token):
+    """Tokenga aniq berilgan vaqtni yozish (refresh'dan olingan access ham meros oladi)"""
+    token[ISSUED_CLAIM] = token.current_time.timestamp()
+    return token
+
+
+def revoke_token(token):
+    """Bitta tokenni (access yoki refresh) muddati tugaguncha bekor qilish"""
+    jti = token.get(jwt_settings.JTI_CLAIM)
+    if not jti:
+        return
+    timeout = max(1, int(token.get('exp', 0) - time.time()) + 1)
+    _cache().set(TOKEN_KEY.format(jti), 1, timeout=timeout)
+
+
+def revoke_user(user_id):
+    """Foydalanuvchining hozirgacha berilgan barcha tokenlarini bekor qilish"""
+    # Eng uzoq yashaydigan token (refresh) muddati tugaguncha saqlanadi
+    timeout = int(jwt_settings.REFRESH_TOKEN_LIFETIME.total_seconds())
+    _cache().set(USER_KEY.format(user_id), time.time(), timeout=timeout)
+
+
+def is_revoked(token):
+    token_key = TOKEN_KEY.format(token.get(jwt_settings.JTI_CLAIM))
+    user_key = USER_KEY.format(token.get(jwt_settings.USER_ID_CLAIM))
+    values = _cache().get_many([token_key, user_key])
+    if token_key in values:
+        return True
+    revoked_at = values.get(user_key)
+    if revoked_at is None:
+        return False
+    if ISSUED_CLAIM in token:
+        return token[ISSUED_CLAIM] < revoked_at
+    return token.get('iat', 0) <= revoked_at
@@ -0,0 +1,29 @@
+"""
+drf-spectacular uchun: SchemeDispatchAuthentication = JWT | Token | Session | Basic
+"""
+
+from django.conf import settings
+from drf_spectacular.extensions import OpenApiAuthenticationExtension
+
+
+class SchemeDispatchAuthenticationScheme(OpenApiAuthenticationExtension):
+    target_class = 'accounts.authentication.SchemeDispatchAuthentication'
+    # Nomlar alohida authentication_classes'li view'lardagi jwtAuth/basicAuth ... bilan to'qnashmasligi uchun
+    name = ['bearerJWT', 'headerToken', 'sessionCookie', 'httpBasic']
+
+    def get_security_requirement(self, auto_schema):
+        # Istalgan bittasi (OR)
+        return [{name: []} for name in self.name]
+
+    def get_security_definition(self, auto_schema):
+        return [
+            {'type': 'http', 'scheme': 'bearer', 'bearerFormat': 'JWT'},
+            {
+                'type': 'apiKey',
+                'in': 'header',
+                'name': 'Authorization',
+                'description': 'Token-based authentication with required prefix "Token"',
+            },
+            {'type': 'apiKey', 'in': 'cookie', 'name': settings.SESSION_COOKIE_NAME},
+            {'type': 'http', 'scheme': 'basic'},
+        ]
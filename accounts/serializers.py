@@ -1,6 +1,12 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from django.contrib.auth.password_validation import validate_password
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer, TokenVerifySerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import UntypedToken
+
+from . import hashing, revocation
 
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
@@ -56,12 +62,15 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         # password2 ni olib tashlaymiz (kerak emas)
         validated_data.pop('password2')
         
-        # Foydalanuvchini yaratamiz
-        user = User.objects.create_user(
-            username=validated_data['username'],
-            email=validated_data['email'],
-            password=validated_data['password']
+        # Foydalanuvchini yaratamiz (create_user bilan bir xil). Parol xeshi
+        # view'dan tayyor keladi (save(password_hash=...)) yoki pool'da hisoblanadi
+        password_hash = validated_data.pop('password_hash', None)
+        user = User(
+            username=User.normalize_username(validated_data['username']),
+            email=User.objects.normalize_email(validated_data['email']),
+            password=password_hash or hashing.make_password(validated_data['password']),
         )
+        user.save()
         
         return user
 
@@ -73,4 +82,30 @@ class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ('id', 'username', 'email', 'first_name', 'last_name')
-        read_only_fields = ('id',)
\ No newline at end of file
+        read_only_fields = ('id',)
+
+
+class DenyListTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    /jwt/refresh/ - bekor qilingan refresh token rad etiladi,
+    rotatsiyadan keyin eskisi deny-list'ga qo'shiladi
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        if revocation.is_revoked(refresh):
+            raise InvalidToken('Token is revoked')
+        data = super().validate(attrs)
+        if jwt_settings.ROTATE_REFRESH_TOKENS:
+            revocation.revoke_token(refresh)
+        return data
+
+
+class DenyListTokenVerifySerializer(TokenVerifySerializer):
+    """/jwt/verify/ - deny-list'dagi token yaroqsiz"""
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        if revocation.is_revoked(UntypedToken(attrs['token'])):
+            raise InvalidToken('Token is revoked')
+        return data
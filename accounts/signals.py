@@ -0,0 +1,84 @@
+"""
+Accounts signals
+================
+
+User o'zgarganda uning JWT tokenlarini bekor qilish (accounts/revocation.py):
+- parol o'zgardi
+- token claim'lari (username, email, is_staff) o'zgardi
+- deaktiv qilindi yoki o'chirildi
+
+Token -> User cache'ini tozalash (accounts/token_cache.py):
+- Token o'chirildi (logout, parol almashtirish/tiklash)
+- User saqlandi (deaktivatsiya, profil) - faqat last_login yangilansa emas
+
+Basic auth cache'i (accounts/credential_cache.py) ham User saqlanganda
+(parol almashtirish/tiklash, deaktivatsiya) yaroqsiz bo'ladi.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from rest_framework.authtoken.models import Token
+
+from . import credential_cache, revocation, token_cache
+
+User = get_user_model()
+
+# Token'ga yoziladigan (yoki unga ta'sir qiladigan) maydonlar
+CLAIM_FIELDS = ('username', 'email', 'is_staff', 'is_active')
+
+
+def claim_values(user):
+    # __dict__ orqali: deferred (.only()) maydonlar uchun qo'shimcha so'rov bo'lmasin
+    return tuple(user.__dict__.get(field) for field in CLAIM_FIELDS)
+
+
+@receiver(post_init, sender=User)
+def remember_claims(sender, instance, **kwargs):
+    instance._loaded_claims = claim_values(instance)
+    # credential cache uchun alohida: revoke_tokens_on_change _loaded_claims'ni
+    # shu receiver'dan oldin yangilaydi
+    instance._loaded_username = instance.__dict__.get('username')
+
+
+@receiver(post_save, sender=User)
+def revoke_tokens_on_change(sender, instance, created, raw=False, **kwargs):
+    if created or raw:
+        return
+    # AbstractBaseUser.set_password() save() tugaguncha _password'ni saqlaydi
+    password_changed = getattr(instance, '_password', None) is not None
+    if password_changed or claim_values(instance) != instance._loaded_claims:
+        revocation.revoke_user(instance.pk)
+    instance._loaded_claims = claim_values(instance)
+
+
+@receiver(post_delete, sender=User)
+def revoke_tokens_on_delete(sender, instance, **kwargs):
+    revocation.revoke_user(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def invalidate_token_cache_on_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if created or raw or update_fields == frozenset({'last_login'}):
+        return
+    token_cache.invalidate(Token.objects.filter(user_id=instance.pk).values_list('key', flat=True))
+
+
+@receiver(post_save, sender=User)
+def invalidate_credential_cache_on_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if created or raw or update_fields == frozenset({'last_login'}):
+        return
+    # username o'zgargan bo'lsa eskisi uchun ham
+    credential_cache.invalidate(instance.username, instance._loaded_username)
+    instance._loaded_username = instance.username
+
+
+@receiver(post_delete, sender=User)
+def invalidate_credential_cache_on_delete(sender, instance, **kwargs):
+    credential_cache.invalidate(instance.username)
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_token_cache_on_delete(sender, instance, **kwargs):
+    token_cache.invalidate([instance.key])
@@ -1,3 +1,445 @@
-from django.test import TestCase
+import base64
+import os
+import runpy
+import threading
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.db import connection
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from . import credential_cache, hashing, revocation, token_cache
+from .authentication import SchemeDispatchAuthentication, StatelessJWTAuthentication, full_user
+
+LOCMEM_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'revocations': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'revocations'},
+}
+
+
+class SchemeDispatchAuthenticationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('reader', password='reader-pass-123')
+        cls.other = User.objects.create_user('other', password='other-pass-123')
+        cls.token = Token.objects.create(user=cls.user)
+
+    def authenticate(self, **headers):
+        request = APIRequestFactory().get('/api/books/', **headers)
+        return Request(request, authenticators=[SchemeDispatchAuthentication()])
+
+    def test_selects_authenticator_by_scheme(self):
+        basic = base64.b64encode(b'reader:reader-pass-123').decode()
+        cases = {
+            f'Token {self.token.key}': 'Token',
+            f'Bearer {AccessToken.for_user(self.user)}': 'AccessToken',
+            f'Basic {basic}': 'NoneType',
+        }
+        for header, auth_type in cases.items():
+            with self.subTest(auth_type):
+                request = self.authenticate(HTTP_AUTHORIZATION=header)
+                self.assertEqual(request.user.pk, self.user.pk)
+                self.assertEqual(type(request.auth).__name__, auth_type)
+
+    def test_session_not_loaded_for_header_schemes(self):
+        request = self.authenticate(
+            HTTP_AUTHORIZATION=f'Token {self.token.key}',
+            HTTP_COOKIE=f'{settings.SESSION_COOKIE_NAME}=abc',
+        )
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(request.user, self.user)
+        self.assertFalse(any('django_session' in query['sql'] for query in queries))
+
+    def test_no_credentials_is_anonymous_without_queries(self):
+        for headers in ({}, {'HTTP_AUTHORIZATION': 'Foo bar'}):
+            request = self.authenticate(**headers)
+            with self.assertNumQueries(0):
+                self.assertFalse(request.user.is_authenticated)
+
+    def test_basic_wins_over_session_cookie(self):
+        client = APIClient()
+        client.login(username='other', password='other-pass-123')
+        basic = base64.b64encode(b'reader:reader-pass-123').decode()
+        response = client.get('/api/protected/', HTTP_AUTHORIZATION=f'Basic {basic}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['user'], 'reader')
+
+    def test_invalid_bearer_returns_401_with_challenge(self):
+        response = APIClient().get('/api/protected/', HTTP_AUTHORIZATION='Bearer invalid')
+        self.assertEqual(response.status_code, 401)
+        self.assertTrue(response['WWW-Authenticate'].startswith('Bearer'))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class StatelessJWTAuthenticationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'jwt-reader', email='jwt@example.com', password='reader-pass-123', first_name='Ali',
+        )
+
+    def setUp(self):
+        # Deny-list oldingi testlardan qolmasin
+        cache.clear()
+        caches[revocation.CACHE_ALIAS].clear()
+
+    def client_for(self, token):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        return client
+
+    def issued_before_now(self):
+        token = AccessToken.for_user(self.user)
+        token['iat'] = int(time.time()) - 10
+        return token
+
+    def test_book_write_has_no_auth_queries(self):
+        client = self.client_for(AccessToken.for_user(self.user))
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post('/api/books/bulk/', [], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(queries), 0)
+
+    def test_user_built_from_claims(self):
+        token = AccessToken.for_user(self.user)
+        token['username'] = self.user.username
+        token['email'] = self.user.email
+        user = StatelessJWTAuthentication().get_user(token)
+        with self.assertNumQueries(0):
+            self.assertEqual((user.pk, user.username, user.email), (self.user.pk, 'jwt-reader', 'jwt@example.com'))
+        # Claim'da yo'q atribut - bitta so'rov bilan bazadan
+        with self.assertNumQueries(1):
+            self.assertEqual(user.first_name, 'Ali')
+            self.assertEqual(full_user(user), self.user)
+
+    def test_logout_revokes_access_token(self):
+        client = self.client_for(AccessToken.for_user(self.user))
+        self.assertEqual(client.post('/api/accounts/jwt/logout/').status_code, 200)
+        self.assertEqual(client.get('/api/protected/').status_code, 401)
+
+    def test_password_change_revokes_older_tokens(self):
+        client = self.client_for(self.issued_before_now())
+        self.assertEqual(client.get('/api/protected/').status_code, 200)
+        response = client.post('/api/accounts/change-password/', {
+            'old_password': 'reader-pass-123', 'new_password': 'new-pass-456',
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(client.get('/api/protected/').status_code, 401)
+
+    def test_deactivation_revokes_tokens(self):
+        client = self.client_for(self.issued_before_now())
+        User.objects.filter(pk=self.user.pk).update(last_name='unchanged')
+        self.assertEqual(client.get('/api/protected/').status_code, 200)
+        user = User.objects.get(pk=self.user.pk)
+        user.is_active = False
+        user.save()
+        self.assertEqual(client.get('/api/protected/').status_code, 401)
+
+    def test_revocations_survive_shared_cache_eviction(self):
+        token = AccessToken.for_user(self.user)
+        revocation.revoke_token(token)
+        # Umumiy cache (books:repr:* va h.k.) tozalansa ham deny-list joyida
+        cache.clear()
+        self.assertTrue(revocation.is_revoked(token))
+
+    def test_same_second_revocation(self):
+        before = revocation.stamp(AccessToken.for_user(self.user))
+        unstamped = AccessToken.for_user(self.user)
+        revocation.revoke_user(self.user.pk)
+        after = revocation.stamp(AccessToken.for_user(self.user))
+        after[revocation.ISSUED_CLAIM] = time.time() + 0.001
+        self.assertTrue(revocation.is_revoked(before))
+        # Faqat butun soniyali iat - shu soniyada berilgani ham bekor
+        unstamped['iat'] = int(time.time())
+        self.assertTrue(revocation.is_revoked(unstamped))
+        self.assertFalse(revocation.is_revoked(after))
+
+    def test_login_right_after_password_change(self):
+        client = self.client_for(self.issued_before_now())
+        response = client.post('/api/accounts/change-password/', {
+            'old_password': 'reader-pass-123', 'new_password': 'new-pass-456',
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        response = APIClient().post('/api/accounts/jwt/login/', {
+            'username': 'jwt-reader', 'password': 'new-pass-456',
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client_for(response.data['access']).get('/api/protected/').status_code, 200)
+        refreshed = APIClient().post('/api/accounts/jwt/refresh/', {'refresh': response.data['refresh']}, format='json')
+        self.assertEqual(self.client_for(refreshed.data['access']).get('/api/protected/').status_code, 200)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CachedTokenAuthenticationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('token-reader', password='reader-pass-123')
+        cls.admin = User.objects.create_user('token-admin', password='admin-pass-123', is_staff=True)
+
+    def setUp(self):
+        cache.clear()
+        token_cache.local.clear()
+        token_cache.counters.reset()
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_repeated_requests_skip_database(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get('/api/protected/').data['user'], 'token-reader')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/api/protected/').data['user'], 'token-reader')
+        token_cache.local.clear()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/api/protected/').status_code, 200)
+
+        stats = token_cache.stats()
+        self.assertEqual((stats['local_hits'], stats['shared_hits'], stats['misses']), (1, 1, 1))
+        self.assertEqual(stats['hit_ratio'], round(2 / 3, 4))
+
+    def test_logout_invalidates(self):
+        self.client.get('/api/protected/')
+        self.assertEqual(self.client.post('/api/accounts/logout/').status_code, 200)
+        self.assertEqual(self.client.get('/api/protected/').status_code, 401)
+
+    def test_password_change_invalidates_old_token(self):
+        self.client.get('/api/protected/')
+        response = self.client.post('/api/accounts/change-password/', {
+            'old_password': 'reader-pass-123', 'new_password': 'new-pass-456',
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get('/api/protected/').status_code, 401)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {response.data['token']}")
+        self.assertEqual(self.client.get('/api/protected/').status_code, 200)
+
+    def test_deactivation_invalidates(self):
+        self.client.get('/api/protected/')
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get('/api/protected/').status_code, 401)
+
+    def test_other_workers_local_entries_are_rejected(self):
+        self.client.get('/api/protected/')
+        key = token_cache.cache_key(self.token.key)
+        stale = token_cache.local.get(key)
+        self.token.delete()
+        # Boshqa worker'ning LRU'sida eski yozuv qolgan
+        token_cache.local.set(key, stale)
+        self.assertEqual(self.client.get('/api/protected/').status_code, 401)
+
+    def test_missing_generation_is_a_miss(self):
+        self.client.get('/api/protected/')
+        key = token_cache.cache_key(self.token.key)
+        # Avlod kaliti cull/TTL bilan yo'qoldi - eski yozuvlar ishlatilmaydi
+        cache.delete(token_cache.generation_key(key))
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get('/api/protected/').status_code, 200)
+        self.assertEqual(token_cache.stats()['misses'], 2)
+
+    def test_cached_values_exclude_password_hash(self):
+        self.client.get('/api/protected/')
+        values, _ = cache.get(token_cache.cache_key(self.token.key))[1]
+        self.assertNotIn(self.user.password, values)
+        self.assertIn('token-reader', values)
+
+    def test_stats_endpoint_is_admin_only(self):
+        self.assertEqual(self.client.get('/api/accounts/token-cache-stats/').status_code, 403)
+        admin = APIClient()
+        admin.force_authenticate(self.admin)
+        response = admin.get('/api/accounts/token-cache-stats/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('saved_ms', response.data)
+
+
+class SessionTests(TestCase):
+    url = '/api/accounts/session/me/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('session-reader', password='reader-pass-123')
+
+    def logged_in_client(self):
+        client = APIClient()
+        client.force_login(self.user)
+        client.get(self.url)
+        return client
+
+    def test_read_does_not_write_session(self):
+        client = self.logged_in_client()
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(client.get(self.url).status_code, 200)
+        self.assertFalse(any('django_session' in query['sql'] for query in queries))
+
+    @override_settings(SESSION_REFRESH_INTERVAL=0)
+    def test_refresh_due_extends_session(self):
+        client = self.logged_in_client()
+        session = Session.objects.get()
+        Session.objects.update(expire_date=timezone.now() + timedelta(minutes=1))
+        client.get(self.url)
+        self.assertGreater(Session.objects.get(pk=session.pk).expire_date, timezone.now() + timedelta(hours=1))
+
+    def test_sweep_sessions_deletes_only_expired(self):
+        self.logged_in_client()
+        Session.objects.create(session_key='expired', session_data='', expire_date=timezone.now() - timedelta(days=1))
+        call_command('sweep_sessions', batch_size=1, stdout=StringIO())
+        self.assertFalse(Session.objects.filter(session_key='expired').exists())
+        self.assertEqual(Session.objects.count(), 1)
+
+
+@override_settings(
+    CACHES=LOCMEM_CACHES,
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+)
+class CachedBasicAuthenticationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('basic-reader', password='reader-pass-123')
+
+    def setUp(self):
+        cache.clear()
+
+    def client_for(self, password):
+        client = APIClient()
+        credentials = base64.b64encode(f'basic-reader:{password}'.encode()).decode()
+        client.credentials(HTTP_AUTHORIZATION=f'Basic {credentials}')
+        return client
+
+    def test_repeated_request_skips_password_check(self):
+        client = self.client_for('reader-pass-123')
+        self.assertEqual(client.get('/api/accounts/basic/me/').status_code, 200)
+        with self.assertNumQueries(0):
+            response = client.get('/api/accounts/basic/me/')
+        self.assertEqual(response.data['user']['username'], 'basic-reader')
+        # Cache kalitlarida parol yo'q
+        self.assertFalse(any('reader-pass' in key or 'basic-reader' in key for key in cache._cache))
+
+    def test_cached_values_exclude_password_hash(self):
+        self.client_for('reader-pass-123').get('/api/accounts/basic/me/')
+        values, _ = credential_cache.lookup('basic-reader', 'reader-pass-123')
+        self.assertNotIn(self.user.password, values)
+        self.assertFalse(any(str(value).startswith('md5$') for value in values))
+
+    def test_wrong_password_is_not_served_from_cache(self):
+        self.client_for('reader-pass-123').get('/api/accounts/basic/me/')
+        self.assertEqual(self.client_for('wrong-pass').get('/api/accounts/basic/me/').status_code, 401)
+
+    def test_password_change_invalidates(self):
+        client = self.client_for('reader-pass-123')
+        self.assertEqual(client.get('/api/accounts/basic/me/').status_code, 200)
+        response = client.post('/api/accounts/change-password/', {
+            'old_password': 'reader-pass-123', 'new_password': 'new-pass-456',
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(client.get('/api/accounts/basic/me/').status_code, 401)
+        self.assertEqual(self.client_for('new-pass-456').get('/api/accounts/basic/me/').status_code, 200)
+
+    def test_missing_generation_fails_closed(self):
+        client = self.client_for('reader-pass-123')
+        self.assertEqual(client.get('/api/accounts/basic/me/').status_code, 200)
+        # Parol boshqa yo'l bilan o'zgardi va avlod kaliti cull/TTL bilan yo'qoldi
+        User.objects.filter(pk=self.user.pk).update(password=make_password('new-pass-456'))
+        cache.delete(credential_cache.generation_key('basic-reader'))
+        self.assertEqual(client.get('/api/accounts/basic/me/').status_code, 401)
+        self.assertEqual(self.client_for('new-pass-456').get('/api/accounts/basic/me/').status_code, 200)
+
+    def test_entries_are_never_stored_without_generation(self):
+        credential_cache.store('basic-reader', 'reader-pass-123', None, ('values',))
+        self.assertEqual(credential_cache.lookup('basic-reader', 'reader-pass-123')[0], None)
+
+    def test_rename_invalidates_old_username(self):
+        self.assertEqual(self.client_for('reader-pass-123').get('/api/accounts/basic/me/').status_code, 200)
+        self.assertIsNotNone(credential_cache.lookup('basic-reader', 'reader-pass-123')[0])
+        self.user.username = 'basic-renamed'
+        self.user.save()
+        self.assertIsNone(credential_cache.lookup('basic-reader', 'reader-pass-123')[0])
+        self.assertEqual(self.client_for('reader-pass-123').get('/api/accounts/basic/me/').status_code, 401)
+
+    def test_deactivation_invalidates(self):
+        client = self.client_for('reader-pass-123')
+        client.get('/api/accounts/basic/me/')
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(client.get('/api/accounts/basic/me/').status_code, 401)
+
+
+@override_settings(
+    CACHES=LOCMEM_CACHES,
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+)
+class HashingPoolTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('hash-reader', password='reader-pass-123')
+
+    def setUp(self):
+        cache.clear()
+        hashing.reset()
+        self.addCleanup(hashing.reset)
+
+    def test_login_endpoints(self):
+        credentials = {'username': 'hash-reader', 'password': 'reader-pass-123'}
+        for url in ('/api/accounts/login/', '/api/accounts/session/login/', '/api/accounts/jwt/login/'):
+            with self.subTest(url=url):
+                self.assertEqual(APIClient().post(url, credentials, format='json').status_code, 200)
+                wrong = {'username': 'hash-reader', 'password': 'wrong-pass'}
+                self.assertIn(APIClient().post(url, wrong, format='json').status_code, (400, 401))
+        self.assertEqual(hashing.stats()['completed'], 6)
+
+    def test_registration_stores_usable_hash(self):
+        for number, url in enumerate(('register/', 'register-class/', 'register-generic/')):
+            response = APIClient().post(f'/api/accounts/{url}', {
+                'username': f'new-user-{number}', 'email': f'new{number}@example.com',
+                'password': 'Secure-pass-789', 'password2': 'Secure-pass-789',
+            }, format='json')
+            self.assertEqual(response.status_code, 201, url)
+            self.assertTrue(User.objects.get(username=f'new-user-{number}').check_password('Secure-pass-789'))
+
+    @override_settings(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_QUEUE_SIZE=0)
+    def test_full_pool_returns_503(self):
+        hashing.reset()
+        release = threading.Event()
+        busy = hashing.get_pool().submit(release.wait)
+        try:
+            response = APIClient().post('/api/accounts/login/', {
+                'username': 'hash-reader', 'password': 'reader-pass-123',
+            }, format='json')
+        finally:
+            release.set()
+            busy.result()
+        self.assertEqual(response.status_code, 503)
+        self.assertTrue(response.has_header('Retry-After'))
+        self.assertEqual(hashing.stats()['rejected'], 1)
+
+    def test_wsgi_limit_follows_gunicorn_threads(self):
+        config = os.path.join(settings.BASE_DIR, 'gunicorn.conf.py')
+        for threads, expected in ((1, ('1', '0')), (8, ('2', '5'))):
+            with self.subTest(threads=threads), mock.patch.dict(os.environ, {
+                'SERVER_MODE': 'wsgi', 'GUNICORN_THREADS': str(threads),
+            }):
+                os.environ.pop('PASSWORD_HASH_WORKERS', None)
+                os.environ.pop('PASSWORD_HASH_QUEUE_SIZE', None)
+                runpy.run_path(config)
+                # gthread'da workers + queue_size < threads: bitta thread boshqa so'rovlar uchun
+                self.assertEqual((os.environ['PASSWORD_HASH_WORKERS'], os.environ['PASSWORD_HASH_QUEUE_SIZE']), expected)
+
+    def test_stats_admin_only(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        self.assertEqual(client.get('/api/accounts/hashing-stats/').status_code, 403)
+        admin = User.objects.create_superuser('hash-admin', password='admin-pass-123')
+        client.force_authenticate(admin)
+        self.assertEqual(client.get('/api/accounts/hashing-stats/').data['workers'], 2)
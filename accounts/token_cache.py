@@ -0,0 +1,188 @@
+"""
+Token -> User cache
+===================
+
+CachedTokenAuthentication (accounts/authentication.py) uchun: har bir
+`Authorization: Token ...` so'rovida Token + User JOIN o'rniga
+
+    1. jarayon ichidagi LRU (LOCAL_TTL soniya)
+    2. umumiy cache (SHARED_TTL soniya)
+    3. baza
+
+Kalitlar tokenning sha256 xeshi bilan - token qiymati cache kalitida
+saqlanmaydi. Har bir tokenning umumiy cache'da "avlodi" (generation) bor,
+yozuvlar (LRU'da ham) shu avlod bilan saqlanadi. Token o'chirilganda
+(logout, parol almashtirish/tiklash) va User saqlanganda (deaktivatsiya,
+profil) signals orqali avlod yangilanadi. LRU'dagi yozuv har safar umumiy
+avlod bilan solishtiriladi (bitta kichik cache.get), shuning uchun
+bekor qilish barcha worker'larda darhol ishlaydi. Avlod yo'q bo'lsa
+(muddati o'tgan, cull) - miss.
+"""
+
+import hashlib
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache
+from django.db import transaction
+
+from library_project.metrics import Counters, ratio
+
+LOCAL_SIZE = 1024
+LOCAL_TTL = 2
+SHARED_TTL = 60
+GENERATION_TTL = 60 * 60
+
+# *_us - shu yo'l bilan autentifikatsiyaga ketgan jami vaqt (mikrosekund)
+counters = Counters(
+    'accounts:token',
+    ('local_hits', 'shared_hits', 'misses', 'local_us', 'shared_us', 'miss_us'),
+)
+
+
+class LocalLRU:
+    def __init__(self, size, ttl):
+        self.size = size
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.size:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+local = LocalLRU(LOCAL_SIZE, LOCAL_TTL)
+
+
+def cache_key(token_key):
+    # v2: yozuvlarda faqat CACHED_USER_FIELDS (parol xeshisiz)
+    return 'accounts:token:v2:' + hashlib.sha256(token_key.encode()).hexdigest()
+
+
+def generation_key(key):
+    return key.replace('accounts:token:', 'accounts:token:gen:', 1)
+
+
+def _current(entry, generation):
+    """Yozuv joriy avlodga tegishli bo'lsa - qiymat"""
+    if entry is not None and generation is not None and entry[0] == generation:
+        return entry[1]
+    return None
+
+
+def _new_generation(gen_key):
+    """Avlod yo'q bo'lsa yaratiladi (add - parallel invalidate'ni bosib ketmaydi)"""
+    token = secrets.token_hex(8)
+    if cache.add(gen_key, token, timeout=GENERATION_TTL):
+        return token
+    return cache.get(gen_key) or token
+
+
+def get_token(token_key, loader):
+    """
+    (user, created) ni cache'dan oladi; yo'q bo'lsa loader() bilan
+    bazadan o'qib, ikkala qatlamga yozadi. loader() None qaytarsa - token yo'q.
+    """
+    start = time.perf_counter()
+    key = cache_key(token_key)
+    gen_key = generation_key(key)
+
+    local_entry = local.get(key)
+    if local_entry is not None:
+        generation = cache.get(gen_key)
+        value = _current(local_entry, generation)
+        if value is not None:
+            _record('local', start)
+            return value
+        local.delete(key)
+
+    values = cache.get_many([key, gen_key])
+    generation = values.get(gen_key)
+    entry = values.get(key)
+    value = _current(entry, generation)
+    if value is not None:
+        local.set(key, entry)
+        _record('shared', start)
+        return value
+
+    # Avlod qatordan oldin o'qiladi: shu orada invalidate bo'lsa yozuv yaroqsiz
+    generation = generation or _new_generation(gen_key)
+    value = loader()
+    if value is not None:
+        entry = (generation, value)
+        cache.set(key, entry, timeout=SHARED_TTL)
+        local.set(key, entry)
+    _record('miss', start)
+    return value
+
+
+def _record(path, start):
+    counters.incr(f'{path}_us', int((time.perf_counter() - start) * 1e6))
+    counters.incr('misses' if path == 'miss' else f'{path}_hits')
+
+
+def invalidate(token_keys):
+    keys = [cache_key(token_key) for token_key in token_keys]
+    if not keys:
+        return
+
+    def bump():
+        for key in keys:
+            local.delete(key)
+        cache.set_many(
+            {generation_key(key): secrets.token_hex(8) for key in keys}, timeout=GENERATION_TTL,
+        )
+        cache.delete_many(keys)
+
+    bump()
+    # Tranzaksiya davomida eski qiymatni qayta yozgan so'rovlar uchun
+    transaction.on_commit(bump)
+
+
+def stats():
+    data = counters.snapshot()
+    hits = data['local_hits'] + data['shared_hits']
+    lookups = hits + data['misses']
+
+    def average(total, count):
+        return round(total / count) if count else None
+
+    miss_us = average(data['miss_us'], data['misses'])
+    hit_us = average(data['local_us'] + data['shared_us'], hits)
+    return {
+        'local_hits': data['local_hits'],
+        'shared_hits': data['shared_hits'],
+        'misses': data['misses'],
+        'hit_ratio': ratio(hits, lookups),
+        'avg_local_hit_us': average(data['local_us'], data['local_hits']),
+        'avg_shared_hit_us': average(data['shared_us'], data['shared_hits']),
+        'avg_miss_us': miss_us,
+        # Har bir hit o'rtacha miss (baza) narxidan qancha tejadi
+        'saved_ms': round(hits * (miss_us - hit_us) / 1000, 1) if miss_us and hit_us is not None else None,
+    }
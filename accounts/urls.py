@@ -26,6 +26,8 @@ urlpatterns = [
     
     # Password
     path('change-password/', views.ChangePasswordView.as_view(), name='change_password'),
+    path('token-cache-stats/', views.TokenCacheStatsView.as_view(), name='token_cache_stats'),
+    path('hashing-stats/', views.HashingStatsView.as_view(), name='hashing_stats'),
 
     # Homework 1: Password Reset
     path('password-reset-request/', views.PasswordResetRequestView.as_view(), name='password_reset_request'),
@@ -35,6 +37,7 @@ urlpatterns = [
     path('jwt/login/', views.JWTLoginView.as_view(), name='jwt_login'),
     path('jwt/refresh/', TokenRefreshView.as_view(), name='jwt_refresh'),
     path('jwt/verify/', TokenVerifyView.as_view(), name='jwt_verify'),
+    path('jwt/logout/', views.JWTLogoutView.as_view(), name='jwt_logout'),
 
     # Homework 3: Session Authentication
     path('session/login/', views.SessionLoginView.as_view(), name='session_login'),
@@ -4,13 +4,12 @@ Accounts app - Authentication views (Class-Based Views)
 
 from django.shortcuts import render
 from django.contrib.auth.models import User
-from django.contrib.auth import authenticate
 
 from rest_framework.authtoken.models import Token
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
 
 # === IMPORTS FOR HOMEWORK 1: PASSWORD RESET ===
 import secrets
@@ -19,16 +18,25 @@ from django.core.cache import cache
 # === IMPORTS FOR HOMEWORK 2: JWT AUTHENTICATION ===
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework.exceptions import AuthenticationFailed
+from django.contrib.auth.models import update_last_login
+from rest_framework_simplejwt.tokens import RefreshToken, Token as JWTToken
+from . import hashing, revocation, token_cache
+from .authentication import full_user
+from asgiref.sync import sync_to_async
+from library_project.async_views import AsyncAPIView, AsyncAPIViewMixin, async_api_view
 
 # === IMPORT FOR HOMEWORK 3: SESSION AUTHENTICATION
-from django.contrib.auth import login as django_login, logout as django_logout
+from django.contrib.auth import alogin as django_alogin, logout as django_logout
 from rest_framework.authentication import SessionAuthentication
 
 # === IMPORT FOR HOMEWORK 4: BASIC AUTHENTICATION
-from rest_framework.authentication import BasicAuthentication
+from .authentication import CachedBasicAuthentication
 
 # === IMPORTS FOR LESSON 14: USER REGISTRATION ===
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import permission_classes
 from .serializers import UserRegistrationSerializer, UserSerializer
 from rest_framework.views import APIView
 
@@ -105,17 +113,18 @@ class RegisterView(APIView):
 # LOGIN - Tizimga kirish
 # ============================================
 
-class LoginView(APIView):
+class LoginView(AsyncAPIView):
     """
     Foydalanuvchi login qilish va token olish
     
     POST /api/accounts/login/
     Body: {"username": "admin", "password": "admin123"}
+    Parol xeshlash pool'i band bo'lsa: 503 + Retry-After
     """
     permission_classes = [AllowAny]
     authentication_classes = []
 
-    def post(self, request):
+    async def post(self, request):
         username = request.data.get('username')
         password = request.data.get('password')
         
@@ -126,12 +135,12 @@ class LoginView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Autentifikatsiya
-        user = authenticate(username=username, password=password)
+        # Autentifikatsiya (xesh - alohida pool'da)
+        user = await hashing.aauthenticate(request, username, password)
         
         if user:
             # Token yaratish yoki olish
-            token, created = Token.objects.get_or_create(user=user)
+            token, created = await Token.objects.aget_or_create(user=user)
             return Response({
                 'message': 'Login muvaffaqiyatli',
                 'token': token.key,
@@ -167,7 +176,7 @@ class LogoutView(APIView):
     def post(self, request):
         try:
             # Foydalanuvchining tokenini o'chirish
-            request.user.auth_token.delete()
+            full_user(request.user).auth_token.delete()
             return Response(
                 {'message': 'Muvaffaqiyatli logout qilindi'},
                 status=status.HTTP_200_OK
@@ -193,7 +202,7 @@ class UserInfoView(APIView):
     permission_classes = [IsAuthenticated]
     
     def get(self, request):
-        user = request.user
+        user = full_user(request.user)
         return Response({
             'id': user.pk,
             'username': user.username,
@@ -228,7 +237,7 @@ class ProfileUpdateView(APIView):
         return self._update_profile(request)
     
     def _update_profile(self, request):
-        user = request.user
+        user = full_user(request.user)
         
         # Ma'lumotlarni yangilash
         user.first_name = request.data.get('first_name', user.first_name)
@@ -273,7 +282,7 @@ class ChangePasswordView(APIView):
     permission_classes = [IsAuthenticated]
     
     def post(self, request):
-        user = request.user
+        user = full_user(request.user)
         old_password = request.data.get('old_password')
         new_password = request.data.get('new_password')
         
@@ -304,6 +313,33 @@ class ChangePasswordView(APIView):
             'token': new_token.key
         }, status=status.HTTP_200_OK)
     
+
+class HashingStatsView(APIView):
+    """
+    Parol xeshlash pool'i statistikasi (admin, joriy worker jarayoni)
+
+    GET /api/accounts/hashing-stats/
+    running/queued (navbat), rejected (503), avg/max xesh vaqti
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(hashing.stats(), status=status.HTTP_200_OK)
+
+
+class TokenCacheStatsView(APIView):
+    """
+    Token -> User cache statistikasi (admin)
+
+    GET /api/accounts/token-cache-stats/
+    hit_ratio, o'rtacha hit/miss vaqti va tejalgan vaqt (saved_ms)
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(token_cache.stats(), status=status.HTTP_200_OK)
+
+
 # ============================================
 # HOMEWORK 1: PASSWORD RESET (Token Auth)
 # ============================================
@@ -446,11 +482,16 @@ class CustomJWTSerializer(TokenObtainPairSerializer):
         token['username'] = user.username
         token['email'] = user.email
         token['is_staff'] = user.is_staff
-        
+        # Deny-list bilan soniya ulushlarigacha solishtirish uchun
+        revocation.stamp(token)
+
         return token
     
     def validate(self, attrs):
-        data = super().validate(attrs)
+        if 'authenticated_user' in self.context:
+            data = self._authenticated_tokens()
+        else:
+            data = super().validate(attrs)
         
         # Response'ga qo'shimcha ma'lumot
         data['user'] = {
@@ -463,8 +504,22 @@ class CustomJWTSerializer(TokenObtainPairSerializer):
         
         return data
 
+    def _authenticated_tokens(self):
+        # JWTLoginView parolni hashing pool'ida tekshirgan: TokenObtainPairSerializer.validate
+        # bilan bir xil, faqat authenticate() qayta chaqirilmaydi
+        self.user = self.context['authenticated_user']
+        if not jwt_settings.USER_AUTHENTICATION_RULE(self.user):
+            raise AuthenticationFailed(
+                self.error_messages['no_active_account'], 'no_active_account',
+            )
+        refresh = self.get_token(self.user)
+        data = {'refresh': str(refresh), 'access': str(refresh.access_token)}
+        if jwt_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, self.user)
+        return data
+
 
-class JWTLoginView(TokenObtainPairView):
+class JWTLoginView(AsyncAPIViewMixin, TokenObtainPairView):
     """
     JWT Login - Custom response bilan
     
@@ -480,12 +535,62 @@ class JWTLoginView(TokenObtainPairView):
     """
     serializer_class = CustomJWTSerializer
 
+    async def post(self, request, *args, **kwargs):
+        # Parol avval pool'da tekshiriladi, serializer faqat token yaratadi
+        user = None
+        username = request.data.get(CustomJWTSerializer.username_field)
+        password = request.data.get('password')
+        if username and password:
+            user = await hashing.aauthenticate(request, username, password)
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.context['authenticated_user'] = user
+        try:
+            await sync_to_async(serializer.is_valid)(raise_exception=True)
+        except TokenError as e:
+            raise InvalidToken(e.args[0])
+        return Response(serializer.validated_data, status=status.HTTP_200_OK)
+
+
+class JWTLogoutView(APIView):
+    """
+    JWT logout - access (va berilsa refresh) tokenni bekor qilish
+
+    POST /api/accounts/jwt/logout/
+    Header: Authorization: Bearer <access>
+    Body: {"refresh": "eyJ0eXAi..."}  (ixtiyoriy)
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        if not isinstance(request.auth, JWTToken):
+            return Response(
+                {'error': 'JWT token talab qilinadi'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        refresh = request.data.get('refresh')
+        if refresh:
+            try:
+                revocation.revoke_token(RefreshToken(refresh))
+            except TokenError:
+                return Response(
+                    {'error': 'Refresh token yaroqsiz'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        revocation.revoke_token(request.auth)
+
+        return Response(
+            {'message': 'JWT logout muvaffaqiyatli'},
+            status=status.HTTP_200_OK
+        )
+
 # ============================================
 # HOMEWORK 3: SESSION AUTHENTICATION
 # ============================================
 
 
-class SessionLoginView(APIView):
+class SessionLoginView(AsyncAPIView):
     """
     Session-based login (Cookie bilan)
     
@@ -495,7 +600,7 @@ class SessionLoginView(APIView):
     permission_classes = [AllowAny]
     authentication_classes = []
     
-    def post(self, request):
+    async def post(self, request):
         username = request.data.get('username')
         password = request.data.get('password')
         
@@ -505,12 +610,12 @@ class SessionLoginView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Authenticate
-        user = authenticate(username=username, password=password)
+        # Authenticate (xesh - alohida pool'da)
+        user = await hashing.aauthenticate(request, username, password)
         
         if user:
             # Django session yaratish
-            django_login(request, user)
+            await django_alogin(request, user)
             
             return Response({
                 'message': 'Session login muvaffaqiyatli',
@@ -577,7 +682,7 @@ class BasicAuthUserInfoView(APIView):
     
     Authorization: Basic base64(username:password)
     """
-    authentication_classes = [BasicAuthentication]
+    authentication_classes = [CachedBasicAuthentication]
     permission_classes = [IsAuthenticated]
     
     def get(self, request):
@@ -601,7 +706,7 @@ class BasicAuthTestView(APIView):
     
     POST /api/accounts/basic/test/
     """
-    authentication_classes = [BasicAuthentication]
+    authentication_classes = [CachedBasicAuthentication]
     permission_classes = [IsAuthenticated]
     
     def post(self, request):
@@ -616,20 +721,26 @@ class BasicAuthTestView(APIView):
 # ============================================
 
 from rest_framework import status, generics
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import permission_classes
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from .serializers import UserRegistrationSerializer, UserSerializer
 
 
+async def save_registration(serializer):
+    """Parol pool'da xeshlanadi, keyin serializer.save() (bazaga yozish)"""
+    password_hash = await hashing.amake_password(serializer.validated_data['password'])
+    return await sync_to_async(serializer.save)(password_hash=password_hash)
+
+
 # ========================================
 # VARIANT 1: FUNCTION-BASED VIEW
 # ========================================
 
-@api_view(['POST'])
+@async_api_view(['POST'])
 @permission_classes([AllowAny])
-def register_user(request):
+async def register_user(request):
     """
     Function-based registration
     
@@ -644,8 +755,8 @@ def register_user(request):
     """
     serializer = UserRegistrationSerializer(data=request.data)
     
-    if serializer.is_valid():
-        user = serializer.save()
+    if await sync_to_async(serializer.is_valid)():
+        user = await save_registration(serializer)
         user_serializer = UserSerializer(user)
         
         return Response({
@@ -660,7 +771,7 @@ def register_user(request):
 # VARIANT 2: CLASS-BASED VIEW (APIView)
 # ========================================
 
-class RegisterUserAPIView(APIView):
+class RegisterUserAPIView(AsyncAPIView):
     """
     Class-based registration (APIView)
     
@@ -668,11 +779,11 @@ class RegisterUserAPIView(APIView):
     """
     permission_classes = [AllowAny]
     
-    def post(self, request):
+    async def post(self, request):
         serializer = UserRegistrationSerializer(data=request.data)
         
-        if serializer.is_valid():
-            user = serializer.save()
+        if await sync_to_async(serializer.is_valid)():
+            user = await save_registration(serializer)
             user_serializer = UserSerializer(user)
             
             return Response({
@@ -687,7 +798,7 @@ class RegisterUserAPIView(APIView):
 # VARIANT 3: GENERIC VIEW (Professional)
 # ========================================
 
-class RegisterUserGenericView(generics.CreateAPIView):
+class RegisterUserGenericView(AsyncAPIViewMixin, generics.CreateAPIView):
     """
     Generic view registration (Professional)
     
@@ -696,10 +807,10 @@ class RegisterUserGenericView(generics.CreateAPIView):
     serializer_class = UserRegistrationSerializer
     permission_classes = [AllowAny]
     
-    def create(self, request, *args, **kwargs):
+    async def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        user = serializer.save()
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
+        user = await save_registration(serializer)
         
         user_serializer = UserSerializer(user)
         headers = self.get_success_headers(serializer.data)
@@ -1,9 +1,33 @@
 from django.contrib import admin
-from .models import Book
+from .models import Book, BookStatistics, BookTombstone
+from . import search
 
 # Register your models here.
 @admin.register(Book)
 class BookAdmin(admin.ModelAdmin):
   list_display = ("id","title", "author", "published_date", "isbn_number", "price", "published")
   search_fields = ("title", "author", "isbn_number", "language")
-  list_filter = ("published_date", "language", "published")
\ No newline at end of file
+  list_filter = ("published_date", "language", "published")
+
+  def get_search_results(self, request, queryset, search_term):
+    """
+    Odatdagi search_fields qidiruvi (icontains) + FTS5 mosliklari
+    (books/search.py): diakritikasiz va so'z prefiksi bo'yicha topilganlar ham
+    """
+    results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+    if not search_term.strip():
+      return results, may_have_duplicates
+    return results | search.filter_queryset(queryset, search_term), may_have_duplicates
+
+
+@admin.register(BookStatistics)
+class BookStatisticsAdmin(admin.ModelAdmin):
+  list_display = ("language", "year", "published", "book_count", "price_min", "price_max")
+  list_filter = ("published", "language")
+
+
+
+@admin.register(BookTombstone)
+class BookTombstoneAdmin(admin.ModelAdmin):
+  list_display = ("version", "book_id", "isbn_number", "deleted_at")
+  search_fields = ("isbn_number",)
@@ -1,6 +1,22 @@
 from django.apps import AppConfig
+from django.db import connections
+from django.db.models.signals import post_migrate
 
 
 class BooksConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "books"
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        post_migrate.connect(ensure_search_schema, sender=self)
+
+
+def ensure_search_schema(sender, using, **kwargs):
+    """
+    SQLite'da migratsiya books_book jadvalini qayta yaratsa, FTS trigger'lari
+    yo'qoladi - ularni tiklaymiz (books/search.py)
+    """
+    from . import search
+
+    search.ensure_schema(connections[using])
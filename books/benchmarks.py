@@ -0,0 +1,750 @@
+"""
+Benchmarks
+==========
+
+python manage.py benchmark --list
+python manage.py benchmark cache --iterations 5000
+
+Har bir suite `@suite('nomi')` bilan ro'yxatdan o'tadi va natijani
+jadval ko'rinishida chiqaradi. Suite'lar throwaway_databases() ichida -
+vaqtinchalik (migrate qilingan) baza va cache'da ishlaydi.
+"""
+
+import asyncio
+import os
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import date
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache.backends.db import DatabaseCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+from django.test.utils import override_settings, setup_databases, teardown_databases
+
+SUITES = {}
+
+
+@contextmanager
+def throwaway_databases():
+    """
+    Test runner kabi: har bir alias uchun vaqtinchalik fayl bazasi (migrate
+    bilan yaratiladi, readonly - mirror) va vaqtinchalik cache. Sozlangan
+    baza, uning cache jadvallari va foydalanuvchilariga tegilmaydi, uzun
+    yozish tranzaksiyalari ham haqiqiy WAL yozuvchisini bloklamaydi.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        test_settings = connections[DEFAULT_DB_ALIAS].settings_dict.setdefault('TEST', {})
+        previous_name = test_settings.get('NAME')
+        test_settings['NAME'] = os.path.join(directory, 'benchmark.sqlite3')
+        caches = {
+            alias: {**options, 'LOCATION': os.path.join(directory, f'cache-{alias}.sqlite3')}
+            for alias, options in settings.CACHES.items()
+        }
+        try:
+            with override_settings(CACHES=caches):
+                old_config = setup_databases(verbosity=0, interactive=False, serialized_aliases=set())
+                try:
+                    yield
+                finally:
+                    teardown_databases(old_config, verbosity=0)
+        finally:
+            test_settings['NAME'] = previous_name
+
+
+def suite(name):
+    def register(func):
+        SUITES[name] = func
+        return func
+    return register
+
+
+def measure(func, iterations):
+    """func(i) ni iterations marta chaqirib, soniyada necha marta (ops/s)"""
+    start = time.perf_counter()
+    for i in range(iterations):
+        func(i)
+    elapsed = time.perf_counter() - start
+    return iterations / elapsed if elapsed else float('inf')
+
+
+def write_table(out, headers, rows):
+    widths = [
+        max(len(str(value)) for value in column)
+        for column in zip(headers, *rows)
+    ]
+    line = '  '.join(f'{{:<{width}}}' for width in widths)
+    out.write(line.format(*headers))
+    out.write(line.format(*('-' * width for width in widths)))
+    for row in rows:
+        out.write(line.format(*row))
+
+
+def rss_bytes():
+    """Joriy jarayonning RSS xotirasi (Linux: /proc, aks holda peak ru_maxrss)"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def create_books(count, batch_size=5000):
+    from books.models import Book
+
+    for start in range(0, count, batch_size):
+        Book.objects.bulk_create([
+            Book(
+                title=f'Benchmark Book {i}',
+                subtitle='Benchmark',
+                author='Benchmark Author',
+                isbn_number=f'{900000000000 + i:013d}',
+                price=Decimal('25000.00') + i % 1000,
+                published_date=date(2000 + i % 25, 1, 1),
+                pages=100 + i % 500,
+                language='uz',
+                published=bool(i % 2),
+            )
+            for i in range(start, min(start + batch_size, count))
+        ])
+
+
+@contextmanager
+def temporary_books(count, batch_size=5000):
+    """count ta vaqtinchalik kitob - suite tugagach rollback qilinadi"""
+    with transaction.atomic():
+        create_books(count, batch_size)
+        yield
+        transaction.set_rollback(True)
+
+
+# ============================================
+# CACHE
+# ============================================
+
+@suite('cache')
+def bench_cache(out, iterations):
+    """LocMemCache vs SQLiteCache (umumiy) vs DatabaseCache"""
+    from library_project.cache import SQLiteCache
+
+    tmpdir = tempfile.mkdtemp()
+    table = 'benchmark_cache_table'
+    backends = {
+        'locmem': LocMemCache('benchmark', {'OPTIONS': {'MAX_ENTRIES': iterations * 2}}),
+        'sqlite (shared)': SQLiteCache(
+            os.path.join(tmpdir, 'cache.sqlite3'), {'OPTIONS': {'MAX_ENTRIES': iterations * 2}}
+        ),
+        'database': DatabaseCache(table, {'OPTIONS': {'MAX_ENTRIES': iterations * 2}}),
+    }
+    call_command('createcachetable', table, verbosity=0)
+
+    rows = []
+    try:
+        for name, cache in backends.items():
+            cache.set('counter', 0)
+            rows.append((
+                name,
+                f"{measure(lambda i: cache.set(f'key:{i}', {'id': i, 'title': 'Book'}), iterations):,.0f}",
+                f"{measure(lambda i: cache.get(f'key:{i}'), iterations):,.0f}",
+                f"{measure(lambda i: cache.get(f'missing:{i}'), iterations):,.0f}",
+                f"{measure(lambda i: cache.incr('counter'), iterations):,.0f}",
+                f"{measure(lambda i: cache.add(f'lock:{i}', 1), iterations):,.0f}",
+            ))
+            cache.clear()
+    finally:
+        with connection.schema_editor() as editor:
+            editor.execute(f'DROP TABLE IF EXISTS {connection.ops.quote_name(table)}')
+
+    out.write(f'Cache backend ops/s ({iterations} iterations)')
+    write_table(out, ('backend', 'set', 'get hit', 'get miss', 'incr', 'add'), rows)
+
+
+# ============================================
+# EXPORT
+# ============================================
+
+@suite('export')
+def bench_export(out, iterations):
+    """NDJSON / CSV eksport: qator/s va RSS (iterations = qatorlar soni)"""
+    from books import export
+    from books.models import Book
+    from books.serializers import BookSerializer
+
+    variants = {
+        'ndjson': lambda qs: export.encode_stream(export.iter_ndjson(qs, BookSerializer)),
+        'ndjson + gzip': lambda qs: export.gzip_stream(export.iter_ndjson(qs, BookSerializer)),
+        'csv': lambda qs: export.encode_stream(export.iter_csv(qs, BookSerializer)),
+        'csv + gzip': lambda qs: export.gzip_stream(export.iter_csv(qs, BookSerializer)),
+    }
+
+    rows = []
+    with temporary_books(iterations):
+        total = Book.objects.count()
+        for name, stream in variants.items():
+            before = peak = rss_bytes()
+            written = 0
+            start = time.perf_counter()
+            for chunk in stream(Book.objects.all()):
+                written += len(chunk)
+                peak = max(peak, rss_bytes())
+            elapsed = time.perf_counter() - start
+            rows.append((
+                name,
+                f'{total / elapsed:,.0f}',
+                f'{written / 1024 / 1024:,.1f}',
+                f'{before / 1024 / 1024:,.1f}',
+                f'{(peak - before) / 1024 / 1024:+,.1f}',
+            ))
+
+    out.write(f'Export ({total:,} rows)')
+    write_table(out, ('format', 'rows/s', 'MB out', 'RSS MB', 'RSS delta MB'), rows)
+
+
+# ============================================
+# READ PATH
+# ============================================
+
+@suite('representation')
+def bench_representation(out, iterations):
+    """serializer.data vs tezkor o'qish yo'li (10k qatorli sahifa)"""
+    from rest_framework.renderers import JSONRenderer
+
+    from books import representation
+    from books.models import Book
+    from books.serializers import BookSerializer
+
+    page_size = 10000
+    renderer = JSONRenderer()
+    fast = representation.for_serializer(BookSerializer)
+
+    def serializer_page():
+        return BookSerializer(Book.objects.order_by('pk')[:page_size], many=True).data
+
+    def fast_page():
+        return fast.convert(fast.values(Book.objects.order_by('pk')[:page_size]))
+
+    rows = []
+    with temporary_books(page_size):
+        count = Book.objects.order_by('pk')[:page_size].count()
+        if renderer.render(serializer_page()) != renderer.render(fast_page()):
+            out.write('JSON mos kelmadi!')
+            return
+        repeats = max(1, iterations // 1000)
+        for name, build in (('ModelSerializer', serializer_page), ('values() + converters', fast_page)):
+            data_rate = measure(lambda i: build(), repeats) * count
+            render_rate = measure(lambda i: renderer.render(build()), repeats) * count
+            rows.append((name, f'{data_rate:,.0f}', f'{render_rate:,.0f}'))
+
+    out.write(f'Read path ({count:,} qatorli sahifa, {repeats} marta, rows/s)')
+    write_table(out, ('path', 'data', 'data + JSON'), rows)
+
+
+# ============================================
+# RENDERERS
+# ============================================
+
+@suite('renderers')
+def bench_renderers(out, iterations):
+    """JSONRenderer vs FastJSONRenderer (orjson) vs MessagePack: vaqt va hajm"""
+    from rest_framework.renderers import JSONRenderer
+
+    from books import representation
+    from books.models import Book
+    from books.serializers import BookSerializer
+    from library_project import renderers
+
+    candidates = {'JSONRenderer': JSONRenderer(), 'FastJSONRenderer': renderers.FastJSONRenderer()}
+    if renderers.msgpack is not None:
+        candidates['MessagePackRenderer'] = renderers.MessagePackRenderer()
+    if renderers.orjson is None:
+        out.write("orjson o'rnatilmagan - FastJSONRenderer oddiy JSONRenderer'ga tushadi")
+
+    fast = representation.for_serializer(BookSerializer)
+    sizes = (10, 1000, 100000)
+    rows = []
+    with temporary_books(max(sizes)):
+        for size in sizes:
+            data = fast.convert(fast.values(Book.objects.order_by('pk')[:size]))
+            repeats = max(1, min(1000, iterations * 10 // size))
+            for name, renderer in candidates.items():
+                payload = renderer.render(data)
+                per_render = 1000 / measure(lambda i: renderer.render(data), repeats)
+                rows.append((f'{len(data):,}', name, f'{per_render:,.3f}', f'{len(payload) / 1024:,.1f}'))
+
+    out.write('Render (ms per render, KB)')
+    write_table(out, ('books', 'renderer', 'ms', 'KB'), rows)
+
+
+# ============================================
+# COMPRESSION
+# ============================================
+
+@suite('compression')
+def bench_compression(out, iterations):
+    """gzip / brotli darajalari: CPU vaqti va hajm (JSON ro'yxat)"""
+    from books import representation
+    from books.models import Book
+    from books.serializers import BookSerializer
+    from library_project import middleware
+    from library_project.renderers import json_dumps
+
+    fast = representation.for_serializer(BookSerializer)
+    # Taxminiy uzatish vaqti uchun kanal tezligi (Mbit/s)
+    bandwidth = 10
+    variants = [('gzip', level) for level in (1, 4, 6, 9)]
+    if middleware.brotli is not None:
+        variants += [('br', level) for level in (1, 4, 5, 8, 11)]
+
+    rows = []
+    with temporary_books(10000):
+        for size in (100, 10000):
+            payload = json_dumps(fast.convert(fast.values(Book.objects.order_by('pk')[:size])))
+            raw_transfer = len(payload) * 8 / (bandwidth * 1e6) * 1000
+            rows.append((f'{size:,}', 'identity', '-', '0.00', f'{len(payload) / 1024:,.1f}', '1.00', f'{raw_transfer:,.1f}'))
+            repeats = max(1, min(200, iterations * 10 // size))
+            for encoding, level in variants:
+                compressed = middleware.compress(payload, encoding, level)
+                cpu = 1000 / measure(lambda i: middleware.compress(payload, encoding, level), repeats)
+                transfer = len(compressed) * 8 / (bandwidth * 1e6) * 1000
+                rows.append((
+                    f'{size:,}', encoding, level, f'{cpu:,.2f}',
+                    f'{len(compressed) / 1024:,.1f}', f'{len(payload) / len(compressed):,.2f}',
+                    f'{cpu + transfer:,.1f}',
+                ))
+
+    out.write(f'Compression (ms CPU, KB, ratio, jami ms = CPU + {bandwidth} Mbit/s uzatish)')
+    write_table(out, ('books', 'encoding', 'level', 'cpu ms', 'KB', 'ratio', 'total ms'), rows)
+
+
+# ============================================
+# AUTHENTICATION
+# ============================================
+
+@suite('auth')
+def bench_auth(out, iterations):
+    """Eski zanjir (JWT -> Token -> Session -> Basic) vs sxema bo'yicha dispatch"""
+    import base64
+
+    from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+    from django.contrib.auth.middleware import AuthenticationMiddleware
+    from django.contrib.auth.models import User
+    from django.contrib.sessions.backends.db import SessionStore
+    from django.contrib.sessions.middleware import SessionMiddleware
+    from django.conf import settings
+    from django.test.utils import CaptureQueriesContext, override_settings
+    from rest_framework.authentication import (
+        BasicAuthentication,
+        SessionAuthentication,
+        TokenAuthentication,
+    )
+    from rest_framework.authtoken.models import Token
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from accounts.authentication import CachedBasicAuthentication, SchemeDispatchAuthentication
+    from books.models import Book
+    from books.views import BookViewSet
+
+    chains = {
+        'chain': [JWTAuthentication, TokenAuthentication, SessionAuthentication, BasicAuthentication],
+        'dispatch': [SchemeDispatchAuthentication],
+    }
+    factory = APIRequestFactory()
+
+    # Basic'da parol xeshlash ikkala variantda bir xil - uni o'lchovdan chiqarish uchun MD5
+    with override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher']), \
+            temporary_books(1):
+        user = User.objects.create_user('benchmark-auth', password='benchmark-pass')
+        token = Token.objects.create(user=user)
+        session = SessionStore()
+        session.update({
+            SESSION_KEY: str(user.pk),
+            BACKEND_SESSION_KEY: 'django.contrib.auth.backends.ModelBackend',
+            HASH_SESSION_KEY: user.get_session_auth_hash(),
+        })
+        session.create()
+        cookie = f'{settings.SESSION_COOKIE_NAME}={session.session_key}'
+        basic = base64.b64encode(b'benchmark-auth:benchmark-pass').decode()
+        pk = Book.objects.filter(subtitle='Benchmark').values_list('pk', flat=True).first()
+
+        def wrap(classes):
+            # Middleware'lar request.session / request.user ni beradi (SessionAuthentication uchun)
+            view = BookViewSet.as_view({'get': 'retrieve'}, authentication_classes=classes)
+            return SessionMiddleware(AuthenticationMiddleware(lambda request: view(request, pk=pk)))
+
+        views = {name: wrap(classes) for name, classes in chains.items()}
+
+        scenarios = {
+            'anonim': {},
+            'session cookie': {'HTTP_COOKIE': cookie},
+            'Token': {'HTTP_AUTHORIZATION': f'Token {token.key}'},
+            'Bearer (JWT)': {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(user)}'},
+            'Basic': {'HTTP_AUTHORIZATION': f'Basic {basic}'},
+            'Basic + cookie': {'HTTP_AUTHORIZATION': f'Basic {basic}', 'HTTP_COOKIE': cookie},
+        }
+
+        session_middleware = SessionMiddleware(lambda request: None)
+        auth_middleware = AuthenticationMiddleware(lambda request: None)
+        rows = []
+        for scenario, headers in scenarios.items():
+            row = [scenario]
+            for name, view in views.items():
+                authenticators = [cls() for cls in chains[name]]
+
+                def authenticate(i):
+                    # Faqat autentifikatsiya bosqichi: DRF Request.user
+                    request = factory.get(f'/api/books/{pk}/', **headers)
+                    session_middleware.process_request(request)
+                    auth_middleware.process_request(request)
+                    return Request(request, authenticators=authenticators).user
+
+                def get(i):
+                    return view(factory.get(f'/api/books/{pk}/', **headers))
+
+                assert get(0).status_code == 200
+                with CaptureQueriesContext(connection) as queries:
+                    get(0)
+                row += [
+                    f'{1e6 / measure(authenticate, iterations):,.0f}',
+                    f'{1e6 / measure(get, iterations):,.0f}',
+                    len(queries),
+                ]
+            rows.append(row)
+
+    out.write(f"{iterations} so'rov: auth = faqat Request.user, GET = BookViewSet retrieve (mikrosekund)")
+    write_table(
+        out,
+        ('scenario', 'chain auth', 'chain GET', 'chain sql', 'dispatch auth', 'dispatch GET', 'dispatch sql'),
+        rows,
+    )
+
+    # Haqiqiy parol xeshi (PASSWORD_HASHERS[0], odatda PBKDF2) bilan Basic
+    with transaction.atomic():
+        User.objects.create_user('benchmark-basic', password='benchmark-pass')
+        headers = {'HTTP_AUTHORIZATION': 'Basic ' + base64.b64encode(b'benchmark-basic:benchmark-pass').decode()}
+        timings = []
+        for authenticator, repeats in ((BasicAuthentication(), 5), (CachedBasicAuthentication(), iterations)):
+            def authenticate(i):
+                request = Request(factory.get('/api/books/', **headers), authenticators=[authenticator])
+                assert request.user.is_authenticated
+
+            authenticate(0)
+            timings.append(1e6 / measure(authenticate, repeats))
+        transaction.set_rollback(True)
+    out.write(
+        f'Basic ({settings.PASSWORD_HASHERS[0].rsplit(".", 1)[-1]}): '
+        f'BasicAuthentication {timings[0]:,.0f} us, CachedBasicAuthentication {timings[1]:,.0f} us'
+    )
+
+
+# ============================================
+# SESSIONS
+# ============================================
+
+@suite('sessions')
+def bench_sessions(out, iterations):
+    """Session bilan GET /api/accounts/session/me/: db + har so'rovda saqlash vs cached_db + refresh"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from django.contrib.auth.models import User
+    from django.db import connections
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext, override_settings
+
+    modes = {
+        'db, SAVE_EVERY_REQUEST': {
+            'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+            'SESSION_SAVE_EVERY_REQUEST': True,
+        },
+        'cached_db + refresh': {
+            'SESSION_ENGINE': 'django.contrib.sessions.backends.cached_db',
+            'SESSION_SAVE_EVERY_REQUEST': False,
+        },
+    }
+    url = '/api/accounts/session/me/'
+    threads = 4
+
+    # Oqimlar alohida ulanish ishlatadi - foydalanuvchi commit qilinadi va oxirida o'chiriladi
+    user = User.objects.create_user('benchmark-session', password='benchmark-pass')
+    rows = []
+    try:
+        for name, overrides in modes.items():
+            with override_settings(**overrides):
+                def logged_in_client():
+                    client = Client()
+                    client.force_login(user)
+                    return client
+
+                client = logged_in_client()
+                assert client.get(url).status_code == 200
+                with CaptureQueriesContext(connection) as queries:
+                    client.get(url)
+                # request_started keyingi so'rovda connection.queries'ni tozalaydi
+                total = len(queries)
+                writes = sum(not query['sql'].startswith('SELECT') for query in queries)
+                single = measure(lambda i: client.get(url), iterations)
+
+                def worker(count):
+                    worker_client = logged_in_client()
+                    try:
+                        for _ in range(count):
+                            worker_client.get(url)
+                    finally:
+                        worker_client.logout()
+                        connections.close_all()
+
+                start = time.perf_counter()
+                with ThreadPoolExecutor(threads) as pool:
+                    list(pool.map(worker, [iterations // threads] * threads))
+                concurrent = (iterations // threads * threads) / (time.perf_counter() - start)
+                client.logout()
+
+            rows.append((name, total, writes, f'{single:,.0f}', f'{concurrent:,.0f}'))
+    finally:
+        user.delete()
+
+    out.write(f"{iterations} so'rov; concurrent = {threads} oqim (SQLite writer lock)")
+    write_table(out, ('mode', 'sql', 'writes', 'req/s', f'req/s x{threads}'), rows)
+
+
+# ============================================
+# ASGI vs WSGI
+# ============================================
+
+SERVER_PROFILES = {
+    'wsgi sync': {'SERVER_MODE': 'wsgi'},
+    'wsgi gthread x8': {'SERVER_MODE': 'wsgi', 'GUNICORN_THREADS': '8'},
+    'asgi uvicorn': {'SERVER_MODE': 'asgi'},
+}
+
+
+# seed_database() yaratadigan foydalanuvchining tokeni (yozish so'rovlari uchun)
+BENCHMARK_TOKEN = 'b' * 40
+
+# Server jarayoniga joriy muhitdan o'tmaydigan o'zgaruvchilar (profillar beradi)
+SERVER_VARIABLES = ('ASYNC_VIEWS', 'SERVER_MODE', 'GUNICORN_THREADS', 'WEB_CONCURRENCY', 'SQLITE_PROFILE')
+
+
+def seed_database(count):
+    """Server suite'lari uchun: vaqtinchalik bazaga kitoblar, statistika va token"""
+    from django.contrib.auth.models import User
+    from rest_framework.authtoken.models import Token
+
+    from books import statistics
+
+    create_books(count)
+    statistics.rebuild()
+    user = User.objects.create_user('benchmark', password=None)
+    Token.objects.create(user=user, key=BENCHMARK_TOKEN)
+
+
+def server_environment(directory, books=1000, **overrides):
+    """
+    directory'da vaqtinchalik baza va cache (migrate + seed_database) -
+    gunicorn_server() uchun muhit. Serverlar alohida jarayonda, shuning
+    uchun ma'lumotlar bazaga commit qilinadi.
+    """
+    env = {key: value for key, value in os.environ.items() if key not in SERVER_VARIABLES}
+    env.update(
+        DB_NAME=os.path.join(directory, 'db.sqlite3'),
+        CACHE_LOCATION=os.path.join(directory, 'cache.sqlite3'),
+        REVOCATION_CACHE_LOCATION=os.path.join(directory, 'revocations.sqlite3'),
+        ALLOWED_HOSTS='127.0.0.1',
+        DEBUG='False',
+        **overrides,
+    )
+    manage = [sys.executable, 'manage.py']
+    subprocess.run([*manage, 'migrate', '--verbosity', '0'], cwd=settings.BASE_DIR, env=env, check=True)
+    subprocess.run(
+        [*manage, 'shell', '-c', f'from books.benchmarks import seed_database; seed_database({books})'],
+        cwd=settings.BASE_DIR, env=env, check=True, stdout=subprocess.DEVNULL,
+    )
+    return env
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def gunicorn_server(env):
+    """gunicorn -c gunicorn.conf.py (bitta worker) - port qaytaradi"""
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+         '--bind', f'127.0.0.1:{port}', '--workers', '1', '--log-level', 'warning'],
+        cwd=settings.BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=1).close()
+                break
+            except OSError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError(f"gunicorn ishga tushmadi: {' '.join(process.args)}")
+                time.sleep(0.1)
+        yield port
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+async def http_load(port, paths, connections, requests, method='GET', body=None, headers=None):
+    """
+    connections ta parallel keep-alive ulanish orqali jami requests ta so'rov
+    -> (req/s, latency ro'yxati, 2xx bo'lmagan javoblar soni). body(number)
+    - so'rov body'si (JSON). Server `Connection: close` desa qayta ulanadi.
+    """
+    numbers = iter(range(requests))
+    latencies = []
+    errors = 0
+    extra = ''.join(f'{name}: {value}\r\n' for name, value in (headers or {}).items())
+
+    async def client():
+        nonlocal errors
+        reader = writer = None
+        for number in numbers:
+            if writer is None:
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            path = paths[number % len(paths)]
+            content = body(number).encode() if body else b''
+            if content:
+                content_headers = f'Content-Type: application/json\r\nContent-Length: {len(content)}\r\n'
+            else:
+                content_headers = ''
+            start = time.perf_counter()
+            writer.write(
+                f'{method} {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n{extra}{content_headers}\r\n'.encode() + content
+            )
+            head = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1').lower()
+            length = re.search(r'content-length:\s*(\d+)', head)
+            await reader.readexactly(int(length.group(1)) if length else 0)
+            latencies.append(time.perf_counter() - start)
+            if not head.startswith('http/1.1 2'):
+                errors += 1
+            if 'connection: close' in head:
+                writer.close()
+                writer = None
+        if writer is not None:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(connections)))
+    return requests / (time.perf_counter() - start), sorted(latencies), errors
+
+
+def percentile(latencies, fraction):
+    """Saralangan latency'lar -> millisekund (jadval uchun)"""
+    return f'{latencies[min(int(len(latencies) * fraction), len(latencies) - 1)] * 1000:.1f}'
+
+
+@suite('asgi')
+def bench_asgi(out, iterations):
+    """gunicorn WSGI (sync, gthread) vs ASGI (uvicorn): bitta worker, N ta parallel ulanish"""
+    levels = (1, 16, 64)
+    paths = [
+        '/api/books/', '/api/books/?page=2', '/api/books/1/', '/api/books/2/',
+        '/api/books/3/', '/api/books/statistics/?breakdown=language',
+    ]
+
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        env = server_environment(directory)
+        for name, overrides in SERVER_PROFILES.items():
+            with gunicorn_server({**env, **overrides}) as port:
+                # Worker yuklanishi va cache'lar isishi
+                asyncio.run(http_load(port, paths, 1, len(paths) * 3))
+                for connections in levels:
+                    throughput, latencies, errors = asyncio.run(http_load(port, paths, connections, iterations))
+                    if errors:
+                        raise RuntimeError(f'{name}: {errors} ta xato javob')
+                    rows.append((
+                        name, connections, f'{throughput:,.0f}',
+                        percentile(latencies, 0.5), percentile(latencies, 0.99),
+                    ))
+
+    out.write(
+        f"{iterations} so'rov / daraja; {len(paths)} endpoint aralash; "
+        f"CPU: {os.cpu_count()} (yuk generatori ham shu mashinada)"
+    )
+    write_table(out, ('server', 'conns', 'req/s', 'p50 ms', 'p99 ms'), rows)
+
+
+
+# ============================================
+# SQLite profillari
+# ============================================
+
+SQLITE_PROFILES = {
+    'basic': {'SQLITE_PROFILE': 'basic'},
+    'production': {'SQLITE_PROFILE': 'production'},
+}
+
+
+@suite('sqlite')
+def bench_sqlite(out, iterations):
+    """
+    SQLITE_PROFILE basic vs production: BookViewSet'ga parallel o'qish
+    (list/detail/statistics) va yozish (PATCH) - gunicorn gthread x8, bitta worker
+    """
+    readers, writers = 16, 4
+    writes = max(writers, iterations // 4)
+    read_paths = [
+        '/api/books/', '/api/books/?page=2', '/api/books/1/', '/api/books/2/',
+        '/api/books/3/', '/api/books/statistics/?breakdown=language',
+    ]
+    write_paths = [f'/api/books/{pk}/' for pk in range(1, 51)]
+    headers = {'Authorization': f'Token {BENCHMARK_TOKEN}'}
+
+    def price(number):
+        return f'{{"price": "{15000 + number % 1000}.00"}}'
+
+    async def mixed(port):
+        return await asyncio.gather(
+            http_load(port, read_paths, readers, iterations),
+            http_load(port, write_paths, writers, writes, 'PATCH', price, headers),
+        )
+
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for name, overrides in SQLITE_PROFILES.items():
+            # Har bir profil - alohida baza (journal_mode faylda saqlanib qoladi)
+            path = os.path.join(directory, name)
+            os.mkdir(path)
+            env = server_environment(path, **overrides)
+            with gunicorn_server({**env, 'SERVER_MODE': 'wsgi', 'GUNICORN_THREADS': '8'}) as port:
+                # Worker yuklanishi va cache'lar isishi
+                asyncio.run(http_load(port, read_paths, 1, len(read_paths) * 3))
+
+                throughput, latencies, errors = asyncio.run(http_load(port, read_paths, readers, iterations))
+                rows.append((
+                    name, 'read', f'{throughput:,.0f}', percentile(latencies, 0.99), '-', '-', errors,
+                ))
+
+                (read, read_latencies, read_errors), (write, write_latencies, write_errors) = asyncio.run(mixed(port))
+                rows.append((
+                    name, 'read+write', f'{read:,.0f}', percentile(read_latencies, 0.99),
+                    f'{write:,.0f}', percentile(write_latencies, 0.99), read_errors + write_errors,
+                ))
+
+    out.write(
+        f"o'qish: {iterations} so'rov, {readers} ulanish; yozish (PATCH): {writes} so'rov, "
+        f"{writers} ulanish; CPU: {os.cpu_count()} (yuk generatori ham shu mashinada)"
+    )
+    write_table(
+        out, ('profil', 'yuk', 'read req/s', 'read p99 ms', 'write req/s', 'write p99 ms', 'xatolar'), rows,
+    )
@@ -0,0 +1,210 @@
+"""
+Bulk create
+===========
+
+POST /api/books/bulk/ va import_books uchun paketli validation va yozish.
+
+BookCompleteValidationSerializer har bir kitob uchun 3 ta so'rov qiladi
+(ISBN, title+author, cover_image). Bu yerda butun paket uchun har bir
+tekshiruv bitta (bo'laklangan) IN so'rov bilan bajariladi, paket ichidagi
+takrorlanishlar ham ushlanadi, yozish esa bulk_create bilan.
+"""
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from rest_framework import serializers
+
+from . import cache as book_cache
+from . import statistics
+from .models import Book, BookChangeCounter
+from .serializers import BookBulkItemSerializer
+
+BATCH_SIZE = 500
+# POST /api/books/bulk/ uchun bitta so'rovdagi maksimal element soni
+MAX_ITEMS = 5000
+# SQLite parametrlar chegarasi uchun IN ro'yxatini bo'laklash
+IN_CHUNK_SIZE = 500
+
+ISBN_EXISTS = 'Bu ISBN allaqachon mavjud'
+TITLE_AUTHOR_EXISTS = 'Bu muallif tomonidan bunday nomli kitob allaqachon mavjud'
+COVER_EXISTS = 'Bu rasm boshqa kitob uchun allaqachon ishlatilgan'
+DUPLICATE_IN_BATCH = "{message} (paketdagi #{index} element bilan bir xil)"
+
+
+def _chunks(values, size=IN_CHUNK_SIZE):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _existing(field, values, *extra):
+    """{value: set(isbn_number)} - bazada mavjud qiymatlar"""
+    found = {}
+    for chunk in _chunks(values):
+        rows = Book.objects.filter(**{f'{field}__in': chunk}).values_list(field, *extra, 'isbn_number')
+        for row in rows:
+            found.setdefault(row[:-1] if extra else row[0], set()).add(row[-1])
+    return found
+
+
+def _existing_title_author(pairs):
+    """
+    {(title, author): set(isbn_number)} - juftliklar birga bo'laklanadi
+    (har bir juftlik 2 ta parametr), shuning uchun so'rov parametrlari
+    chegaralangan va titles x authors kesishmasi o'qilmaydi
+    """
+    found = {}
+    for chunk in _chunks(pairs, IN_CHUNK_SIZE // 2):
+        condition = Q()
+        for title, author in chunk:
+            condition |= Q(title=title, author=author)
+        rows = Book.objects.filter(condition).values_list('title', 'author', 'isbn_number')
+        for title, author, isbn in rows:
+            found.setdefault((title, author), set()).add(isbn)
+    return found
+
+
+def _conflicts(existing, key, isbn, upsert):
+    """Mavjud qiymat boshqa kitobga tegishlimi (upsert'da o'sha ISBN o'zi emas)"""
+    owners = existing.get(key)
+    if not owners:
+        return False
+    return not upsert or bool(owners - {isbn})
+
+
+def validate_batch(records, upsert=False):
+    """
+    records: dict'lar ro'yxati
+    Qaytaradi: (valid, errors)
+        valid  = [(index, validated_data), ...]
+        errors = {index: {...}}
+
+    upsert=True (import_books): mavjud ISBN xato emas - yangilanadi.
+    """
+    child = BookBulkItemSerializer()
+    validated, errors = [], {}
+
+    # 1. Field-level validation (bazasiz)
+    for index, record in enumerate(records):
+        try:
+            validated.append((index, child.run_validation(record)))
+        except serializers.ValidationError as exc:
+            errors[index] = exc.detail
+
+    # 2. Paket ichidagi takrorlanishlar
+    seen = {'isbn_number': {}, 'title_author': {}, 'cover_image': {}}
+    unique = []
+    for index, data in validated:
+        keys = {
+            'isbn_number': (data['isbn_number'], ISBN_EXISTS),
+            'title_author': ((data['title'], data['author']), TITLE_AUTHOR_EXISTS),
+            'cover_image': (data.get('cover_image'), COVER_EXISTS),
+        }
+        item_errors = []
+        for name, (value, message) in keys.items():
+            if not value:
+                continue
+            if value in seen[name]:
+                item_errors.append(DUPLICATE_IN_BATCH.format(message=message, index=seen[name][value]))
+        if item_errors:
+            errors[index] = {'non_field_errors': item_errors}
+            continue
+        for name, (value, _) in keys.items():
+            if value:
+                seen[name][value] = index
+        unique.append((index, data))
+
+    # 3. Bazadagi mavjud qiymatlar - har biri uchun bitta (bo'laklangan) IN so'rov
+    existing_isbn = _existing('isbn_number', seen['isbn_number'])
+    existing_pairs = _existing_title_author(set(seen['title_author']))
+    existing_covers = _existing('cover_image', seen['cover_image'])
+
+    valid = []
+    for index, data in unique:
+        isbn = data['isbn_number']
+        item_errors = {}
+        if not upsert and isbn in existing_isbn:
+            item_errors['isbn_number'] = [ISBN_EXISTS]
+        if _conflicts(existing_pairs, (data['title'], data['author']), isbn, upsert):
+            item_errors.setdefault('non_field_errors', []).append(TITLE_AUTHOR_EXISTS)
+        if data.get('cover_image') and _conflicts(existing_covers, data['cover_image'], isbn, upsert):
+            item_errors.setdefault('non_field_errors', []).append(COVER_EXISTS)
+        if item_errors:
+            errors[index] = item_errors
+        else:
+            valid.append((index, data))
+
+    return valid, errors
+
+
+CONFLICT = "Parallel so'rov bilan to'qnashuv (ISBN band), qayta yuboring"
+
+
+def _insert(batch):
+    """Bitta tranzaksiya (ichki bo'lsa savepoint): versiyalar, bulk_create, statistika"""
+    with transaction.atomic():
+        last_version = BookChangeCounter.next_version(count=len(batch))
+        first_version = last_version - len(batch) + 1
+        books = [
+            Book(**data, change_version=first_version + offset)
+            for offset, (_, data) in enumerate(batch)
+        ]
+        Book.objects.bulk_create(books)
+        statistics.record_created(books)
+    return books
+
+
+def create_books(items, batch_size=BATCH_SIZE):
+    """
+    items: validate_batch() dan (index, validated_data)
+    Har bir batch alohida tranzaksiyada. Parallel so'rov bilan to'qnashuv
+    (IntegrityError) bo'lsa o'sha batch elementma-element qayta yoziladi -
+    faqat haqiqatan to'qnashgan elementlar xato sifatida qaytadi.
+    Qaytaradi: (created: [(index, book)], errors: {index: {...}})
+    """
+    created, errors = [], {}
+    for start in range(0, len(items), batch_size):
+        batch = items[start:start + batch_size]
+        try:
+            books = _insert(batch)
+        except IntegrityError:
+            for index, data in batch:
+                try:
+                    created.extend((index, book) for book in _insert([(index, data)]))
+                except IntegrityError:
+                    errors[index] = {'non_field_errors': [CONFLICT]}
+            continue
+        created.extend((index, book) for (index, _), book in zip(batch, books))
+    return created, errors
+
+
+def upsert_books(items, batch_size=BATCH_SIZE):
+    """
+    ISBN bo'yicha upsert (import_books): bulk_create(update_conflicts=True)
+    Statistika keyin rebuild qilinadi (yangilangan qatorlarning eski
+    bucket'lari noma'lum).
+    """
+    update_fields = [
+        field.name for field in Book._meta.concrete_fields
+        if not field.primary_key and field.name != 'isbn_number'
+    ]
+    books = []
+    for start in range(0, len(items), batch_size):
+        batch = items[start:start + batch_size]
+        with transaction.atomic():
+            last_version = BookChangeCounter.next_version(count=len(batch))
+            first_version = last_version - len(batch) + 1
+            chunk = [
+                Book(**data, change_version=first_version + offset)
+                for offset, (_, data) in enumerate(batch)
+            ]
+            Book.objects.bulk_create(
+                chunk,
+                update_conflicts=True,
+                unique_fields=['isbn_number'],
+                update_fields=update_fields,
+            )
+        books.extend(chunk)
+    for chunk in _chunks(book.isbn_number for book in books):
+        book_cache.invalidate_many(Book.objects.filter(isbn_number__in=chunk).values_list('pk', flat=True))
+    return books
@@ -0,0 +1,205 @@
+"""
+Book representation cache
+=========================
+
+GET /api/books/{id}/ va /api/old/books/{id}/ uchun read-through cache.
+Kalit: kitob id + serializer klassi.
+
+Har bir kitobning "avlodi" (generation) bor: Book saqlanganda/o'chirilganda
+signals orqali yangilanadi (darhol va commit'dan keyin). Yozuv o'zi
+yuklanishidan oldin o'qilgan avlod bilan saqlanadi va faqat joriy avlodga
+teng bo'lsa beriladi - parallel save() dan oldin qatorni o'qib, invalidate'dan
+keyin cache'ga yozgan so'rov eski javobni (va uning ETag'ini) qotirib
+qo'ymaydi. Yozuv va avlod bitta cache.get_many() bilan o'qiladi; avlod
+yo'q bo'lsa (muddati o'tgan, cull) - miss. Detail ETag shu avloddan
+(books/conditional.py): get_entry() ma'lumot bilan birga uning avlodini
+qaytaradi, current_generation() esa If-None-Match'ni yuklashdan oldin
+tekshirishga imkon beradi.
+
+Bir vaqtdagi miss'lar birlashtiriladi (coalescing): jarayon ichida lock,
+jarayonlar orasida cache.add() lock - bazaga faqat bitta so'rov boradi.
+aget_representation() (async view'lar) faqat cache.add() lock'ini ishlatadi.
+"""
+
+import asyncio
+import secrets
+import threading
+import time
+import zlib
+
+from django.core.cache import cache
+from django.db import transaction
+from django.http import Http404
+
+from library_project.metrics import Counters, ratio
+
+CACHE_TIMEOUT = 60 * 60
+LOCK_TIMEOUT = 10
+LOCK_WAIT = 2.0
+LOCK_POLL_INTERVAL = 0.02
+
+counters = Counters('books:repr', ('hits', 'misses', 'coalesced'))
+
+_locks = [threading.Lock() for _ in range(64)]
+
+
+def cache_key(pk, serializer_name):
+    return f'books:repr:{serializer_name}:{pk}'
+
+
+def generation_key(pk):
+    return f'books:repr:gen:{pk}'
+
+
+def normalize_pk(pk):
+    try:
+        return int(pk)
+    except (TypeError, ValueError):
+        raise Http404
+
+
+def _keys(pk, serializer_class):
+    pk = normalize_pk(pk)
+    return cache_key(pk, serializer_class.__name__), generation_key(pk)
+
+
+def _entry(values, key, gen_key):
+    """(data yoki None, joriy avlod)"""
+    generation = values.get(gen_key)
+    entry = values.get(key)
+    if entry is not None and generation is not None and entry[0] == generation:
+        return entry[1], generation
+    return None, generation
+
+
+def _new_generation(gen_key):
+    """Avlod yo'q bo'lsa yaratiladi (add - parallel invalidate'ni bosib ketmaydi)"""
+    token = secrets.token_hex(8)
+    if cache.add(gen_key, token, timeout=CACHE_TIMEOUT):
+        return token
+    return cache.get(gen_key) or token
+
+
+async def _anew_generation(gen_key):
+    token = secrets.token_hex(8)
+    if await cache.aadd(gen_key, token, timeout=CACHE_TIMEOUT):
+        return token
+    return await cache.aget(gen_key) or token
+
+
+def current_generation(pk):
+    """Kitobning joriy avlodi (yo'q bo'lsa None) - ETag'ni yuklashdan oldin tekshirish uchun"""
+    return cache.get(generation_key(normalize_pk(pk)))
+
+
+async def acurrent_generation(pk):
+    return await cache.aget(generation_key(normalize_pk(pk)))
+
+
+def get_representation(pk, serializer_class, loader):
+    """
+    Cache'dan serializer.data (dict); yo'q bo'lsa loader() bilan olib saqlaydi.
+    loader() mavjud bo'lmagan kitob uchun Http404 ko'taradi.
+    """
+    return get_entry(pk, serializer_class, loader)[0]
+
+
+def get_entry(pk, serializer_class, loader):
+    """(data, avlod): data shu avlodga tegishli (ETag uchun)"""
+    key, gen_key = _keys(pk, serializer_class)
+    data, generation = _entry(cache.get_many([key, gen_key]), key, gen_key)
+    if data is not None:
+        counters.incr('hits')
+        return data, generation
+
+    with _locks[zlib.crc32(key.encode()) % len(_locks)]:
+        data, generation = _entry(cache.get_many([key, gen_key]), key, gen_key)
+        if data is not None:
+            counters.incr('coalesced')
+            return data, generation
+
+        lock_key = f'{key}:lock'
+        if cache.add(lock_key, 1, timeout=LOCK_TIMEOUT):
+            try:
+                counters.incr('misses')
+                # Avlod qatordan oldin o'qiladi: shu orada save() bo'lsa yozuv yaroqsiz
+                generation = generation or _new_generation(gen_key)
+                data = dict(loader())
+                cache.set(key, (generation, data), timeout=CACHE_TIMEOUT)
+                return data, generation
+            finally:
+                cache.delete(lock_key)
+
+        # Boshqa jarayon yuklamoqda - natijani kutamiz
+        deadline = time.monotonic() + LOCK_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(LOCK_POLL_INTERVAL)
+            data, current = _entry(cache.get_many([key, gen_key]), key, gen_key)
+            if data is not None:
+                counters.incr('coalesced')
+                return data, current
+
+        counters.incr('misses')
+        generation = generation or _new_generation(gen_key)
+        return dict(loader()), generation
+
+
+async def aget_representation(pk, serializer_class, aloader):
+    """get_representation() ning async varianti: aloader() - coroutine"""
+    return (await aget_entry(pk, serializer_class, aloader))[0]
+
+
+async def aget_entry(pk, serializer_class, aloader):
+    """get_entry() ning async varianti"""
+    key, gen_key = _keys(pk, serializer_class)
+    data, generation = _entry(await cache.aget_many([key, gen_key]), key, gen_key)
+    if data is not None:
+        await counters.aincr('hits')
+        return data, generation
+
+    lock_key = f'{key}:lock'
+    if await cache.aadd(lock_key, 1, timeout=LOCK_TIMEOUT):
+        try:
+            await counters.aincr('misses')
+            generation = generation or await _anew_generation(gen_key)
+            data = dict(await aloader())
+            await cache.aset(key, (generation, data), timeout=CACHE_TIMEOUT)
+            return data, generation
+        finally:
+            await cache.adelete(lock_key)
+
+    deadline = time.monotonic() + LOCK_WAIT
+    while time.monotonic() < deadline:
+        await asyncio.sleep(LOCK_POLL_INTERVAL)
+        data, current = _entry(await cache.aget_many([key, gen_key]), key, gen_key)
+        if data is not None:
+            await counters.aincr('coalesced')
+            return data, current
+
+    await counters.aincr('misses')
+    generation = generation or await _anew_generation(gen_key)
+    return dict(await aloader()), generation
+
+
+def invalidate(pk):
+    invalidate_many([pk])
+
+
+def invalidate_many(pks):
+    """Avlodni yangilash - barcha serializer'lar uchun yozuvlar yaroqsiz"""
+    gen_keys = [generation_key(pk) for pk in pks]
+    if not gen_keys:
+        return
+
+    def bump():
+        cache.set_many({key: secrets.token_hex(8) for key in gen_keys}, timeout=CACHE_TIMEOUT)
+
+    bump()
+    # Tranzaksiya tugashidan oldin eski qatorni o'qib saqlagan so'rovlar uchun
+    transaction.on_commit(bump)
+
+
+def stats():
+    data = counters.snapshot()
+    data['hit_ratio'] = ratio(data['hits'] + data['coalesced'], sum(data.values()))
+    return data
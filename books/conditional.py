@@ -0,0 +1,111 @@
+"""
+Conditional GET (ETag / Last-Modified)
+======================================
+
+Polling qiluvchi klientlar uchun: If-None-Match / If-Modified-Since mos
+kelsa 304 qaytariladi va serializer ishga tushmaydi.
+
+- Detail: ETag = kitob id + representation cache avlodi (books/cache.py) +
+  URL. If-None-Match avlod bo'yicha representation yuklanishidan oldin
+  tekshiriladi; Last-Modified - cache'dagi updated_at
+- Ro'yxat: ETag = BookChangeCounter versiyasi + URL (body hash qilinmaydi)
+- Ikkalasida ham kelishilgan media type (JSON / MessagePack ...) ETag'da
+
+acollection_state / acollection_validators - async view'lar uchun (async ORM).
+"""
+
+import hashlib
+
+from django.db.models import Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date
+
+from .models import Book, BookChangeCounter, BookTombstone
+
+
+def _etag(*parts):
+    digest = hashlib.sha1('|'.join(str(part) for part in parts).encode()).hexdigest()[:24]
+    return f'W/"{digest}"'
+
+
+def collection_state():
+    """
+    Ro'yxat versiyasi O(1):
+    - BookChangeCounter: har save()/delete() da o'sadi (bitta qator)
+    - Last-Modified: MAX(updated_at) va oxirgi tombstone vaqti (indekslar orqali)
+    """
+    version = BookChangeCounter.current()
+    last_updated = Book.objects.aggregate(last=Max('updated_at'))['last']
+    last_deleted = _last_deleted().first()
+    return version, _last_modified(last_updated, last_deleted)
+
+
+async def acollection_state():
+    version = await BookChangeCounter.acurrent()
+    last_updated = (await Book.objects.aaggregate(last=Max('updated_at')))['last']
+    last_deleted = await _last_deleted().afirst()
+    return version, _last_modified(last_updated, last_deleted)
+
+
+def _last_deleted():
+    return BookTombstone.objects.order_by('-version').values_list('deleted_at', flat=True)
+
+
+def _last_modified(last_updated, last_deleted):
+    return max(filter(None, [last_updated, last_deleted]), default=None)
+
+
+def _media_type(request):
+    # DRF initial() da kelishilgan renderer (Accept / ?format=)
+    return getattr(request, 'accepted_media_type', None) or ''
+
+
+def collection_validators(request):
+    version, last_modified = collection_state()
+    return _etag('books', version, request.get_full_path(), _media_type(request)), last_modified
+
+
+async def acollection_validators(request):
+    version, last_modified = await acollection_state()
+    return _etag('books', version, request.get_full_path(), _media_type(request)), last_modified
+
+
+def detail_etag(request, pk, generation):
+    return _etag('book', pk, generation, request.get_full_path(), _media_type(request))
+
+
+def representation_validators(request, pk, generation, data):
+    """Detail javob uchun: get_entry() dan (data, avlod)"""
+    last_modified = parse_datetime(data['updated_at']) if data.get('updated_at') else None
+    return detail_etag(request, pk, generation), last_modified
+
+
+def detail_not_modified(request, pk, generation):
+    """
+    If-None-Match joriy avlod ETag'iga mos kelsa 304 - representation
+    yuklanmaydi. Avlod noma'lum bo'lsa None.
+    """
+    if generation is None:
+        return None
+    return not_modified(request, detail_etag(request, pk, generation), None)
+
+
+def not_modified(request, etag, last_modified):
+    """Mos kelsa 304 javob, aks holda None"""
+    response = get_conditional_response(
+        request._request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified else None,
+    )
+    if response is not None:
+        return with_validators(response, etag, last_modified)
+    return None
+
+
+def with_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    patch_vary_headers(response, ('Accept',))
+    return response
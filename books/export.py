@@ -0,0 +1,121 @@
+"""
+Katalog eksporti (NDJSON / CSV)
+===============================
+
+GET /api/books/export/?format=ndjson|csv va `manage.py export_books` uchun.
+
+Qatorlar `.iterator(chunk_size=...)` orqali o'qiladi va bo'laklab
+uzatiladi - xotirada bir vaqtda faqat bitta chunk turadi, shuning uchun
+million qatorli eksport ham worker xotirasini oshirmaydi.
+HTTP javobini CompressionMiddleware siqadi; gzip_stream() export_books
+buyrug'i uchun (fayl.gz).
+"""
+
+import csv
+import io
+import zlib
+
+from rest_framework.renderers import BaseRenderer
+
+from .streaming import dumps, iter_representations
+
+CHUNK_SIZE = 2000
+GZIP_LEVEL = 6
+
+
+# ============================================
+# QATOR GENERATORLARI
+# ============================================
+
+def _rows(queryset, serializer_class, chunk_size):
+    return iter_representations(queryset.order_by('pk'), serializer_class, chunk_size)
+
+
+def iter_ndjson(queryset, serializer_class, chunk_size=CHUNK_SIZE):
+    """Har bir qator - bitta JSON obyekt + '\\n'"""
+    buffer = []
+    for row in _rows(queryset, serializer_class, chunk_size):
+        buffer.append(dumps(row))
+        if len(buffer) >= chunk_size:
+            yield '\n'.join(buffer) + '\n'
+            buffer = []
+    if buffer:
+        yield '\n'.join(buffer) + '\n'
+
+
+def iter_csv(queryset, serializer_class, chunk_size=CHUNK_SIZE):
+    """Sarlavha + qatorlar (ustunlar serializer maydonlari tartibida)"""
+    serializer = serializer_class()
+    columns = [name for name, field in serializer.fields.items() if not field.write_only]
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(columns)
+
+    count = 0
+    for row in _rows(queryset, serializer_class, chunk_size):
+        writer.writerow(['' if row[name] is None else row[name] for name in columns])
+        count += 1
+        if count % chunk_size == 0:
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate()
+    yield output.getvalue()
+
+
+def gzip_stream(chunks, level=GZIP_LEVEL):
+    """str/bytes bo'laklarini oqim bo'yicha gzip'lash"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode() if isinstance(chunk, str) else chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def encode_stream(chunks):
+    for chunk in chunks:
+        yield chunk.encode()
+
+
+# ============================================
+# RENDERERS
+# ============================================
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    ?format=ndjson - eksport uchun
+    Oddiy (streaming bo'lmagan) javoblar, masalan xato xabarlari uchun ham ishlaydi
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+    iterator = staticmethod(iter_ndjson)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        rows = data if isinstance(data, list) else [data]
+        return ''.join(dumps(row) + '\n' for row in rows).encode()
+
+
+class CSVRenderer(BaseRenderer):
+    """?format=csv - eksport uchun"""
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+    iterator = staticmethod(iter_csv)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        rows = data if isinstance(data, list) else [data]
+        columns = list(rows[0]) if rows else []
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow([row.get(name, '') for name in columns])
+        return output.getvalue().encode()
+
+
+EXPORT_RENDERERS = [NDJSONRenderer, CSVRenderer]
@@ -0,0 +1,37 @@
+"""
+Benchmark suite'larini ishga tushirish (books/benchmarks.py)
+Vaqtinchalik baza va cache'da - sozlangan bazaga yozilmaydi.
+
+python manage.py benchmark --list
+python manage.py benchmark cache --iterations 5000
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from books.benchmarks import SUITES, throwaway_databases
+
+
+class Command(BaseCommand):
+    help = "Ishlash tezligi benchmark'larini ishga tushiradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('suites', nargs='*', help="Suite nomlari (bo'sh bo'lsa - hammasi)")
+        parser.add_argument('--iterations', type=int, default=2000)
+        parser.add_argument('--list', action='store_true', help="Mavjud suite'lar ro'yxati")
+
+    def handle(self, *args, **options):
+        if options['list']:
+            for name, func in SUITES.items():
+                self.stdout.write(f"{name:<16} {(func.__doc__ or '').strip().splitlines()[0]}")
+            return
+
+        names = options['suites'] or list(SUITES)
+        unknown = [name for name in names if name not in SUITES]
+        if unknown:
+            raise CommandError(f"Noma'lum suite: {', '.join(unknown)}. Mavjud: {', '.join(SUITES)}")
+
+        with throwaway_databases():
+            for name in names:
+                self.stdout.write(self.style.MIGRATE_HEADING(f'== {name} =='))
+                SUITES[name](self.stdout, options['iterations'])
+                self.stdout.write('')
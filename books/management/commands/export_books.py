@@ -0,0 +1,64 @@
+"""
+Katalogni NDJSON / CSV ga eksport qilish (oqim bo'yicha)
+
+python manage.py export_books --format csv --output books.csv
+python manage.py export_books --output books.ndjson.gz    # .gz -> gzip
+python manage.py export_books --published > published.ndjson
+"""
+
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+
+from books import export
+from books.models import Book
+from books.serializers import BookSerializer
+
+ITERATORS = {
+    'ndjson': export.iter_ndjson,
+    'csv': export.iter_csv,
+}
+
+
+class Command(BaseCommand):
+    help = "Kitoblar katalogini NDJSON yoki CSV formatida eksport qiladi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=list(ITERATORS), default='ndjson')
+        parser.add_argument('--output', default='-', help="Fayl yo'li ('-' = stdout)")
+        parser.add_argument('--gzip', action='store_true', help="Gzip (fayl nomi .gz bo'lsa avtomatik)")
+        parser.add_argument('--published', action='store_true', help="Faqat published kitoblar")
+        parser.add_argument('--chunk-size', type=int, default=export.CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        queryset = Book.objects.all()
+        if options['published']:
+            queryset = queryset.filter(published=True)
+
+        total = queryset.count()
+        chunks = ITERATORS[options['format']](queryset, BookSerializer, options['chunk_size'])
+        if options['gzip'] or options['output'].endswith('.gz'):
+            chunks = export.gzip_stream(chunks)
+        else:
+            chunks = export.encode_stream(chunks)
+
+        start = time.perf_counter()
+        written = 0
+        if options['output'] == '-':
+            target = sys.stdout.buffer
+        else:
+            target = open(options['output'], 'wb')
+        try:
+            for chunk in chunks:
+                target.write(chunk)
+                written += len(chunk)
+        finally:
+            if target is not sys.stdout.buffer:
+                target.close()
+            else:
+                target.flush()
+
+        elapsed = time.perf_counter() - start
+        rate = total / elapsed if elapsed else 0
+        self.stderr.write(f"{total:,} ta kitob, {written:,} bayt, {elapsed:.2f} s ({rate:,.0f} qator/s)")
@@ -0,0 +1,231 @@
+"""
+NDJSON / CSV feed'dan kitoblarni import qilish (oqim bo'yicha, upsert)
+
+python manage.py import_books feed.ndjson
+python manage.py import_books feed.csv --batch-size 2000
+python manage.py import_books feed.csv.gz --restart    # checkpoint'ni e'tiborsiz qoldirish
+
+- Fayl qatorma-qator o'qiladi (to'liq xotiraga yuklanmaydi)
+- Validation: BookCompleteValidationSerializer qoidalari, uniqueness esa
+  batch uchun IN so'rovlar bilan (books/bulk.py)
+- isbn_number bo'yicha upsert: bulk_create(update_conflicts=True)
+- Har bir batch'dan keyin bayt offset <fayl>.checkpoint ga yoziladi -
+  to'xtatilgan import shu joydan davom etadi
+- Rad etilgan qatorlar <fayl>.rejects.ndjson ga yoziladi; uning uzunligi
+  ham checkpoint'da - davom ettirilganda fayl shu joygacha qisqartiriladi
+  (checkpoint'dan keyin yozilganlar takrorlanmaydi)
+- Statistika oxirida qayta hisoblanadi; jarayon o'ldirilgan bo'lsa -
+  davom ettirishning boshida
+"""
+
+import csv
+import gzip
+import json
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from books import bulk, statistics
+from books.streaming import dumps
+
+
+def _open(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rb')
+    return open(path, 'rb')
+
+
+def _format(path, value):
+    if value:
+        return value
+    name = path[:-3] if path.endswith('.gz') else path
+    return 'csv' if name.endswith('.csv') else 'ndjson'
+
+
+class OffsetLines:
+    """Binary fayl qatorlari (str) + har bir qator oxiridagi bayt offset"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.offset = stream.tell()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = self.stream.readline()
+        if not line:
+            raise StopIteration
+        self.offset += len(line)
+        return line.decode('utf-8-sig')
+
+
+def read_ndjson(stream, offset):
+    """(record | None, xato, qator oxiri offset) ketma-ketligi"""
+    stream.seek(offset)
+    lines = OffsetLines(stream)
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield None, f"JSON xato: {exc}", lines.offset
+            continue
+        if not isinstance(record, dict):
+            yield None, "Qator JSON obyekt bo'lishi kerak", lines.offset
+            continue
+        yield record, None, lines.offset
+
+
+def read_csv(stream, offset):
+    """
+    CSV: sarlavha har doim fayl boshidan o'qiladi, keyin checkpoint'ga o'tiladi.
+    csv.reader qatorlarni talab bo'yicha oladi, shuning uchun lines.offset
+    har bir yozuv (ko'p qatorli qiymatlar bilan ham) oxiriga to'g'ri keladi.
+    """
+    stream.seek(0)
+    lines = OffsetLines(stream)
+    header = next(csv.reader(lines), None)
+    if header is None:
+        return
+    if offset > lines.offset:
+        stream.seek(offset)
+        lines.offset = offset
+
+    for row in csv.reader(lines):
+        if not any(row):
+            continue
+        if len(row) != len(header):
+            yield None, f"Ustunlar soni {len(row)}, sarlavhada {len(header)}", lines.offset
+            continue
+        # Bo'sh katak = qiymat yo'q (default / null)
+        yield {name: value for name, value in zip(header, row) if value != ''}, None, lines.offset
+
+
+class Command(BaseCommand):
+    help = "NDJSON yoki CSV fayldan kitoblarni oqim bo'yicha import qiladi (ISBN bo'yicha upsert)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('file')
+        parser.add_argument('--format', choices=['ndjson', 'csv'], help="Default: fayl kengaytmasidan")
+        parser.add_argument('--batch-size', type=int, default=bulk.BATCH_SIZE)
+        parser.add_argument('--restart', action='store_true', help="Checkpoint'ni e'tiborsiz qoldirib boshidan")
+        parser.add_argument('--rejects', help="Rad etilganlar fayli (default: <file>.rejects.ndjson)")
+
+    def handle(self, *args, **options):
+        path = options['file']
+        if not os.path.exists(path):
+            raise CommandError(f"Fayl topilmadi: {path}")
+
+        self.checkpoint_path = f'{path}.checkpoint'
+        reader = read_csv if _format(path, options['format']) == 'csv' else read_ndjson
+        state = self.load_checkpoint(path, options['restart'])
+        if state['offset']:
+            self.stdout.write(f"Checkpoint: {state['offset']:,} baytdan davom etiladi")
+
+        rejects_path = options['rejects'] or f'{path}.rejects.ndjson'
+        rejects = open(rejects_path, 'a' if state['offset'] else 'w', encoding='utf-8')
+        if state['offset']:
+            size = os.path.getsize(rejects_path)
+            rejects.truncate(min(state.get('rejects_offset', size), size))
+
+        # Oldingi ishga tushirish yozgan, lekin statistikani yangilamay to'xtagan
+        written = bool(state.get('written'))
+        if written:
+            statistics.rebuild()
+
+        self.start = time.perf_counter()
+        self.processed_now = 0
+        batch = []
+        try:
+            with _open(path) as stream:
+                for item in reader(stream, state['offset']):
+                    batch.append(item)
+                    if len(batch) >= options['batch_size']:
+                        written |= self.flush(batch, rejects, state)
+                        batch = []
+                if batch:
+                    written |= self.flush(batch, rejects, state)
+        finally:
+            rejects.close()
+            if written:
+                # Upsert'da eski bucket'lar noma'lum - statistika to'liq qayta hisoblanadi
+                statistics.rebuild()
+
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+        self.report(state, final=True)
+        self.stdout.write(f"Rad etilganlar: {rejects_path}")
+
+    # ---------- batch ----------
+
+    def flush(self, batch, rejects, state):
+        """
+        batch: [(record, parse xato, offset)]
+        Rad etilganlar ham checkpoint bilan birga yoziladi - davom ettirilganda takrorlanmaydi
+        """
+        parsed = [position for position, (_, error, _) in enumerate(batch) if error is None]
+        valid, errors = bulk.validate_batch([batch[position][0] for position in parsed], upsert=True)
+        if valid:
+            bulk.upsert_books(valid)
+
+        failed = {parsed[index]: errors[index] for index in errors}
+        failed.update({
+            position: {'non_field_errors': [error]}
+            for position, (_, error, _) in enumerate(batch) if error is not None
+        })
+        for position in sorted(failed):
+            record, _, offset = batch[position]
+            self.reject(rejects, state, offset, record, failed[position])
+
+        state['imported'] += len(valid)
+        state['offset'] = batch[-1][2]
+        state['written'] = state.get('written', False) or bool(valid)
+        self.processed_now += len(batch)
+        rejects.flush()
+        state['rejects_offset'] = rejects.tell()
+        self.save_checkpoint(state)
+        self.report(state)
+        return bool(valid)
+
+    def reject(self, rejects, state, offset, record, errors):
+        state['rejected'] += 1
+        rejects.write(dumps({'offset': offset, 'record': record, 'errors': errors}) + '\n')
+
+    # ---------- checkpoint ----------
+
+    def load_checkpoint(self, path, restart):
+        stat = os.stat(path)
+        fresh = {
+            'offset': 0, 'imported': 0, 'rejected': 0, 'rejects_offset': 0, 'written': False,
+            'size': stat.st_size, 'mtime': stat.st_mtime,
+        }
+        if restart or not os.path.exists(self.checkpoint_path):
+            return fresh
+        with open(self.checkpoint_path, encoding='utf-8') as checkpoint:
+            state = json.load(checkpoint)
+        if (state.get('size'), state.get('mtime')) != (stat.st_size, stat.st_mtime):
+            raise CommandError(
+                "Fayl checkpoint'dan keyin o'zgargan. Boshidan boshlash uchun --restart"
+            )
+        return state
+
+    def save_checkpoint(self, state):
+        temporary = f'{self.checkpoint_path}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as checkpoint:
+            json.dump(state, checkpoint)
+        os.replace(temporary, self.checkpoint_path)
+
+    def report(self, state, final=False):
+        elapsed = time.perf_counter() - self.start
+        rate = self.processed_now / elapsed if elapsed else 0
+        message = (
+            f"{state['imported']:,} ta import qilindi, {state['rejected']:,} ta rad etildi, "
+            f"{rate:,.0f} qator/s"
+        )
+        if final:
+            self.stdout.write(self.style.SUCCESS(message + f" ({elapsed:.1f} s)"))
+        else:
+            self.stdout.write(message)
@@ -0,0 +1,34 @@
+"""
+BookStatistics jadvalini qayta hisoblash va tekshirish
+
+python manage.py rebuild_book_statistics            # qayta hisoblash + tekshirish
+python manage.py rebuild_book_statistics --verify   # faqat tekshirish
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from books import statistics
+
+
+class Command(BaseCommand):
+    help = "BookStatistics jadvalini Book ma'lumotlaridan qayta hisoblaydi va tekshiradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help="Qayta hisoblamasdan faqat jadvalni haqiqiy ma'lumot bilan solishtirish",
+        )
+
+    def handle(self, *args, **options):
+        if not options['verify']:
+            buckets = statistics.rebuild()
+            self.stdout.write(f"{buckets} ta bucket qayta hisoblandi")
+
+        mismatches = statistics.verify()
+        for key, expected, actual in mismatches:
+            self.stderr.write(f"{key}: kutilgan={expected} jadvalda={actual}")
+
+        if mismatches:
+            raise CommandError(f"{len(mismatches)} ta bucket mos kelmadi")
+        self.stdout.write(self.style.SUCCESS("Statistika haqiqiy ma'lumotga mos"))
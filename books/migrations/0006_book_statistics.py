@@ -0,0 +1,75 @@
+# Generated by Django 5.2.8 on 2026-10-18 03:09
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Sum
+from django.db.models.functions import ExtractYear
+
+
+def populate_statistics(apps, schema_editor):
+    Book = apps.get_model("books", "Book")
+    BookStatistics = apps.get_model("books", "BookStatistics")
+    rows = (
+        Book.objects.annotate(year=ExtractYear("published_date"))
+        .values("language", "year", "published")
+        .annotate(
+            book_count=Count("id"),
+            price_sum=Sum("price"),
+            price_min=Min("price"),
+            price_max=Max("price"),
+        )
+        .order_by()
+    )
+    BookStatistics.objects.bulk_create([BookStatistics(**row) for row in rows])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0005_book_published"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BookStatistics",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("language", models.CharField(max_length=30)),
+                ("year", models.IntegerField()),
+                ("published", models.BooleanField()),
+                ("book_count", models.PositiveIntegerField(default=0)),
+                (
+                    "price_sum",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=20),
+                ),
+                (
+                    "price_min",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=10, null=True
+                    ),
+                ),
+                (
+                    "price_max",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=10, null=True
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("language", "year", "published"),
+                        name="unique_book_statistics_bucket",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(populate_statistics, migrations.RunPython.noop),
+    ]
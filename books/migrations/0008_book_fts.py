@@ -0,0 +1,65 @@
+from django.db import migrations
+
+# books/search.py dagi sxemaning shu migratsiya vaqtidagi nusxasi: modul
+# keyinchalik o'zgarsa ham bu migratsiya xuddi shu DDL'ni bajaradi
+FTS_TABLE = "books_book_fts"
+
+TRIGGER_NAMES = [f"{FTS_TABLE}_ai", f"{FTS_TABLE}_ad", f"{FTS_TABLE}_au"]
+
+FTS_SCHEMA = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, subtitle, author,
+        content='books_book', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON books_book BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, subtitle, author)
+        VALUES (new.id, new.title, new.subtitle, new.author);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON books_book BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, subtitle, author)
+        VALUES ('delete', old.id, old.title, old.subtitle, old.author);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, subtitle, author ON books_book BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, subtitle, author)
+        VALUES ('delete', old.id, old.title, old.subtitle, old.author);
+        INSERT INTO {FTS_TABLE}(rowid, title, subtitle, author)
+        VALUES (new.id, new.title, new.subtitle, new.author);
+    END
+    """,
+]
+
+
+def create_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for statement in FTS_SCHEMA:
+        schema_editor.execute(statement)
+    # Mavjud kitoblarni indeksga yuklash
+    schema_editor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for name in TRIGGER_NAMES:
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {name}")
+    schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0007_book_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.8 on 2026-10-18 03:15
+
+from django.db import migrations, models
+from django.db.models import F, Max
+
+
+def number_existing_books(apps, schema_editor):
+    # Bitta UPDATE: mavjud kitoblar versiyasi = id (yagona va o'suvchi),
+    # hisoblagich eng katta id'dan davom etadi
+    Book = apps.get_model("books", "Book")
+    BookChangeCounter = apps.get_model("books", "BookChangeCounter")
+    Book.objects.update(change_version=F("id"))
+    version = Book.objects.aggregate(version=Max("id"))["version"] or 0
+    BookChangeCounter.objects.create(pk=1, value=version)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0009_book_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BookChangeCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("value", models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="BookTombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("book_id", models.BigIntegerField()),
+                ("isbn_number", models.CharField(max_length=13)),
+                ("version", models.BigIntegerField(unique=True)),
+                ("deleted_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="book",
+            name="change_version",
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="book",
+            index=models.Index(
+                fields=["change_version"], name="books_change_version_idx"
+            ),
+        ),
+        migrations.RunPython(number_existing_books, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import models, router, transaction
+from django.db.models import F
 
 # Create your models here.
 class Book(models.Model):
@@ -12,6 +13,115 @@ class Book(models.Model):
     language = models.CharField(max_length=30)
     price = models.DecimalField(max_digits=10, decimal_places=2)
     published = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Delta sync: har save() da BookChangeCounter'dan yangi versiya
+    change_version = models.BigIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            # validate(): Book.objects.filter(title=..., author=...)
+            models.Index(fields=['title', 'author'], name='books_title_author_idx'),
+            # Keyset pagination: (title, id) va (published_date, id)
+            models.Index(fields=['title', 'id'], name='books_title_id_idx'),
+            models.Index(fields=['published_date', 'id'], name='books_pubdate_id_idx'),
+            # Last-Modified / ro'yxat versiyasi: MAX(updated_at)
+            models.Index(fields=['updated_at'], name='books_updated_at_idx'),
+            # /api/books/changes/?since=N
+            models.Index(fields=['change_version'], name='books_change_version_idx'),
+            # Admin list_filter va statistika bucket'lari
+            models.Index(fields=['language'], name='books_language_idx'),
+            # BookCompleteValidationSerializer.validate(): cover_image tekshiruvi
+            models.Index(fields=['cover_image'], name='books_cover_image_idx'),
+            # BookViewSet.published: faqat published=True qatorlar (partial index)
+            models.Index(
+                fields=['published_date', 'id'],
+                condition=models.Q(published=True),
+                name='books_published_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} by {self.author}"
+
+    def save(self, *args, **kwargs):
+        using = kwargs.get('using') or router.db_for_write(self.__class__, instance=self)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'change_version'}
+
+        # Versiya va qator bitta tranzaksiyada yoziladi
+        with transaction.atomic(using=using):
+            self.change_version = BookChangeCounter.next_version(using=using)
+            super().save(*args, **kwargs)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Statistika uchun bazadagi holatni eslab qolamiz (signals.py)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+
+class BookStatistics(models.Model):
+    """
+    Kitoblar statistikasi: (language, year, published) bo'yicha bucket
+
+    Book saqlanganda/o'chirilganda signals orqali inkremental yangilanadi.
+    Qayta hisoblash: python manage.py rebuild_book_statistics
+    """
+    language = models.CharField(max_length=30)
+    year = models.IntegerField()
+    published = models.BooleanField()
+    book_count = models.PositiveIntegerField(default=0)
+    price_sum = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+    price_min = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
+    price_max = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['language', 'year', 'published'],
+                name='unique_book_statistics_bucket',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.language} / {self.year} / published={self.published}: {self.book_count}"
+
+
+class BookChangeCounter(models.Model):
+    """
+    Delta sync uchun monoton o'suvchi global versiya (bitta qator, pk=1)
+    """
+    value = models.BigIntegerField(default=0)
+
+    @classmethod
+    def next_version(cls, count=1, using='default'):
+        """count ta versiya band qiladi va oxirgisini qaytaradi"""
+        with transaction.atomic(using=using):
+            manager = cls.objects.db_manager(using)
+            if not manager.filter(pk=1).update(value=F('value') + count):
+                manager.get_or_create(pk=1)
+                manager.filter(pk=1).update(value=F('value') + count)
+            return manager.values_list('value', flat=True).get(pk=1)
+
+    @classmethod
+    def current(cls, using='default'):
+        return cls.objects.db_manager(using).filter(pk=1).values_list('value', flat=True).first() or 0
+
+    @classmethod
+    async def acurrent(cls, using='default'):
+        return await cls.objects.db_manager(using).filter(pk=1).values_list('value', flat=True).afirst() or 0
+
+
+class BookTombstone(models.Model):
+    """
+    O'chirilgan kitob izi - mirror'lar o'chirishni delta sync orqali ko'radi
+    """
+    book_id = models.BigIntegerField()
+    isbn_number = models.CharField(max_length=13)
+    version = models.BigIntegerField(unique=True)
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Book #{self.book_id} deleted (v{self.version})"
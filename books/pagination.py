@@ -0,0 +1,219 @@
+"""
+Pagination
+==========
+
+Book ro'yxati uchun pagination klasslari
+"""
+
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from rest_framework import serializers
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination, _reverse_ordering
+from rest_framework.response import Response
+
+
+class BookCursorPagination(CursorPagination):
+    """
+    Keyset (cursor) pagination - COUNT(*) va OFFSET'siz
+
+    GET /api/books/?pagination=cursor
+    GET /api/books/?pagination=cursor&ordering=-published_date
+    GET /api/books/?cursor=<opaque>
+
+    Har bir sahifa indeksli (maydon, id) juftligi bo'yicha
+    `WHERE (key, id) > (position, pk) LIMIT n` bilan olinadi, shuning uchun
+    50 000-sahifa ham 1-sahifa kabi tez, bir xil sanali yuzlab kitoblar ichida
+    ham OFFSET yo'q (DRF CursorPagination faqat birinchi maydon bo'yicha
+    filtrlab, tenglarni OFFSET bilan o'tkazib yuboradi).
+    Umumiy son faqat `?count=true` bo'lsa qaytariladi.
+    """
+    page_size = settings.REST_FRAMEWORK.get('PAGE_SIZE', 10)
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering_query_param = 'ordering'
+    count_query_param = 'count'
+
+    # Ruxsat etilgan tartiblash kalitlari: (asosiy maydon, id) juftligi
+    ordering = ('published_date', 'id')
+    ORDERINGS = {
+        'published_date': ('published_date', 'id'),
+        '-published_date': ('-published_date', '-id'),
+        'title': ('title', 'id'),
+        '-title': ('-title', '-id'),
+        'id': ('id',),
+        '-id': ('-id',),
+    }
+
+    def get_ordering(self, request, queryset, view):
+        value = request.query_params.get(self.ordering_query_param)
+        if not value:
+            return self.ordering
+
+        if value not in self.ORDERINGS:
+            raise serializers.ValidationError({
+                self.ordering_query_param: (
+                    f"Noto'g'ri tartiblash. Ruxsat etilgan: {', '.join(self.ORDERINGS)}"
+                )
+            })
+        return self.ORDERINGS[value]
+
+    # Cursor pozitsiyasi: "<maydon qiymati>|<id>" (id oxirida - rpartition)
+    position_separator = '|'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        CursorPagination.paginate_queryset bilan bir xil, faqat pozitsiya
+        filtri (seek) butun tartiblash kaliti bo'yicha. Pozitsiyalar unikal
+        (id bor), shuning uchun DRF havolalarida offset doim 0.
+        """
+        self.count = None
+        if request.query_params.get(self.count_query_param) in ('1', 'true', 'True'):
+            self.count = queryset.count()
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if current_position is not None:
+            queryset = self.seek(queryset, current_position, reverse)
+
+        # Keyingi sahifa borligini bilish uchun bitta ortiqcha qator
+        results = list(queryset[offset:offset + self.page_size + 1])
+        self.page = list(results[:self.page_size])
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = (current_position is not None) or (offset > 0)
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (current_position is not None) or (offset > 0)
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def seek(self, queryset, position, reverse):
+        """
+        (maydon, id) > (qiymat, pk): `maydon >= qiymat` - indeks diapazoni,
+        OR - bir xil qiymatlar ichida id bo'yicha davom etish
+        """
+        order = self.ordering[0]
+        # (cursor teskari) XOR (tartib kamayuvchi) -> kichiklar
+        lookup = 'lt' if reverse != order.startswith('-') else 'gt'
+        field = order.lstrip('-')
+        try:
+            if len(self.ordering) == 1:
+                return queryset.filter(**{f'{field}__{lookup}': position})
+            value, _, pk = position.rpartition(self.position_separator)
+            return queryset.filter(**{f'{field}__{lookup}e': value}).filter(
+                Q(**{f'{field}__{lookup}': value}) | Q(**{f'id__{lookup}': int(pk)})
+            )
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for order in ordering:
+            field_name = order.lstrip('-')
+            values.append(instance[field_name] if isinstance(instance, dict) else getattr(instance, field_name))
+        return self.position_separator.join(str(value) for value in values)
+
+    def get_paginated_response(self, data):
+        response = OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+        ])
+        if self.count is not None:
+            response['count'] = self.count
+        response['results'] = data
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count'] = {
+            'type': 'integer',
+            'example': 123,
+        }
+        return response_schema
+
+
+def use_cursor_pagination(request):
+    """So'rov keyset pagination rejimini tanlaganmi?"""
+    params = request.query_params
+    return 'cursor' in params or params.get('pagination') == 'cursor'
+
+
+class LegacyPageNumberPagination(PageNumberPagination):
+    """
+    Eski (old/, homework/) ro'yxat endpoint'lari uchun pagination
+
+    GET /api/old/books/?page=2&page_size=50
+    """
+    page_size = settings.REST_FRAMEWORK.get('PAGE_SIZE', 10)
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+
+async def apaginate_queryset(pagination, queryset, request):
+    """
+    PageNumberPagination.paginate_queryset ning async varianti:
+    COUNT - acount(), sahifa qatorlari - async for
+    """
+    pagination.request = request
+    page_size = pagination.get_page_size(request)
+    if not page_size:
+        return None
+
+    if not queryset.ordered:
+        queryset = queryset.order_by('pk')
+    paginator = pagination.django_paginator_class(queryset, page_size)
+    # Paginator.count - cached_property: oldindan to'ldiriladi
+    paginator.count = await queryset.acount()
+    page_number = pagination.get_page_number(request, paginator)
+    try:
+        page = paginator.page(page_number)
+    except InvalidPage as exc:
+        raise NotFound(pagination.invalid_page_message.format(page_number=page_number, message=str(exc)))
+
+    page.object_list = [row async for row in page.object_list]
+    pagination.page = page
+    if paginator.num_pages > 1 and pagination.template is not None:
+        pagination.display_page_controls = True
+    return page.object_list
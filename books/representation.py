@@ -0,0 +1,254 @@
+"""
+Tezkor o'qish yo'li (read path)
+===============================
+
+GET javoblari uchun ModelSerializer'ning har bir qator/maydon uchun
+get_attribute + to_representation zanjiri o'rniga:
+
+- faqat kerakli ustunlar `.values()` bilan olinadi (model instance yaratilmaydi)
+- har bir maydon uchun converter serializer maydonidan bir marta tuziladi
+  (Decimal -> quantize + '{:f}', date -> isoformat, datetime -> DRF formati)
+
+Natija serializer.data bilan bir xil (JSON baytma-bayt teng). Serializer'da
+qo'llab-quvvatlanmaydigan maydon yoki to_representation override bo'lsa
+for_serializer() None qaytaradi va oddiy yo'l ishlatiladi.
+"""
+
+import decimal
+from functools import lru_cache
+
+from django.utils import timezone
+from rest_framework import ISO_8601, fields as drf_fields, serializers
+from rest_framework.settings import api_settings
+
+from .models import Book
+
+# Bazadan kelgan qiymat o'zi tayyor (str(value) / int(value) / bool(value))
+PASSTHROUGH = {
+    drf_fields.CharField.to_representation,
+    drf_fields.IntegerField.to_representation,
+    drf_fields.BooleanField.to_representation,
+    drf_fields.ReadOnlyField.to_representation,
+}
+# Converter bilan qo'llab-quvvatlanadigan (override qilinmagan) to_representation'lar
+CONVERTED = {
+    drf_fields.DecimalField.to_representation,
+    drf_fields.DateField.to_representation,
+    drf_fields.DateTimeField.to_representation,
+}
+
+
+def _decimal_converter(field):
+    coerce_to_string = getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+    if field.decimal_places is None:
+        exponent = None
+    else:
+        exponent = decimal.Decimal('.1') ** field.decimal_places
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    rounding, normalize = field.rounding, field.normalize_output
+
+    def convert(value):
+        if not isinstance(value, decimal.Decimal):
+            value = decimal.Decimal(str(value).strip())
+        if exponent is not None:
+            value = value.quantize(exponent, rounding=rounding, context=context)
+        if normalize:
+            value = value.normalize()
+        return '{:f}'.format(value) if coerce_to_string else value
+    return convert
+
+
+def _date_converter(field):
+    output_format = getattr(field, 'format', api_settings.DATE_FORMAT)
+    if output_format is None:
+        return lambda value: value
+    if output_format.lower() == ISO_8601:
+        return lambda value: value.isoformat()
+    return lambda value: value.strftime(output_format)
+
+
+def _datetime_converter(field):
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    if output_format is None:
+        return lambda value: value
+    iso = output_format.lower() == ISO_8601
+
+    def convert(value, field_timezone):
+        if field_timezone is not None:
+            if timezone.is_aware(value):
+                value = value.astimezone(field_timezone)
+            else:
+                value = timezone.make_aware(value, field_timezone)
+        if not iso:
+            return value.strftime(output_format)
+        value = value.isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+    return convert
+
+
+class BookRepresentation:
+    """Bitta serializer klassi uchun oldindan tuzilgan ustunlar va converter'lar"""
+
+    def __init__(self, serializer_class, fields):
+        self.serializer_class = serializer_class
+        self._fields = fields
+        self.names = tuple(fields)
+        self.columns = tuple(field.source for field in fields.values())
+
+    def values(self, queryset, extra=()):
+        """
+        Pagination uchun: dict qatorlar (cursor pagination ham dict bilan ishlaydi)
+        extra - javobga kirmaydigan, lekin kerakli ustunlar (masalan, cursor kaliti)
+        """
+        return queryset.values(*self.columns, *(column for column in extra if column not in self.columns))
+
+    def restrict(self, names):
+        """Faqat names maydonlari uchun (?fields=) - SQL ham shu ustunlar bilan"""
+        return BookRepresentation(self.serializer_class, {name: self._fields[name] for name in names})
+
+    def _plan(self):
+        # Joriy timezone so'rov davomida o'zgarishi mumkin - har chaqiriqda olinadi
+        plan = []
+        for name, field in self._fields.items():
+            if isinstance(field, drf_fields.DateTimeField):
+                field_timezone = getattr(field, 'timezone', None) or field.default_timezone()
+                convert = _datetime_converter(field)
+                plan.append((name, field.source, lambda value, c=convert, tz=field_timezone: c(value, tz)))
+            elif isinstance(field, drf_fields.DateField):
+                plan.append((name, field.source, _date_converter(field)))
+            elif isinstance(field, drf_fields.DecimalField):
+                plan.append((name, field.source, _decimal_converter(field)))
+            else:
+                plan.append((name, field.source, None))
+        return plan
+
+    def convert(self, rows):
+        """values() dict'lari -> serializer.data bilan bir xil dict'lar ro'yxati"""
+        plan = self._plan()
+        return [
+            {
+                name: row[column] if convert is None or row[column] is None else convert(row[column])
+                for name, column, convert in plan
+            }
+            for row in rows
+        ]
+
+    def iterate(self, queryset, chunk_size=500):
+        """Streaming/eksport uchun: server tomonidagi cursor bo'yicha qatorlar"""
+        rows = self.values(queryset).iterator(chunk_size=chunk_size)
+        while True:
+            chunk = [row for _, row in zip(range(chunk_size), rows)]
+            if not chunk:
+                return
+            yield from self.convert(chunk)
+
+
+def _supported(field):
+    method = type(field).to_representation
+    if method in CONVERTED:
+        return not getattr(field, 'localize', False)
+    return method in PASSTHROUGH
+
+
+@lru_cache(maxsize=None)
+def for_serializer(serializer_class):
+    """
+    serializer_class uchun BookRepresentation yoki None (tezkor yo'l mumkin emas)
+    """
+    if not issubclass(serializer_class, serializers.ModelSerializer):
+        return None
+    if getattr(serializer_class.Meta, 'model', None) is not Book:
+        return None
+    if serializer_class.to_representation is not serializers.ModelSerializer.to_representation:
+        return None
+
+    concrete = {field.attname for field in Book._meta.concrete_fields}
+    fields = {}
+    for name, field in serializer_class().fields.items():
+        if field.write_only:
+            continue
+        if field.source not in concrete or not _supported(field):
+            return None
+        fields[name] = field
+    return BookRepresentation(serializer_class, fields)
+
+
+@lru_cache(maxsize=None)
+def readable_fields(serializer_class):
+    """Serializer javobidagi maydonlar (tartib bilan) - ?fields= uchun whitelist"""
+    return tuple(name for name, field in serializer_class().fields.items() if not field.write_only)
+
+
+def _split(value):
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+def parse_fields(query_params, serializer_class):
+    """
+    ?fields=id,title,author / ?exclude=subtitle,pages
+    Qaytaradi: maydon nomlari (serializer tartibida) yoki None (cheklov yo'q)
+    """
+    fields, exclude = query_params.get('fields'), query_params.get('exclude')
+    if not fields and not exclude:
+        return None
+
+    allowed = readable_fields(serializer_class)
+    requested = _split(fields) if fields else set(allowed)
+    excluded = _split(exclude) if exclude else set()
+    unknown = (requested | excluded) - set(allowed)
+    if unknown:
+        raise serializers.ValidationError({
+            'fields': (
+                f"Noma'lum maydon(lar): {', '.join(sorted(unknown))}. "
+                f"Ruxsat etilgan: {', '.join(allowed)}"
+            )
+        })
+
+    names = tuple(name for name in allowed if name in requested and name not in excluded)
+    if not names:
+        raise serializers.ValidationError({'fields': "Kamida bitta maydon tanlanishi kerak"})
+    return names
+
+
+def select(data, names):
+    """Tayyor representation dict'idan (masalan, detail cache) faqat names maydonlari"""
+    if names is None:
+        return data
+    return {name: data[name] for name in names}
+
+
+def prepare(serializer_class, queryset, context=None, fields=None, extra=()):
+    """
+    (queryset, to_data) juftligi:
+    to_data(rows) == serializer_class(rows, many=True, context=context).data
+
+    Tezkor yo'lda queryset .values() ga aylantiriladi, shuning uchun pagination
+    undan keyin qo'llanishi kerak.
+    fields - parse_fields() natijasi: javob ham, SELECT ham shu maydonlar bilan.
+    """
+    fast = for_serializer(serializer_class)
+    if fast is not None:
+        if fields is not None:
+            fast = fast.restrict(fields)
+        return fast.values(queryset, extra), fast.convert
+
+    if fields is None:
+        return queryset, lambda rows: serializer_class(rows, many=True, context=context).data
+
+    concrete = {field.attname for field in Book._meta.concrete_fields}
+    serializer_fields = serializer_class().fields
+    sources = [serializer_fields[name].source for name in fields] + list(extra)
+    if all(source in concrete for source in sources):
+        queryset = queryset.only(*sources)
+
+    def to_data(rows):
+        serializer = serializer_class(rows, many=True, context=context)
+        for name in list(serializer.child.fields):
+            if name not in fields:
+                serializer.child.fields.pop(name)
+        return serializer.data
+    return queryset, to_data
@@ -0,0 +1,166 @@
+"""
+Full-text search
+================
+
+SQLite FTS5 virtual jadvali (title, subtitle, author) orqali kitob qidirish.
+Indeks books_book jadvalidagi trigger'lar yordamida sinxron turadi, shuning
+uchun save(), delete(), bulk_create() va update() - hammasi qamrab olinadi.
+"""
+
+import base64
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import Book
+
+FTS_TABLE = 'books_book_fts'
+
+# bm25 og'irliklari: title, subtitle, author
+BM25_WEIGHTS = (10.0, 2.0, 5.0)
+
+FTS_SCHEMA = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, subtitle, author,
+        content='books_book', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON books_book BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, subtitle, author)
+        VALUES (new.id, new.title, new.subtitle, new.author);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON books_book BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, subtitle, author)
+        VALUES ('delete', old.id, old.title, old.subtitle, old.author);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, subtitle, author ON books_book BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, subtitle, author)
+        VALUES ('delete', old.id, old.title, old.subtitle, old.author);
+        INSERT INTO {FTS_TABLE}(rowid, title, subtitle, author)
+        VALUES (new.id, new.title, new.subtitle, new.author);
+    END
+    """,
+]
+
+TRIGGER_NAMES = [f'{FTS_TABLE}_ai', f'{FTS_TABLE}_ad', f'{FTS_TABLE}_au']
+
+
+def is_supported(using=connection):
+    return using.vendor == 'sqlite'
+
+
+def ensure_schema(using=connection):
+    """
+    FTS jadvali va trigger'larni yaratadi (idempotent).
+
+    Django SQLite'da AlterField/AddField uchun books_book jadvalini qayta
+    yaratadi va trigger'lar yo'qoladi - shuning uchun post_migrate'da ham
+    chaqiriladi. Trigger yo'q bo'lgan bo'lsa indeks qayta quriladi.
+    """
+    if not is_supported(using) or Book._meta.db_table not in using.introspection.table_names():
+        return False
+
+    with using.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name IN (%s, %s, %s)",
+            TRIGGER_NAMES,
+        )
+        complete = len(cursor.fetchall()) == len(TRIGGER_NAMES)
+        for statement in FTS_SCHEMA:
+            cursor.execute(statement)
+        if not complete:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    return not complete
+
+
+def drop_schema(using=connection):
+    if not is_supported(using):
+        return
+    with using.cursor() as cursor:
+        for name in TRIGGER_NAMES:
+            cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+        cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+def build_match_expression(query):
+    """
+    Foydalanuvchi matnini xavfsiz FTS5 ifodasiga aylantiradi:
+    'django rest' -> '"django"* "rest"*' (har bir so'z prefiks, AND)
+    """
+    tokens = re.findall(r'\w+', query or '')
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def encode_cursor(score, pk):
+    return base64.urlsafe_b64encode(f'{score!r}:{pk}'.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        score, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split(':')
+        return float(score), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def search_ids(query, limit, after=None):
+    """
+    Relevance bo'yicha tartiblangan [(book_id, score), ...]
+
+    Keyset pagination: after=(score, id) - oldingi sahifaning oxirgi elementi.
+    score = bm25 (kichikroq = mosroq).
+    """
+    expression = build_match_expression(query)
+    if not expression:
+        return []
+
+    if not is_supported():
+        queryset = _fallback_filter(Book.objects.all(), query)
+        if after is not None:
+            queryset = queryset.filter(pk__gt=after[1])
+        return [(pk, 0.0) for pk in queryset.order_by('pk').values_list('pk', flat=True)[:limit]]
+
+    sql = (
+        f"SELECT rowid, bm25({FTS_TABLE}, %s, %s, %s) AS score "
+        f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s"
+    )
+    params = [*BM25_WEIGHTS, expression]
+    if after is not None:
+        sql += " AND (score > %s OR (score = %s AND rowid > %s))"
+        params += [after[0], after[0], after[1]]
+    sql += " ORDER BY score, rowid LIMIT %s"
+    params.append(limit)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def _fallback_filter(queryset, query):
+    """SQLite bo'lmagan bazalar uchun oddiy icontains qidiruv"""
+    for token in re.findall(r'\w+', query):
+        queryset = queryset.filter(
+            Q(title__icontains=token) | Q(subtitle__icontains=token) | Q(author__icontains=token)
+        )
+    return queryset
+
+
+def filter_queryset(queryset, query):
+    """Admin va boshqa joylar uchun: FTS natijasiga mos queryset"""
+    expression = build_match_expression(query)
+    if not expression:
+        return queryset.none()
+    if not is_supported():
+        return _fallback_filter(queryset, query)
+    return queryset.filter(
+        pk__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [expression])
+    )
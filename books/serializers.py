@@ -369,6 +369,27 @@ class BookCompleteValidationSerializer(serializers.ModelSerializer):
         return data
 
 
+# ============================================
+# 6. BULK (PAKETLI) VALIDATION
+# ============================================
+
+class BookBulkItemSerializer(BookCompleteValidationSerializer):
+    """
+    POST /api/books/bulk/ elementlari uchun
+    Field validation'lar BookCompleteValidationSerializer bilan bir xil,
+    bazaga murojaat qiluvchi uniqueness tekshiruvlari esa butun paket uchun
+    bir necha IN so'rov bilan bajariladi (books/bulk.py)
+    """
+    
+    isbn_number = serializers.CharField(
+        max_length=17,
+        validators=[validate_isbn_format]
+    )
+    
+    def validate(self, data):
+        return data
+
+
 # Default serializer (backward compatibility)
 BookSerializer = BookCompleteValidationSerializer
 BookModelSerializer = BookCompleteValidationSerializer
@@ -0,0 +1,62 @@
+"""
+Book signals
+============
+
+Book o'zgarganda bog'liq ma'lumotlarni yangilash
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import cache as book_cache
+from . import sync
+from . import statistics
+from .models import Book
+
+
+@receiver(pre_save, sender=Book)
+def remember_book_state(sender, instance, raw=False, **kwargs):
+    """Saqlashdan oldingi holat (statistika uchun)"""
+    if raw:
+        return
+    previous = statistics.loaded_snapshot(instance)
+    if previous is None and instance.pk is not None:
+        book = Book.objects.filter(pk=instance.pk).first()
+        previous = statistics.snapshot(book) if book else None
+    instance._previous_snapshot = previous
+
+
+@receiver(post_save, sender=Book)
+def update_statistics_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    current = statistics.snapshot(instance)
+    previous = getattr(instance, '_previous_snapshot', None)
+
+    if created or previous is None:
+        statistics.add_rows([current])
+    else:
+        statistics.change_row(previous, current)
+
+    # Keyingi save() uchun yangi holatni eslab qolamiz
+    instance._loaded_values = {
+        field: getattr(instance, field) for field in statistics.BUCKET_FIELDS
+    }
+
+
+@receiver(post_delete, sender=Book)
+def update_statistics_on_delete(sender, instance, **kwargs):
+    statistics.remove_row(
+        statistics.loaded_snapshot(instance) or statistics.snapshot(instance)
+    )
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+def invalidate_book_cache(sender, instance, **kwargs):
+    book_cache.invalidate(instance.pk)
+
+
+@receiver(post_delete, sender=Book)
+def record_tombstone(sender, instance, **kwargs):
+    sync.record_deletion(instance)
@@ -0,0 +1,242 @@
+"""
+Book Statistics
+===============
+
+BookStatistics jadvalini inkremental yangilash va qayta hisoblash.
+Har bir bucket = (language, year, published).
+"""
+
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, Q, Sum
+from django.db.models.functions import Coalesce, ExtractYear, Greatest, Least
+
+from .models import Book, BookStatistics
+
+BUCKET_FIELDS = ('language', 'published_date', 'published', 'price')
+BREAKDOWN_DIMENSIONS = ('language', 'year', 'published')
+
+
+def _row(language, published_date, published, price):
+    return {
+        'language': language,
+        'year': Book._meta.get_field('published_date').to_python(published_date).year,
+        'published': published,
+        'price': Book._meta.get_field('price').to_python(price),
+    }
+
+
+def snapshot(book):
+    """Statistikaga ta'sir qiluvchi maydonlar: {'language', 'year', 'published', 'price'}"""
+    return _row(book.language, book.published_date, book.published, book.price)
+
+
+def loaded_snapshot(book):
+    """Bazadan o'qilgan holat (Book.from_db) yoki None"""
+    values = getattr(book, '_loaded_values', None)
+    if not values or any(field not in values for field in BUCKET_FIELDS):
+        return None
+    return _row(*(values[field] for field in BUCKET_FIELDS))
+
+
+def _bucket(row):
+    return BookStatistics.objects.filter(
+        language=row['language'], year=row['year'], published=row['published']
+    )
+
+
+def add_rows(rows):
+    """Bir nechta kitobni statistikaga qo'shish"""
+    grouped = {}
+    for row in rows:
+        key = (row['language'], row['year'], row['published'])
+        count, total, low, high = grouped.get(key, (0, Decimal(0), row['price'], row['price']))
+        grouped[key] = (count + 1, total + row['price'], min(low, row['price']), max(high, row['price']))
+
+    with transaction.atomic():
+        for (language, year, published), (count, total, low, high) in grouped.items():
+            BookStatistics.objects.get_or_create(
+                language=language, year=year, published=published
+            )
+            BookStatistics.objects.filter(
+                language=language, year=year, published=published
+            ).update(
+                book_count=F('book_count') + count,
+                price_sum=F('price_sum') + total,
+                price_min=Least(Coalesce(F('price_min'), low), low),
+                price_max=Greatest(Coalesce(F('price_max'), high), high),
+            )
+
+
+def remove_row(row):
+    """Bitta kitobni statistikadan olib tashlash"""
+    with transaction.atomic():
+        bucket = _bucket(row).select_for_update().first()
+        if bucket is None:
+            return
+
+        if bucket.book_count <= 1:
+            bucket.delete()
+            return
+
+        _bucket(row).update(
+            book_count=F('book_count') - 1,
+            price_sum=F('price_sum') - row['price'],
+        )
+        # Min/max faqat chetdagi qiymat o'chirilganda qayta hisoblanadi
+        if row['price'] in (bucket.price_min, bucket.price_max):
+            _bucket(row).update(**_bucket_price_range(row))
+
+
+def _bucket_price_range(row):
+    return Book.objects.filter(
+        language=row['language'],
+        published_date__year=row['year'],
+        published=row['published'],
+    ).aggregate(price_min=Min('price'), price_max=Max('price'))
+
+
+def change_row(old, new):
+    """Kitob yangilanganda: eski bucket'dan ayirib, yangisiga qo'shish"""
+    if old == new:
+        return
+    with transaction.atomic():
+        remove_row(old)
+        add_rows([new])
+
+
+def record_created(books):
+    """bulk_create kabi signal'siz yo'llar uchun"""
+    add_rows([snapshot(book) for book in books])
+
+
+# ============================================
+# QAYTA HISOBLASH VA TEKSHIRISH
+# ============================================
+
+def compute_from_books():
+    """Book jadvalidan to'g'ridan-to'g'ri hisoblangan bucket'lar"""
+    rows = (
+        Book.objects
+        .annotate(year=ExtractYear('published_date'))
+        .values('language', 'year', 'published')
+        .annotate(
+            book_count=Count('id'),
+            price_sum=Sum('price'),
+            price_min=Min('price'),
+            price_max=Max('price'),
+        )
+        .order_by()
+    )
+    return {
+        (row['language'], row['year'], row['published']): row
+        for row in rows
+    }
+
+
+def rebuild():
+    """BookStatistics jadvalini to'liq qayta hisoblash"""
+    buckets = compute_from_books()
+    with transaction.atomic():
+        BookStatistics.objects.all().delete()
+        BookStatistics.objects.bulk_create([
+            BookStatistics(**row) for row in buckets.values()
+        ])
+    return len(buckets)
+
+
+def verify():
+    """Jadval va haqiqiy ma'lumot orasidagi farqlar ro'yxati"""
+    expected = compute_from_books()
+    actual = {
+        (row['language'], row['year'], row['published']): row
+        for row in BookStatistics.objects.values(
+            'language', 'year', 'published',
+            'book_count', 'price_sum', 'price_min', 'price_max',
+        )
+    }
+
+    mismatches = []
+    for key in sorted(set(expected) | set(actual), key=str):
+        exp, act = expected.get(key), actual.get(key)
+        if exp is None or act is None:
+            mismatches.append((key, exp, act))
+            continue
+        for field in ('book_count', 'price_sum', 'price_min', 'price_max'):
+            if Decimal(exp[field]) != Decimal(act[field]):
+                mismatches.append((key, exp, act))
+                break
+    return mismatches
+
+
+# ============================================
+# API UCHUN O'QISH
+# ============================================
+
+def _price(value):
+    if value is None:
+        return None
+    return str(Decimal(value).quantize(Decimal('0.01')))
+
+
+def _summary(row):
+    count = row['count'] or 0
+    published = row.get('published_count')
+    data = {'total_books': count}
+    if published is not None:
+        data['published_books'] = published
+        data['unpublished_books'] = count - published
+    data['price'] = {
+        'min': _price(row['min_price']),
+        'avg': _price(row['sum_price'] / count) if count else None,
+        'max': _price(row['max_price']),
+    }
+    return data
+
+
+def _aggregates(breakdown=()):
+    aggregates = {
+        'count': Sum('book_count'),
+        'published_count': Coalesce(Sum('book_count', filter=Q(published=True)), 0),
+        'sum_price': Sum('price_sum'),
+        'min_price': Min('price_min'),
+        'max_price': Max('price_max'),
+    }
+    if 'published' in breakdown:
+        del aggregates['published_count']
+    return aggregates
+
+
+def _breakdown_rows(breakdown):
+    return (
+        BookStatistics.objects
+        .values(*breakdown)
+        .annotate(**_aggregates(breakdown))
+        .order_by(*breakdown)
+    )
+
+
+def _breakdown(breakdown, rows):
+    return [
+        {**{dim: row[dim] for dim in breakdown}, **_summary(row)}
+        for row in rows
+    ]
+
+
+def get_statistics(breakdown=()):
+    """
+    Umumiy statistika (+ ixtiyoriy breakdown) - faqat BookStatistics'dan
+    """
+    data = _summary(BookStatistics.objects.aggregate(**_aggregates()))
+    if breakdown:
+        data['breakdown'] = _breakdown(breakdown, _breakdown_rows(breakdown))
+    return data
+
+
+async def aget_statistics(breakdown=()):
+    """get_statistics() ning async varianti (aaggregate, async for)"""
+    data = _summary(await BookStatistics.objects.aaggregate(**_aggregates()))
+    if breakdown:
+        data['breakdown'] = _breakdown(breakdown, [row async for row in _breakdown_rows(breakdown)])
+    return data
@@ -0,0 +1,105 @@
+"""
+Streaming JSON
+==============
+
+Katta ro'yxatlarni xotiraga to'liq yuklamasdan JSON sifatida uzatish
+
+ASGI'da Django sync iterator'ni sync_to_async(list) bilan to'liq yig'adi
+(butun javob xotirada, birinchi bayt oxirida). Shuning uchun ASGI so'rovlariga
+async iterator beriladi (aiterate): har bir bo'lak sync_to_async orqali
+thread'da o'qiladi, event loop esa uni darhol klientga yuboradi.
+"""
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+
+from library_project.renderers import json_dumps
+
+from . import representation
+
+
+def dumps(data):
+    """DRF JSONRenderer bilan bir xil (compact, unicode) JSON"""
+    return json_dumps(data).decode()
+
+
+def iter_json_envelope(message, queryset, serializer_class, chunk_size=500, fields=None):
+    """
+    {"message", "count", "results"} konvertini bo'laklab hosil qiladi
+
+    Server tomonidagi cursor (`.iterator(chunk_size=...)`) orqali o'qiladi,
+    xotirada bir vaqtda faqat bitta chunk turadi.
+    """
+    queryset = queryset.order_by('pk')
+
+    yield '{"message":%s,"count":%d,"results":[' % (dumps(message), queryset.count())
+
+    buffer = []
+    first = True
+    for row in iter_representations(queryset, serializer_class, chunk_size, fields):
+        item = dumps(row)
+        buffer.append(item if first else ',' + item)
+        first = False
+        if len(buffer) >= chunk_size:
+            yield ''.join(buffer)
+            buffer = []
+
+    buffer.append(']}')
+    yield ''.join(buffer)
+
+
+def iter_representations(queryset, serializer_class, chunk_size=500, fields=None):
+    """
+    serializer.to_representation() natijalari - imkon bo'lsa tezkor yo'l bilan
+    fields - ?fields= (representation.parse_fields) natijasi
+    """
+    fast = representation.for_serializer(serializer_class)
+    if fast is not None:
+        if fields is not None:
+            fast = fast.restrict(fields)
+        yield from fast.iterate(queryset, chunk_size)
+        return
+    serializer = serializer_class()
+    for book in queryset.iterator(chunk_size=chunk_size):
+        yield representation.select(serializer.to_representation(book), fields)
+
+
+_DONE = object()
+
+
+def is_asgi(request):
+    """So'rov ASGI server orqali kelganmi (DRF Request ham qabul qilinadi)"""
+    return isinstance(getattr(request, '_request', request), ASGIRequest)
+
+
+async def aiterate(chunks):
+    """
+    Sync iterator -> async iterator: har bir next() thread'da (baza cursor'i
+    bitta thread'da qoladi - thread_sensitive), bo'laklar kelishi bilan yuboriladi
+    """
+    chunks = iter(chunks)
+    next_chunk = sync_to_async(next, thread_sensitive=True)
+    try:
+        while True:
+            chunk = await next_chunk(chunks, _DONE)
+            if chunk is _DONE:
+                return
+            yield chunk
+    finally:
+        # Klient uzilsa ham cursor yopiladi
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            await sync_to_async(close, thread_sensitive=True)()
+
+
+def streaming_content(request, chunks):
+    """StreamingHttpResponse uchun: ASGI'da async, WSGI'da sync iterator"""
+    return aiterate(chunks) if is_asgi(request) else chunks
+
+
+def streaming_json_response(request, message, queryset, serializer_class, chunk_size=500, fields=None):
+    return StreamingHttpResponse(
+        streaming_content(request, iter_json_envelope(message, queryset, serializer_class, chunk_size, fields)),
+        content_type='application/json',
+    )
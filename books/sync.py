@@ -0,0 +1,40 @@
+"""
+Delta sync
+==========
+
+GET /api/books/changes/?since=<version>
+
+Har bir Book.save() yangi change_version oladi, o'chirishlar esa
+BookTombstone'ga yoziladi. Mirror oxirgi ko'rgan versiyasidan keyingi
+o'zgarishlarnigina oladi - ish hajmi katalog hajmiga emas, o'zgarishlar
+soniga proporsional.
+"""
+
+from .models import Book, BookChangeCounter, BookTombstone
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+
+def record_deletion(book):
+    return BookTombstone.objects.create(
+        book_id=book.pk,
+        isbn_number=book.isbn_number,
+        version=BookChangeCounter.next_version(),
+    )
+
+
+def get_changes(since, limit=DEFAULT_LIMIT):
+    """
+    since'dan keyingi o'zgarishlar (versiya bo'yicha tartiblangan):
+    [(version, 'upsert', book), (version, 'delete', tombstone), ...], has_more
+    """
+    upserts = Book.objects.filter(change_version__gt=since).order_by('change_version')[:limit + 1]
+    deletes = BookTombstone.objects.filter(version__gt=since).order_by('version')[:limit + 1]
+
+    changes = sorted(
+        [(book.change_version, 'upsert', book) for book in upserts]
+        + [(tombstone.version, 'delete', tombstone) for tombstone in deletes],
+        key=lambda change: change[0],
+    )
+    return changes[:limit], len(changes) > limit
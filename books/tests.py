@@ -1,3 +1,1253 @@
-from django.test import TestCase
+import csv
+import gzip
+import importlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import warnings
+from datetime import date
+from io import StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.paginator import UnorderedObjectListWarning
+from django.core.management import CommandError, call_command
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connection, connections
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import include, path
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.routers import DefaultRouter
+from rest_framework.test import APIClient
+
+from library_project import db
+from library_project.cache import SQLiteCache
+from library_project.middleware import CompressionMiddleware, ReadOnlyDatabaseMiddleware, brotli
+from library_project.renderers import FastJSONRenderer, msgpack
+
+from . import cache as book_cache
+from . import bulk, representation, serializers, statistics
+from .management.commands.import_books import Command
+from .models import Book, BookChangeCounter
+from .pagination import LegacyPageNumberPagination, apaginate_queryset
+from .views import AsyncBookViewSet
+
+# AsyncBookViewSetTests uchun (ROOT_URLCONF='books.tests')
+async_router = DefaultRouter()
+async_router.register(r'books', AsyncBookViewSet, basename='book')
+urlpatterns = [path('api/', include(async_router.urls))]
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN faqat SQLite uchun')
+class BookQueryPlanTests(TestCase):
+    """
+    Asosiy Book so'rovlari indeks ishlatishini tekshirish
+    (jadvalni to'liq skanerlash bo'lmasligi kerak)
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        Book.objects.create(
+            title='Clean Code', author='Robert Martin', published_date=date(2008, 8, 1),
+            isbn_number='9780132350884', pages=464, language='en', price=35000,
+            cover_image='https://example.com/clean-code.jpg', published=True,
+        )
+
+    def query_plan(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = self.query_plan(queryset)
+        book_steps = [step for step in plan if 'books_book' in step]
+        self.assertTrue(book_steps, plan)
+        for step in book_steps:
+            self.assertIn('INDEX', step, f'Table scan: {plan}')
+        self.assertTrue(any(index_name in step for step in book_steps), plan)
+
+    def test_published_uses_partial_index(self):
+        self.assertUsesIndex(Book.objects.filter(published=True), 'books_published_idx')
+
+    def test_published_count_uses_partial_index(self):
+        queryset = Book.objects.filter(published=True).values('pk')
+        self.assertUsesIndex(queryset, 'books_published_idx')
+
+    def test_title_author_lookup_uses_composite_index(self):
+        queryset = Book.objects.filter(title='Clean Code', author='Robert Martin')
+        self.assertUsesIndex(queryset, 'books_title_author_idx')
+
+    def test_cover_image_lookup_uses_index(self):
+        queryset = Book.objects.filter(cover_image='https://example.com/clean-code.jpg')
+        self.assertUsesIndex(queryset, 'books_cover_image_idx')
+
+    def test_language_filter_uses_index(self):
+        self.assertUsesIndex(Book.objects.filter(language='en'), 'books_language_idx')
+
+    def test_published_date_filter_uses_index(self):
+        queryset = Book.objects.filter(published_date__year=2008)
+        self.assertUsesIndex(queryset, 'books_pubdate_id_idx')
+
+    def test_keyset_orderings_use_index(self):
+        queryset = Book.objects.filter(published_date__gt=date(2000, 1, 1))
+        self.assertUsesIndex(queryset.order_by('published_date', 'id')[:10], 'books_pubdate_id_idx')
+        queryset = Book.objects.filter(title__gt='A')
+        self.assertUsesIndex(queryset.order_by('title', 'id')[:10], 'books_title_id_idx')
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class BookCursorPaginationTests(TestCase):
+    """Keyset pagination: sahifa chegarasi bir xil sanali kitoblar ichida bo'lsa ham"""
+
+    @classmethod
+    def setUpTestData(cls):
+        # 3 ta sana, har birida 7 ta kitob - 4 talik sahifalar chegarasi tenglar ichiga tushadi
+        for number in range(21):
+            Book.objects.create(
+                title=f'Book {number % 5}', author='Test Author', published_date=date(2020, 1, 1 + number % 3),
+                isbn_number=f'978200000{number:04d}', pages=100, language='en', price=20000,
+            )
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def walk(self, url):
+        """next havolalari bo'yicha barcha sahifalar -> (id'lar, SQL so'rovlar)"""
+        ids, queries = [], []
+        while url:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            ids.extend(book['id'] for book in response.data['results'])
+            queries.extend(query['sql'] for query in context.captured_queries)
+            url = response.data['next']
+        return ids, queries
+
+    def test_pages_cover_ties_in_order(self):
+        orderings = {
+            'published_date': ('published_date', 'id'),
+            '-published_date': ('-published_date', '-id'),
+            'title': ('title', 'id'),
+            '-title': ('-title', '-id'),
+        }
+        for ordering, order_by in orderings.items():
+            with self.subTest(ordering=ordering):
+                ids, queries = self.walk(f'/api/books/?pagination=cursor&page_size=4&ordering={ordering}')
+                self.assertEqual(ids, list(Book.objects.order_by(*order_by).values_list('id', flat=True)))
+                page_queries = [sql for sql in queries if 'LIMIT 5' in sql]
+                self.assertEqual(len(page_queries), 6)
+                # Tenglar ichida ham OFFSET'siz seek
+                self.assertFalse([sql for sql in page_queries if 'OFFSET' in sql])
+
+    def test_previous_link_returns_previous_page(self):
+        url = '/api/books/?pagination=cursor&page_size=4'
+        first = self.client.get(url).data
+        second = self.client.get(first['next']).data
+        back = self.client.get(second['previous']).data
+        self.assertEqual(
+            [book['id'] for book in back['results']], [book['id'] for book in first['results']]
+        )
+
+    def test_count_only_on_request(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/books/?pagination=cursor')
+        self.assertNotIn('count', response.data)
+        self.assertFalse([q for q in context.captured_queries if 'COUNT(*)' in q['sql'] and 'books_book' in q['sql']])
+        response = self.client.get('/api/books/?pagination=cursor&count=true')
+        self.assertEqual(response.data['count'], 21)
+
+    def test_cursor_without_id_is_rejected(self):
+        # Eski (faqat sana) pozitsiya
+        self.assertEqual(self.client.get('/api/books/?cursor=cD0yMDIwLTAxLTAx').status_code, 404)
+
+
+class LegacyBookListTests(TestCase):
+    """Eski ro'yxat endpoint'lari: ?page / ?page_size, ?stream=true va oddiy GET"""
+
+    @classmethod
+    def setUpTestData(cls):
+        for number in range(7):
+            Book.objects.create(
+                title=f'Legacy Book {number}', author='Test Author', published_date=date(2010, 1, 1),
+                isbn_number=f'978300000{number:04d}', pages=100, language='en', price=20000,
+            )
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_paginated_envelope(self):
+        response = self.client.get('/api/old/books/?page=2&page_size=3')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 7)
+        self.assertEqual(response.data['message'], 'Complete validation (field + object + custom)')
+        ids = list(Book.objects.order_by('pk').values_list('id', flat=True))
+        self.assertEqual([book['id'] for book in response.data['results']], ids[3:6])
+        self.assertIn('page=3', response.data['next'])
+        self.assertIsNotNone(response.data['previous'])
+        self.assertEqual(self.client.get('/api/old/books/?page=9&page_size=3').status_code, 404)
+
+    def test_stream_matches_full_list(self):
+        for url in ('/api/old/books/', '/api/homework/field-validation/'):
+            with self.subTest(url=url):
+                full = self.client.get(url)
+                streamed = self.client.get(f'{url}?stream=true')
+                self.assertTrue(streamed.streaming)
+                body = json.loads(b''.join(streamed.streaming_content))
+                self.assertEqual(body['count'], 7)
+                self.assertEqual(body['message'], full.data['message'])
+                self.assertEqual(
+                    [book['id'] for book in body['results']],
+                    sorted(book['id'] for book in full.data['results']),
+                )
+
+    def test_page_number_pagination_is_ordered(self):
+        ids = list(Book.objects.order_by('pk').values_list('id', flat=True))
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', UnorderedObjectListWarning)
+            legacy = self.client.get('/api/old/books/?page=1&page_size=3')
+            viewset = self.client.get('/api/books/?page=1')
+            paginated = async_to_sync(apaginate_queryset)(
+                LegacyPageNumberPagination(), Book.objects.all(),
+                Request(RequestFactory().get('/?page=1&page_size=3')),
+            )
+        self.assertEqual([book['id'] for book in legacy.data['results']], ids[:3])
+        self.assertEqual([book['id'] for book in viewset.data['results']], ids)
+        self.assertEqual([book.pk for book in paginated], ids[:3])
+
+    def test_plain_get_is_unchanged(self):
+        response = self.client.get('/api/old/field-validation/')
+        self.assertEqual(set(response.data), {'message', 'count', 'results'})
+        self.assertEqual(response.data['count'], 7)
+        self.assertEqual(len(response.data['results']), 7)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class BookStatisticsTests(TestCase):
+    """BookStatistics save/update/delete'da inkremental yangilanadi va Book'dan hisoblanganiga teng"""
+
+    def create(self, number, **fields):
+        values = {
+            'title': f'Stats Book {number}', 'author': 'Test Author', 'published_date': date(2015, 1, 1),
+            'isbn_number': f'978400000{number:04d}', 'pages': 100, 'language': 'en', 'price': 20000,
+        }
+        values.update(fields)
+        return Book.objects.create(**values)
+
+    def test_incremental_updates_match_rebuild(self):
+        cheap = self.create(1, price=15000)
+        self.create(2, price=30000, published=True)
+        self.create(3, language='uz', published_date=date(2016, 5, 1))
+        self.assertEqual(statistics.verify(), [])
+
+        # Bucket almashadi (til) va chetdagi narx o'zgaradi
+        cheap.language = 'uz'
+        cheap.price = 18000
+        cheap.save()
+        self.assertEqual(statistics.verify(), [])
+
+        # Chetdagi qiymat o'chirilsa min/max qayta hisoblanadi
+        Book.objects.get(isbn_number='9784000000002').delete()
+        self.assertEqual(statistics.verify(), [])
+
+        Book.objects.filter(pk=cheap.pk).first().delete()
+        self.assertEqual(statistics.verify(), [])
+
+    def test_endpoint_reads_counters_without_counting_books(self):
+        self.create(1, price=15000)
+        self.create(2, price=25000, published=True)
+        self.create(3, language='uz', price=35000)
+        with CaptureQueriesContext(connection) as context:
+            response = APIClient().get('/api/books/statistics/?breakdown=language')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([q for q in context.captured_queries if 'FROM "books_book"' in q['sql']])
+        self.assertEqual(response.data['total_books'], 3)
+        self.assertEqual(response.data['published_books'], 1)
+        self.assertEqual(response.data['price'], {'min': '15000.00', 'avg': '25000.00', 'max': '35000.00'})
+        english = next(row for row in response.data['breakdown'] if row['language'] == 'en')
+        self.assertEqual(english['total_books'], 2)
+        self.assertEqual(APIClient().get('/api/books/statistics/?breakdown=isbn').status_code, 400)
+
+
+class BookSearchTests(TestCase):
+    """FTS5 qidiruv: API endpoint va admin (search_fields bilan birga)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        Book.objects.create(
+            title='Clean Code', author='Robert Martin', published_date=date(2008, 8, 1),
+            isbn_number='9780132350884', pages=464, language='en', price=35000,
+        )
+        Book.objects.create(
+            title="O'tkan kunlar", author='Abdulla Qodiriy', published_date=date(1926, 1, 1),
+            isbn_number='9789943000001', pages=380, language='uz', price=15000,
+        )
+        Book.objects.create(
+            title='Código limpio', author='Robert Martin', published_date=date(2012, 1, 1),
+            isbn_number='9788441532106', pages=460, language='es', price=30000,
+        )
+
+    def admin_search(self, term):
+        model_admin = admin.site._registry[Book]
+        request = RequestFactory().get('/admin/books/book/', {'q': term})
+        queryset, _ = model_admin.get_search_results(request, Book.objects.all(), term)
+        return sorted(queryset.values_list('isbn_number', flat=True))
+
+    def test_search_endpoint_prefix_and_ranking(self):
+        response = APIClient().get('/api/books/search/?q=cod')
+        self.assertEqual(response.status_code, 200)
+        # Diakritikasiz: "Código" ham topiladi
+        self.assertEqual(
+            {book['isbn_number'] for book in response.data['results']}, {'9780132350884', '9788441532106'}
+        )
+        self.assertEqual(APIClient().get('/api/books/search/?q=').status_code, 400)
+
+    def test_admin_keeps_search_fields(self):
+        # language va ISBN qismi (icontains) - avvalgidek
+        self.assertEqual(self.admin_search('uz'), ['9789943000001'])
+        self.assertEqual(self.admin_search('0132350'), ['9780132350884'])
+        # FTS: diakritikasiz so'z
+        self.assertEqual(self.admin_search('codigo'), ['9788441532106'])
+        self.assertEqual(self.admin_search('Martin'), ['9780132350884', '9788441532106'])
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class BookRepresentationCacheTests(TestCase):
+    """Detail cache eski javobni qotirib qo'ymaydi (save() yuklash paytida bo'lsa ham)"""
+
+    def setUp(self):
+        cache.clear()
+        self.book = Book.objects.create(
+            title='Clean Code', author='Robert Martin', published_date=date(2008, 8, 1),
+            isbn_number='9780132350884', pages=464, language='en', price=35000,
+        )
+
+    def load(self, loader=None):
+        serializer_class = serializers.BookSerializer
+        return book_cache.get_representation(
+            self.book.pk, serializer_class,
+            loader or (lambda: serializer_class(Book.objects.get(pk=self.book.pk)).data),
+        )
+
+    def test_save_during_fill_does_not_pin_stale_data(self):
+        def racing_loader():
+            stale = serializers.BookSerializer(Book.objects.get(pk=self.book.pk)).data
+            # Qator o'qilgandan keyin, cache'ga yozishdan oldin parallel save()
+            fresh = Book.objects.get(pk=self.book.pk)
+            fresh.title = 'Clean Code (2nd edition)'
+            fresh.save()
+            return stale
+
+        self.assertEqual(self.load(racing_loader)['title'], 'Clean Code')
+        self.assertEqual(self.load()['title'], 'Clean Code (2nd edition)')
+        # Keyingi o'qish - cache'dan
+        self.assertEqual(self.load(lambda: self.fail('cache miss'))['title'], 'Clean Code (2nd edition)')
+
+    def test_missing_generation_is_a_miss(self):
+        self.load()
+        cache.delete(book_cache.generation_key(self.book.pk))
+        Book.objects.filter(pk=self.book.pk).update(title='Updated without signals')
+        self.assertEqual(self.load()['title'], 'Updated without signals')
+
+    def test_async_counters_flush_off_the_event_loop(self):
+        threads = []
+        flush = book_cache.counters.flush
+
+        def recording_flush():
+            threads.append(threading.get_ident())
+            flush()
+
+        async def aloader():
+            return {'id': self.book.pk}
+
+        async def read():
+            await book_cache.aget_entry(self.book.pk, serializers.BookSerializer, aloader)
+            return threading.get_ident()
+
+        with mock.patch.object(book_cache.counters, 'flush_every', 1), \
+                mock.patch.object(book_cache.counters, 'flush', recording_flush):
+            loop_thread = async_to_sync(read)()
+        self.assertEqual(len(threads), 1)
+        self.assertNotIn(loop_thread, threads)
+
+    def test_detail_endpoints_see_saved_changes(self):
+        client = APIClient()
+        for url in (f'/api/books/{self.book.pk}/', f'/api/old/books/{self.book.pk}/'):
+            self.assertEqual(client.get(url).data['title'], 'Clean Code')
+        self.book.title = 'Refactoring'
+        self.book.save()
+        for url in (f'/api/books/{self.book.pk}/', f'/api/old/books/{self.book.pk}/'):
+            with self.subTest(url=url):
+                self.assertEqual(client.get(url).data['title'], 'Refactoring')
+        pk = self.book.pk
+        self.book.delete()
+        self.assertEqual(client.get(f'/api/books/{pk}/').status_code, 404)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class ConditionalGetTests(TestCase):
+    """ETag / Last-Modified: mos kelsa 304 (serializer'siz), o'zgarishdan keyin 200"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.book = Book.objects.create(
+            title='Clean Code', author='Robert Martin', published_date=date(2008, 8, 1),
+            isbn_number='9780132350884', pages=464, language='en', price=35000,
+        )
+
+    def test_detail_etag_and_last_modified(self):
+        url = f'/api/books/{self.book.pk}/'
+        response = self.client.get(url)
+        etag, last_modified = response['ETag'], response['Last-Modified']
+        not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified['ETag'], etag)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+        # ?fields= - boshqa representation, boshqa ETag
+        self.assertEqual(self.client.get(f'{url}?fields=title', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        self.book.title = 'Clean Code (2nd edition)'
+        self.book.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_detail_304_does_not_load_representation(self):
+        url = f'/api/books/{self.book.pk}/'
+        etag = self.client.get(url)['ETag']
+        # Cache'dagi representation yo'q - 304 uchun baribir yuklanmaydi
+        cache.delete(book_cache.cache_key(self.book.pk, serializers.BookSerializer.__name__))
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(len(context.captured_queries), 0)
+        self.assertIsNone(cache.get(book_cache.cache_key(self.book.pk, serializers.BookSerializer.__name__)))
+
+    @skipUnless(msgpack is not None, "msgpack o'rnatilmagan")
+    def test_etag_depends_on_media_type(self):
+        for url in ('/api/books/', f'/api/books/{self.book.pk}/'):
+            with self.subTest(url=url):
+                json_etag = self.client.get(url, HTTP_ACCEPT='application/json')['ETag']
+                response = self.client.get(url, HTTP_ACCEPT='application/msgpack', HTTP_IF_NONE_MATCH=json_etag)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotEqual(response['ETag'], json_etag)
+                self.assertIn('Accept', response['Vary'])
+                self.assertEqual(
+                    self.client.get(url, HTTP_ACCEPT='application/msgpack', HTTP_IF_NONE_MATCH=response['ETag']).status_code,
+                    304,
+                )
+
+    def test_list_etag_changes_on_save_and_delete(self):
+        etag = self.client.get('/api/books/')['ETag']
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/books/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        # Ro'yxat qatorlari o'qilmaydi - faqat versiya va MAX(updated_at)
+        self.assertFalse([q for q in context.captured_queries if 'FROM "books_book" ' in q['sql'] and 'LIMIT' in q['sql']])
+
+        self.book.price = 36000
+        self.book.save()
+        response = self.client.get('/api/books/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        self.book.delete()
+        self.assertEqual(self.client.get('/api/books/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class DeltaSyncTests(TestCase):
+    """/api/books/changes/: upsert'lar va o'chirishlar (tombstone) versiya tartibida"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.books = [
+            Book.objects.create(
+                title=f'Book {i}', author='Author', published_date=date(2020, 1, 1),
+                isbn_number=f'978000000{i:04d}', pages=100, language='en', price=20000,
+            )
+            for i in range(3)
+        ]
+
+    def test_changes_include_tombstones_in_version_order(self):
+        since = self.books[0].change_version
+        deleted_pk = self.books[1].pk
+        self.books[1].delete()
+        self.books[2].price = 21000
+        self.books[2].save()
+
+        response = self.client.get('/api/books/changes/', {'since': since})
+        self.assertEqual(response.status_code, 200)
+        results = response.data['results']
+        self.assertEqual([(r['op'], r['id']) for r in results], [('delete', deleted_pk), ('upsert', self.books[2].pk)])
+        self.assertEqual(results[0]['isbn_number'], '9780000000001')
+        versions = [r['version'] for r in results]
+        self.assertEqual(versions, sorted(versions))
+        self.assertEqual(response.data['next_since'], versions[-1])
+        self.assertFalse(response.data['has_more'])
+
+        # Mirror oxirgi versiyadan davom etsa - bo'sh
+        response = self.client.get('/api/books/changes/', {'since': versions[-1]})
+        self.assertEqual(response.data['results'], [])
+
+    def test_changes_pagination(self):
+        self.books[0].delete()
+        response = self.client.get('/api/books/changes/', {'since': 0, 'limit': 2})
+        self.assertTrue(response.data['has_more'])
+        self.assertEqual(len(response.data['results']), 2)
+        response = self.client.get('/api/books/changes/', {'since': response.data['next_since'], 'limit': 2})
+        self.assertFalse(response.data['has_more'])
+        self.assertEqual([r['op'] for r in response.data['results']], ['delete'])
+
+    def test_changes_rejects_bad_since(self):
+        self.assertEqual(self.client.get('/api/books/changes/', {'since': 'x'}).status_code, 400)
+
+    def test_migration_numbers_existing_books_in_one_update(self):
+        migration = importlib.import_module('books.migrations.0010_book_change_version')
+        Book.objects.update(change_version=0)
+        BookChangeCounter.objects.all().delete()
+        with CaptureQueriesContext(connection) as context:
+            migration.number_existing_books(django_apps, None)
+        self.assertEqual(len([q for q in context.captured_queries if q['sql'].startswith('UPDATE')]), 1)
+        for book in Book.objects.all():
+            self.assertEqual(book.change_version, book.pk)
+        self.assertEqual(BookChangeCounter.objects.get(pk=1).value, max(b.pk for b in self.books))
+        # Keyingi saqlash mavjud versiyalardan kattaroq versiya oladi
+        self.books[0].save()
+        self.assertGreater(self.books[0].change_version, max(b.pk for b in self.books))
+
+
+class BulkCreateTests(TestCase):
+    """books/bulk.py: juftliklar bo'laklanishi va batch'dagi qisman to'qnashuv"""
+
+    AUTHORS = ['Anna Karimova', 'Bobur Aliyev', 'Dilnoza Rahimova']
+
+    def record(self, i, **extra):
+        return {
+            'title': f'Bulk Book {i}', 'subtitle': 'Subtitle', 'author': self.AUTHORS[i],
+            'publisher': 'Publisher', 'published_date': '2020-01-01',
+            'isbn_number': f'978100000{i:04d}', 'pages': 120, 'language': 'en',
+            'price': '20000.00', **extra,
+        }
+
+    def test_title_author_pairs_are_chunked_together(self):
+        Book.objects.create(
+            title='Bulk Book 1', author='Author 2', published_date=date(2020, 1, 1),
+            isbn_number='9781999999999', pages=100, language='en', price=20000,
+        )
+        pairs = {(f'Bulk Book {i}', f'Author {i}') for i in range(600)}
+        with CaptureQueriesContext(connection) as context:
+            found = bulk._existing_title_author(pairs)
+        # 600 juftlik * 2 parametr, har so'rovda <= IN_CHUNK_SIZE parametr
+        self.assertEqual(len(context.captured_queries), 3)
+        # (Bulk Book 1, Author 2) so'ralmagan - titles x authors kesishmasi emas
+        self.assertEqual(found, {})
+        self.assertEqual(
+            bulk._existing_title_author({('Bulk Book 1', 'Author 2')}),
+            {('Bulk Book 1', 'Author 2'): {'9781999999999'}},
+        )
+
+    def test_integrity_error_only_fails_conflicting_items(self):
+        valid, errors = bulk.validate_batch([self.record(i) for i in range(3)])
+        self.assertEqual(errors, {})
+        # Validation'dan keyin parallel so'rov ISBN'ni band qiladi
+        Book.objects.create(
+            title='Concurrent', author='Someone', published_date=date(2020, 1, 1),
+            isbn_number='9781000000001', pages=100, language='en', price=20000,
+        )
+        created, conflicts = bulk.create_books(valid)
+        self.assertEqual([index for index, _ in created], [0, 2])
+        self.assertEqual(list(conflicts), [1])
+        self.assertEqual(
+            set(Book.objects.values_list('isbn_number', flat=True)),
+            {'9781000000000', '9781000000001', '9781000000002'},
+        )
+        self.assertEqual(statistics.verify(), [])
+
+    def test_bulk_endpoint_reports_errors_per_item(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user('bulk-writer', password='x'))
+        records = [self.record(0), self.record(1, price='-1'), self.record(2, isbn_number='9781000000000')]
+        response = client.post('/api/books/bulk/', records, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([item['index'] for item in response.data['created']], [0])
+        self.assertEqual([item['index'] for item in response.data['errors']], [1, 2])
+
+
+class ImportBooksTests(TestCase):
+    """import_books: NDJSON/CSV oqimi, upsert, rad etilganlar va checkpoint'dan davom etish"""
+
+    AUTHORS = ['Anna Karimova', 'Bobur Aliyev', 'Dilnoza Rahimova', 'Jasur Tursunov']
+
+    def setUp(self):
+        cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def record(self, i, **extra):
+        return {
+            'title': f'Imported Book {i}', 'author': self.AUTHORS[i], 'published_date': '2021-05-01',
+            'isbn_number': f'978200000{i:04d}', 'pages': 150, 'language': 'en', 'price': '30000.00',
+            **extra,
+        }
+
+    def write_ndjson(self, name, lines):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w', encoding='utf-8') as feed:
+            feed.write(''.join(line + '\n' for line in lines))
+        return path
+
+    def run_import(self, path, *args):
+        call_command('import_books', path, *args, stdout=StringIO())
+
+    def read_rejects(self, path):
+        with open(f'{path}.rejects.ndjson', encoding='utf-8') as rejects:
+            return [json.loads(line) for line in rejects]
+
+    def test_ndjson_import_upserts_and_writes_rejects(self):
+        Book.objects.create(
+            title='Imported Book 0', author='Anna Karimova', published_date=date(2021, 5, 1),
+            isbn_number='9782000000000', pages=100, language='en', price=20000,
+        )
+        path = self.write_ndjson('feed.ndjson', [
+            json.dumps(self.record(0, pages=200)),
+            '{not json',
+            json.dumps(self.record(1, price='-5')),
+            '',
+            json.dumps(self.record(2)),
+        ])
+        self.run_import(path, '--batch-size', '2')
+
+        self.assertEqual(Book.objects.count(), 2)
+        self.assertEqual(Book.objects.get(isbn_number='9782000000000').pages, 200)
+        self.assertTrue(Book.objects.filter(isbn_number='9782000000002').exists())
+        rejects = self.read_rejects(path)
+        self.assertEqual(len(rejects), 2)
+        self.assertIsNone(rejects[0]['record'])
+        self.assertIn('price', rejects[1]['errors'])
+        self.assertFalse(os.path.exists(f'{path}.checkpoint'))
+        self.assertEqual(statistics.verify(), [])
+
+    def test_gzipped_csv_with_multiline_values(self):
+        path = os.path.join(self.directory, 'feed.csv.gz')
+        with gzip.open(path, 'wt', encoding='utf-8', newline='') as feed:
+            writer = csv.writer(feed)
+            writer.writerow(['title', 'subtitle', 'author', 'published_date', 'isbn_number', 'pages', 'language', 'price'])
+            for i in range(3):
+                record = self.record(i, subtitle='' if i else 'Birinchi qator\nikkinchi qator')
+                writer.writerow([record[name] for name in (
+                    'title', 'subtitle', 'author', 'published_date', 'isbn_number', 'pages', 'language', 'price',
+                )])
+        self.run_import(path, '--batch-size', '2')
+
+        self.assertEqual(Book.objects.count(), 3)
+        self.assertEqual(Book.objects.get(isbn_number='9782000000000').subtitle, 'Birinchi qator\nikkinchi qator')
+        self.assertEqual(self.read_rejects(path), [])
+
+    def test_resumes_from_checkpoint(self):
+        path = self.write_ndjson('feed.ndjson', [
+            json.dumps(self.record(0)),
+            json.dumps(self.record(1, price='-5')),
+            json.dumps(self.record(2)),
+            json.dumps(self.record(3)),
+        ])
+        upsert_books = bulk.upsert_books
+        calls = []
+
+        def interrupted(items, *args, **kwargs):
+            calls.append(items)
+            if len(calls) == 2:
+                raise KeyboardInterrupt
+            return upsert_books(items, *args, **kwargs)
+
+        with mock.patch.object(bulk, 'upsert_books', interrupted), self.assertRaises(KeyboardInterrupt):
+            self.run_import(path, '--batch-size', '2')
+        self.assertEqual(Book.objects.count(), 1)
+        with open(f'{path}.checkpoint', encoding='utf-8') as checkpoint:
+            state = json.load(checkpoint)
+        self.assertEqual((state['imported'], state['rejected']), (1, 1))
+
+        self.run_import(path, '--batch-size', '2')
+        self.assertEqual(
+            set(Book.objects.values_list('isbn_number', flat=True)),
+            {'9782000000000', '9782000000002', '9782000000003'},
+        )
+        # Rad etilgan qator davom ettirilganda qayta yozilmaydi
+        self.assertEqual(len(self.read_rejects(path)), 1)
+        self.assertFalse(os.path.exists(f'{path}.checkpoint'))
+
+    def test_rejects_after_checkpoint_are_not_duplicated(self):
+        path = self.write_ndjson('feed.ndjson', [
+            json.dumps(self.record(0)),
+            json.dumps(self.record(1)),
+            json.dumps(self.record(2, price='-5')),
+            json.dumps(self.record(3)),
+        ])
+        save_checkpoint = Command.save_checkpoint
+        calls = []
+
+        def killed(command, state):
+            calls.append(state)
+            if len(calls) == 2:
+                # Rad etilganlar yozildi, checkpoint esa yo'q
+                raise KeyboardInterrupt
+            return save_checkpoint(command, state)
+
+        with mock.patch.object(Command, 'save_checkpoint', killed), self.assertRaises(KeyboardInterrupt):
+            self.run_import(path, '--batch-size', '2')
+        self.assertEqual(len(self.read_rejects(path)), 1)
+
+        self.run_import(path, '--batch-size', '2')
+        self.assertEqual(len(self.read_rejects(path)), 1)
+        self.assertEqual(Book.objects.count(), 3)
+
+    def test_resume_rebuilds_statistics_of_killed_run(self):
+        path = self.write_ndjson('feed.ndjson', [
+            json.dumps(self.record(0)),
+            json.dumps(self.record(1)),
+            json.dumps(self.record(2, price='-5')),
+        ])
+        save_checkpoint = Command.save_checkpoint
+        calls = []
+
+        def killed(command, state):
+            calls.append(state)
+            if len(calls) == 2:
+                raise KeyboardInterrupt
+            return save_checkpoint(command, state)
+
+        # Jarayon o'ldirildi: finally'dagi rebuild ishlamadi
+        with mock.patch.object(Command, 'save_checkpoint', killed), \
+                mock.patch.object(statistics, 'rebuild'), self.assertRaises(KeyboardInterrupt):
+            self.run_import(path, '--batch-size', '2')
+        self.assertNotEqual(statistics.verify(), [])
+
+        # Qolgan qatorlar faqat rad etiladi - baribir statistika tiklanadi
+        self.run_import(path, '--batch-size', '2')
+        self.assertEqual(statistics.verify(), [])
+
+    def test_upsert_invalidation_is_chunked(self):
+        count = bulk.IN_CHUNK_SIZE + 100
+        items = [
+            (i, {
+                'title': f'Chunked {i}', 'author': 'Anna Karimova', 'published_date': date(2021, 5, 1),
+                'isbn_number': f'97840000{i:05d}', 'pages': 150, 'language': 'en', 'price': 30000,
+            })
+            for i in range(count)
+        ]
+        with CaptureQueriesContext(connection) as context:
+            bulk.upsert_books(items, batch_size=count)
+        lookups = [q['sql'] for q in context.captured_queries if q['sql'].startswith('SELECT') and '"isbn_number" IN' in q['sql']]
+        self.assertEqual(len(lookups), 2)
+        self.assertEqual(Book.objects.count(), count)
+
+    def test_changed_file_requires_restart(self):
+        path = self.write_ndjson('feed.ndjson', [json.dumps(self.record(0))])
+        with open(f'{path}.checkpoint', 'w', encoding='utf-8') as checkpoint:
+            json.dump({'offset': 1, 'imported': 0, 'rejected': 0, 'size': 1, 'mtime': 0}, checkpoint)
+        with self.assertRaises(CommandError):
+            self.run_import(path)
+        self.run_import(path, '--restart')
+        self.assertTrue(Book.objects.filter(isbn_number='9782000000000').exists())
+
+
+class FastRepresentationTests(TestCase):
+    """
+    Tezkor o'qish yo'li (books/representation.py) serializer.data bilan
+    baytma-bayt bir xil JSON berishi kerak
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        Book.objects.create(
+            title='Clean Code', author='Robert Martin', published_date=date(2008, 8, 1),
+            isbn_number='9780132350884', pages=464, language='en', price='35000.5',
+            cover_image='https://example.com/clean-code.jpg', published=True,
+        )
+        Book.objects.create(
+            title="O'tkan Kunlar", subtitle='Roman \u2028 "birinchi"', author='Abdulla Qodiriy',
+            published_date=date(1926, 1, 1), isbn_number='9789943000001', pages=380,
+            language='uz', price=15000,
+        )
+
+    def serializer_classes(self):
+        for name in dir(serializers):
+            value = getattr(serializers, name)
+            if (isinstance(value, type) and issubclass(value, serializers.serializers.ModelSerializer)
+                    and getattr(getattr(value, 'Meta', None), 'model', None) is Book):
+                yield value
+
+    def assertSameJSON(self, serializer_class):
+        queryset = Book.objects.order_by('pk')
+        fast = representation.for_serializer(serializer_class)
+        self.assertIsNotNone(fast, serializer_class)
+        self.assertEqual(
+            JSONRenderer().render(serializer_class(queryset, many=True).data),
+            JSONRenderer().render(fast.convert(fast.values(queryset))),
+        )
+
+    def test_all_book_serializers(self):
+        for serializer_class in self.serializer_classes():
+            with self.subTest(serializer=serializer_class.__name__):
+                self.assertSameJSON(serializer_class)
+
+    @override_settings(TIME_ZONE='Asia/Tashkent')
+    def test_non_utc_timezone(self):
+        self.assertSameJSON(serializers.BookSerializer)
+
+    def test_custom_to_representation_falls_back(self):
+        class Custom(serializers.BookSerializer):
+            def to_representation(self, instance):
+                return {'id': instance.pk}
+
+        self.assertIsNone(representation.for_serializer(Custom))
+
+    def test_list_endpoints(self):
+        client = APIClient()
+        for url in ('/api/books/', '/api/books/published/', '/api/old/books/'):
+            with self.subTest(url=url):
+                response = client.get(url)
+                self.assertEqual(response.status_code, 200)
+                results = response.data['results'] if 'results' in response.data else response.data
+                self.assertEqual(len(results), Book.objects.filter(
+                    **({'published': True} if 'published' in url else {})
+                ).count())
+
+
+class SparseFieldsetTests(TestCase):
+    """?fields= / ?exclude= javobni ham, SELECT ustunlarini ham toraytiradi"""
+
+    @classmethod
+    def setUpTestData(cls):
+        Book.objects.create(
+            title='Clean Code', author='Robert Martin', published_date=date(2008, 8, 1),
+            isbn_number='9780132350884', pages=464, language='en', price=35000,
+            cover_image='https://example.com/clean-code.jpg', published=True,
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_fields_narrow_response_and_select(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/books/?fields=id,title,author,cover_image')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.data['results'][0]), ['id', 'title', 'author', 'cover_image'])
+        select = next(
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT "books_book"."id" AS "id"')
+        )
+        self.assertNotIn('"price"', select)
+        self.assertNotIn('"subtitle"', select)
+
+    def test_exclude_and_legacy_views(self):
+        response = self.client.get('/api/old/books/?exclude=subtitle,pages')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('subtitle', response.data['results'][0])
+        self.assertIn('title', response.data['results'][0])
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get('/api/books/?fields=id,password')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('fields', response.data)
+
+
+class RendererTests(TestCase):
+    """FastJSONRenderer JSONRenderer bilan bir xil bayt; MessagePack Accept orqali"""
+
+    @classmethod
+    def setUpTestData(cls):
+        Book.objects.create(
+            title='Clean Code', subtitle='Line\u2028separator', author='Robert Martin',
+            published_date=date(2008, 8, 1), isbn_number='9780132350884', pages=464,
+            language='en', price='35000.5',
+        )
+
+    def test_fast_json_matches_stock_renderer(self):
+        data = serializers.BookSerializer(Book.objects.all(), many=True).data
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    @skipUnless(msgpack, 'msgpack o\'rnatilmagan')
+    def test_msgpack_negotiation(self):
+        response = APIClient().get('/api/books/?fields=price,published_date', HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(
+            msgpack.unpackb(response.content)['results'],
+            [{'price': '35000.50', 'published_date': '2008-08-01'}],
+        )
+
+
+class BrowsableAPINegotiationTests(TestCase):
+    """
+    Brauzer Accept sarlavhasi bilan kelgan oddiy so'rovlar HTML emas,
+    JSON yo'lidan o'tishi kerak (qo'shimcha so'rov va shablonsiz)
+    """
+    BROWSER_ACCEPT = 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8'
+
+    @classmethod
+    def setUpTestData(cls):
+        for number in range(20):
+            Book.objects.create(
+                title=f'Book Number {number}', author='Test Author', published_date=date(2020, 1, 1),
+                isbn_number=f'978000000{number:04d}', pages=100, language='en', price=20000,
+            )
+
+    def timed_get(self, client, url, **headers):
+        start = time.perf_counter()
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, **headers)
+        return response, len(queries), time.perf_counter() - start
+
+    def test_browser_request_gets_json_fast_path(self):
+        client = APIClient()
+        json_response, json_queries, _ = self.timed_get(client, '/api/books/')
+        response, queries, elapsed = self.timed_get(client, '/api/books/', HTTP_ACCEPT=self.BROWSER_ACCEPT)
+
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.content, json_response.content)
+        self.assertEqual(queries, json_queries)
+        self.assertLess(elapsed, 0.5)
+
+    def test_staff_session_gets_browsable_api(self):
+        client = APIClient()
+        client.force_login(User.objects.create_user('staff', password='x', is_staff=True))
+        response = client.get('/api/books/', HTTP_ACCEPT=self.BROWSER_ACCEPT)
+        self.assertTrue(response['Content-Type'].startswith('text/html'))
+
+    @override_settings(BROWSABLE_API_HOSTS=['debug.testserver'], ALLOWED_HOSTS=['*'])
+    def test_debug_host_gets_browsable_api(self):
+        response = APIClient().get('/api/books/', HTTP_ACCEPT=self.BROWSER_ACCEPT, HTTP_HOST='debug.testserver')
+        self.assertTrue(response['Content-Type'].startswith('text/html'))
+
+
+class CompressionMiddlewareTests(TestCase):
+    """Katta JSON javoblar siqiladi, kichiklari va allaqachon siqilganlari - yo'q"""
+
+    @classmethod
+    def setUpTestData(cls):
+        for number in range(30):
+            Book.objects.create(
+                title=f'Book Number {number}', author='Test Author', published_date=date(2020, 1, 1),
+                isbn_number=f'978000000{number:04d}', pages=100, language='en', price=20000,
+            )
+
+    def test_large_json_is_gzipped(self):
+        response = self.client.get('/api/old/books/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(json.loads(gzip.decompress(response.content))['count'], 30)
+
+    def test_streaming_response_is_compressed(self):
+        response = self.client.get('/api/books/export/?format=ndjson', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        lines = gzip.decompress(b''.join(response.streaming_content)).splitlines()
+        self.assertEqual(len(lines), 30)
+
+    def test_large_and_brotli_responses_are_compressed_in_a_thread(self):
+        middleware = CompressionMiddleware(lambda request: None)
+        factory = RequestFactory()
+        gzip_request = factory.get('/', HTTP_ACCEPT_ENCODING='gzip')
+        small = HttpResponse(b'x' * 2048, content_type='application/json')
+        large = HttpResponse(b'x' * (middleware.inline_max_size + 1), content_type='application/json')
+        self.assertFalse(middleware.response_blocks(gzip_request, small))
+        self.assertTrue(middleware.response_blocks(gzip_request, large))
+        self.assertFalse(middleware.response_blocks(factory.get('/'), large))
+        if brotli is not None:
+            self.assertTrue(middleware.response_blocks(factory.get('/', HTTP_ACCEPT_ENCODING='br'), small))
+        # Oqim bo'laklari siqish paytida thread'da (compress_async_iterator)
+        self.assertFalse(middleware.response_blocks(gzip_request, StreamingHttpResponse(iter([b'x']))))
+
+    def test_small_response_and_identity(self):
+        book = Book.objects.first()
+        response = self.client.get(f'/api/books/{book.pk}/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        response = self.client.get('/api/old/books/', HTTP_ACCEPT_ENCODING='gzip;q=0')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class AsyncBookViewSetTests(TestCase):
+    """ASGI profili: AsyncBookViewSet javoblari BookViewSet bilan baytma-bayt bir xil"""
+
+    @classmethod
+    def setUpTestData(cls):
+        for number in range(25):
+            Book.objects.create(
+                title=f'Async Book {number}', author='Test Author', published_date=date(2000 + number % 3, 1, 1),
+                isbn_number=f'978100000{number:04d}', pages=100, language=('en', 'uz')[number % 2],
+                price=20000 + number, published=bool(number % 2),
+            )
+
+    def get_async(self, url, **extra):
+        with override_settings(ROOT_URLCONF='books.tests'):
+            return async_to_sync(self.async_client.get)(url, **extra)
+
+    def test_same_responses_as_sync_viewset(self):
+        book = Book.objects.order_by('pk').first()
+        urls = (
+            '/api/books/', '/api/books/?page=3', '/api/books/?page=last', '/api/books/?page=9',
+            '/api/books/?fields=id,title&page_size=5', '/api/books/?pagination=cursor',
+            f'/api/books/{book.pk}/', f'/api/books/{book.pk}/?fields=title', '/api/books/0/',
+            '/api/books/statistics/', '/api/books/statistics/?breakdown=language,year',
+            '/api/books/statistics/?breakdown=isbn', '/api/books/published/',
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                # Avval async: detail cache'ni aget_object() to'ldiradi
+                response = self.get_async(url)
+                expected = self.client.get(url)
+                self.assertEqual(response.status_code, expected.status_code)
+                self.assertEqual(response.content, expected.content)
+                self.assertEqual(response.get('ETag'), expected.get('ETag'))
+
+    def test_not_modified_and_compression(self):
+        etag = self.get_async('/api/books/')['ETag']
+        self.assertEqual(self.get_async('/api/books/', headers={'If-None-Match': etag}).status_code, 304)
+        book = Book.objects.order_by('pk').first()
+        etag = self.get_async(f'/api/books/{book.pk}/')['ETag']
+        cache.delete(book_cache.cache_key(book.pk, serializers.BookSerializer.__name__))
+        with CaptureQueriesContext(connection) as context:
+            response = self.get_async(f'/api/books/{book.pk}/', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(len(context.captured_queries), 0)
+        response = self.get_async('/api/books/?page_size=25', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(response.content))['count'], 25)
+
+    def test_streaming_is_incremental_under_asgi(self):
+        converted = []
+        convert = representation.BookRepresentation.convert
+
+        def counting_convert(rep, rows):
+            converted.append(len(rows))
+            return convert(rep, rows)
+
+        async def read(url, **extra):
+            response = await self.async_client.get(url, **extra)
+            chunks = aiter(response.streaming_content)
+            # Konvert sarlavhasi + birinchi bo'lak
+            first = [await anext(chunks), await anext(chunks)]
+            seen = sum(converted)
+            return response, seen, b''.join(first + [chunk async for chunk in chunks])
+
+        with mock.patch.object(representation.BookRepresentation, 'convert', counting_convert), \
+                mock.patch('books.views.LegacyBookListMixin.stream_chunk_size', 5):
+            response, seen, body = async_to_sync(read)('/api/old/books/?stream=true')
+        self.assertTrue(response.is_async)
+        # Birinchi bo'lak queryset oxirigacha o'qilishidan oldin keldi
+        self.assertEqual(seen, 5)
+        self.assertEqual(json.loads(body)['count'], 25)
+        self.assertEqual(len(json.loads(body)['results']), 25)
+
+        with override_settings(ROOT_URLCONF='books.tests'):
+            response = async_to_sync(self.async_client.get)(
+                '/api/books/export/?format=ndjson', headers={'Accept-Encoding': 'gzip'},
+            )
+
+            async def collect():
+                return b''.join([chunk async for chunk in response.streaming_content])
+
+            body = async_to_sync(collect)()
+        self.assertTrue(response.is_async)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(len(gzip.decompress(body).splitlines()), 25)
+
+    def test_session_is_saved_under_asgi(self):
+        User.objects.create_user('async-reader', password='reader-pass-123')
+        login = async_to_sync(self.async_client.post)(
+            '/api/accounts/session/login/',
+            {'username': 'async-reader', 'password': 'reader-pass-123'},
+            content_type='application/json',
+        )
+        self.assertEqual(login.status_code, 200)
+        response = async_to_sync(self.async_client.get)('/api/accounts/session/me/')
+        self.assertEqual(response.status_code, 200)
+
+
+class ReadOnlyRoutingTests(SimpleTestCase):
+    """
+    ReadOnlyRouter / ReadOnlyDatabaseMiddleware har qanday profilda: readonly
+    alias soxta (ulanish ochilmaydi), xavfsiz metodlardagi o'qishlar unga,
+    yozishlar va boshqa metodlar - default'ga
+    """
+
+    def setUp(self):
+        # basic profilda readonly alias yo'q - routing uchun soxta alias yetarli
+        fake_alias = mock.patch.dict(connections.settings, {db.READ_ALIAS: {'NAME': ':memory:'}})
+        fake_alias.start()
+        self.addCleanup(fake_alias.stop)
+        # Testlarda readonly - default'ning mirror'i; routing'ni tekshirish uchun o'chiramiz
+        patcher = mock.patch('library_project.db.is_test_mirror', return_value=False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def route(self, method, asynchronous=False):
+        """So'rov ichida router tanlagan (o'qish, yozish) aliaslari"""
+        router = db.ReadOnlyRouter()
+
+        def get_response(request):
+            return router.db_for_read(Book), router.db_for_write(Book)
+
+        async def aget_response(request):
+            return get_response(request)
+
+        request = RequestFactory().generic(method, '/api/books/')
+        if asynchronous:
+            return async_to_sync(ReadOnlyDatabaseMiddleware(aget_response))(request)
+        return ReadOnlyDatabaseMiddleware(get_response)(request)
+
+    def test_middleware_routes_safe_methods(self):
+        for asynchronous in (False, True):
+            for method in ('GET', 'HEAD', 'OPTIONS'):
+                with self.subTest(asynchronous=asynchronous, method=method):
+                    self.assertEqual(self.route(method, asynchronous), (db.READ_ALIAS, DEFAULT_DB_ALIAS))
+            for method in ('POST', 'PUT', 'PATCH', 'DELETE'):
+                with self.subTest(asynchronous=asynchronous, method=method):
+                    self.assertEqual(self.route(method, asynchronous), (DEFAULT_DB_ALIAS, DEFAULT_DB_ALIAS))
+        # So'rovdan keyin (management buyruqlar, signal'lar) - default
+        self.assertEqual(db.read_alias(), DEFAULT_DB_ALIAS)
+
+    def test_router(self):
+        router = db.ReadOnlyRouter()
+        self.assertEqual(router.db_for_read(Book), DEFAULT_DB_ALIAS)
+        with db.read_only():
+            self.assertEqual(router.db_for_read(Book), db.READ_ALIAS)
+            self.assertEqual(router.db_for_write(Book), DEFAULT_DB_ALIAS)
+            # Ochiq tranzaksiya o'z yozuvlarini ko'rishi kerak
+            with mock.patch.object(connections[DEFAULT_DB_ALIAS], 'in_atomic_block', True):
+                self.assertEqual(router.db_for_read(Book), DEFAULT_DB_ALIAS)
+        self.assertFalse(router.allow_migrate(db.READ_ALIAS, 'books'))
+        self.assertIsNone(router.allow_migrate(DEFAULT_DB_ALIAS, 'books'))
+
+    def test_readonly_alias_missing_falls_back_to_default(self):
+        with mock.patch.dict(connections.settings), db.read_only():
+            del connections.settings[db.READ_ALIAS]
+            self.assertEqual(db.ReadOnlyRouter().db_for_read(Book), DEFAULT_DB_ALIAS)
+
+
+@skipUnless(db.READ_ALIAS in settings.DATABASES, 'SQLITE_PROFILE=production uchun')
+class ReadOnlyDatabaseTests(SimpleTestCase):
+    """readonly ulanish (SQLITE_PROFILE=production) yozishlarni rad etadi"""
+
+    def test_readonly_connection_rejects_writes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            name = os.path.join(directory, 'db.sqlite3')
+            setup = sqlite3.connect(name)
+            setup.execute('CREATE TABLE item (id INTEGER PRIMARY KEY)')
+            setup.close()
+            wrappers = [
+                DatabaseWrapper({**settings.DATABASES[alias], 'NAME': name}, alias=f'{alias}-check')
+                for alias in (DEFAULT_DB_ALIAS, db.READ_ALIAS)
+            ]
+            try:
+                writer, reader = (wrapper.cursor() for wrapper in wrappers)
+                writer.execute('PRAGMA journal_mode')
+                self.assertEqual(writer.fetchone()[0], 'wal')
+                writer.execute('INSERT INTO item (id) VALUES (1)')
+                reader.execute('SELECT COUNT(*) FROM item')
+                self.assertEqual(reader.fetchone()[0], 1)
+                with self.assertRaises(OperationalError):
+                    reader.execute('INSERT INTO item (id) VALUES (2)')
+            finally:
+                for wrapper in wrappers:
+                    wrapper.close()
+
+
+class SQLiteCacheTests(SimpleTestCase):
+    """library_project.cache.SQLiteCache: LRU vaqti get/get_many/aget'da yangilanadi"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache = SQLiteCache(
+            os.path.join(directory.name, 'cache.sqlite3'), {'OPTIONS': {'MAX_ENTRIES': 3, 'CULL_FREQUENCY': 100}},
+        )
+        self.cache.touch_resolution = 0
+        for key in ('hot', 'cold', 'warm'):
+            self.cache.set(key, key)
+
+    def accessed(self, key):
+        return self.cache._connection().execute(
+            'SELECT accessed FROM cache_entries WHERE key = ?', (self.cache.make_key(key),)
+        ).fetchone()[0]
+
+    def test_get_many_keeps_hot_keys(self):
+        self.assertEqual(self.cache.get_many(['hot', 'missing']), {'hot': 'hot'})
+        self.cache.set('new', 'new')
+        self.cache.cull()
+        # Eng eski o'qilgan/yozilgan - 'cold'
+        self.assertEqual(self.cache.get_many(['hot', 'cold', 'warm', 'new']), {'hot': 'hot', 'warm': 'warm', 'new': 'new'})
+
+    def test_async_read_touches_off_the_event_loop(self):
+        before = self.accessed('hot')
+        threads = []
+        touch = self.cache._touch
+
+        def recording_touch(keys):
+            threads.append(threading.get_ident())
+            touch(keys)
+
+        async def read():
+            return await self.cache.aget('hot'), threading.get_ident()
+
+        with mock.patch.object(self.cache, '_touch', recording_touch):
+            value, loop_thread = async_to_sync(read)()
+            deadline = time.monotonic() + 5
+            while self.accessed('hot') == before and time.monotonic() < deadline:
+                time.sleep(0.01)
+        self.assertEqual(value, 'hot')
+        self.assertGreater(self.accessed('hot'), before)
+        self.assertNotIn(loop_thread, threads)
+
+    def test_async_first_connection_is_opened_off_the_event_loop(self):
+        fresh = SQLiteCache(self.cache._path, {})
+        threads = []
+        open_connection = fresh._open
+
+        def recording_open():
+            threads.append(threading.get_ident())
+            return open_connection()
+
+        async def read():
+            return await fresh.aget('hot'), await fresh.aget('cold'), threading.get_ident()
+
+        def in_new_thread():
+            # Yangi thread - bu fayl uchun ulanish hali yo'q
+            with mock.patch.object(fresh, '_open', recording_open):
+                result.extend(async_to_sync(read)())
+
+        result = []
+        worker = threading.Thread(target=in_new_thread)
+        worker.start()
+        worker.join()
+        self.assertEqual(result[:2], ['hot', 'cold'])
+        self.assertEqual(len(threads), 1)
+        self.assertNotIn(result[2], threads)
+
+    def test_max_entries_none_only_expires(self):
+        unbounded = SQLiteCache(self.cache._path + '.unbounded', {'OPTIONS': {'MAX_ENTRIES': None}})
+        for i in range(5):
+            unbounded.set(f'key:{i}', i)
+        unbounded.set('expired', 1, timeout=-1)
+        unbounded.cull()
+        self.assertEqual(len(unbounded.get_many([f'key:{i}' for i in range(5)])), 5)
+        self.assertEqual(unbounded._connection().execute('SELECT COUNT(*) FROM cache_entries').fetchone()[0], 5)
+
+    def test_suite_uses_temporary_cache_files(self):
+        # TemporaryCacheRunner: BASE_DIR/cache.sqlite3 va revocations.sqlite3 ga yozilmaydi
+        for alias, options in settings.CACHES.items():
+            with self.subTest(alias=alias):
+                self.assertNotEqual(os.path.dirname(options['LOCATION']), str(settings.BASE_DIR))
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
@@ -20,6 +21,7 @@ from .views import (
 
     # ViewSet (Lesson 15 - NEW!)
     BookViewSet,
+    AsyncBookViewSet,
 )
 
 # ========================
@@ -29,7 +31,10 @@ router = DefaultRouter()
 
 # ViewSet'ni router'ga ro'yxatdan o'tkazamiz
 # URL: /api/books/ (ViewSet)
-router.register(r'books', BookViewSet, basename='book')
+# ASGI profilida (settings.ASYNC_VIEWS) list/retrieve/statistics - async
+router.register(
+    r'books', AsyncBookViewSet if settings.ASYNC_VIEWS else BookViewSet, basename='book'
+)
 
 # Router generates these URLs automatically:
 # GET    /api/books/                    -> list
@@ -40,6 +45,11 @@ router.register(r'books', BookViewSet, basename='book')
 # DELETE /api/books/{id}/               -> destroy
 # GET    /api/books/published/          -> custom action
 # GET    /api/books/statistics/         -> custom action
+# GET    /api/books/search/?q=          -> custom action
+# GET    /api/books/cache-stats/        -> custom action (admin)
+# GET    /api/books/changes/?since=N    -> custom action (delta sync)
+# POST   /api/books/bulk/               -> custom action (paketli yaratish)
+# GET    /api/books/export/?format=csv  -> custom action (NDJSON/CSV eksport)
 # POST   /api/books/{id}/publish/       -> custom action
 # POST   /api/books/{id}/unpublish/     -> custom action
 
@@ -102,13 +112,20 @@ URL STRUCTURE:
 PRIMARY (Lesson 15 - ViewSet):
 -------------------------------
 GET    /api/books/                     -> BookViewSet.list()
+GET    /api/books/?pagination=cursor   -> BookViewSet.list() (keyset pagination)
+GET    /api/books/?fields=id,title     -> BookViewSet.list() (sparse fieldset, ?exclude= ham)
 POST   /api/books/                     -> BookViewSet.create()
 GET    /api/books/{id}/                -> BookViewSet.retrieve()
 PUT    /api/books/{id}/                -> BookViewSet.update()
 PATCH  /api/books/{id}/                -> BookViewSet.partial_update()
 DELETE /api/books/{id}/                -> BookViewSet.destroy()
 GET    /api/books/published/           -> BookViewSet.published()
-GET    /api/books/statistics/          -> BookViewSet.statistics()
+GET    /api/books/statistics/          -> BookViewSet.statistics() (?breakdown=language,year)
+GET    /api/books/search/?q=           -> BookViewSet.search() (FTS5)
+GET    /api/books/cache-stats/         -> BookViewSet.cache_stats() (admin)
+GET    /api/books/changes/?since=N     -> BookViewSet.changes() (delta sync)
+POST   /api/books/bulk/                -> BookViewSet.bulk() (paketli yaratish)
+GET    /api/books/export/?format=csv   -> BookViewSet.export() (NDJSON/CSV, gzip)
 POST   /api/books/{id}/publish/        -> BookViewSet.publish()
 POST   /api/books/{id}/unpublish/      -> BookViewSet.unpublish()
 
@@ -121,6 +138,11 @@ GET    /api/old/builtin-validators/    -> Built-in validators example
 GET    /api/old/books/                 -> Old APIView list
 GET    /api/old/books/{id}/            -> Old APIView detail
 
+Eski ro'yxat endpoint'lari (old/ va homework/) qo'shimcha rejimlari:
+    ?page=N&page_size=M  -> sahifalangan javob
+    ?stream=true         -> streaming JSON (.iterator() orqali)
+    ?fields=id,title     -> faqat shu maydonlar (?exclude=subtitle ham)
+
 HOMEWORK & AUTH:
 ----------------
 GET    /api/homework/field-validation/
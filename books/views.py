@@ -1,7 +1,7 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
+from rest_framework.permissions import IsAdminUser, IsAuthenticated, IsAuthenticatedOrReadOnly
 from django.shortcuts import get_object_or_404
 from .models import Book
 from .serializers import (
@@ -21,12 +21,79 @@ from rest_framework import viewsets
 from rest_framework.decorators import action
 from .models import Book
 from .serializers import BookSerializer
+from .pagination import (
+    BookCursorPagination,
+    LegacyPageNumberPagination,
+    apaginate_queryset,
+    use_cursor_pagination,
+)
+from .streaming import streaming_content, streaming_json_response
+from . import statistics as book_statistics
+from . import search as book_search
+from . import cache as book_cache
+from . import conditional
+from . import sync as book_sync
+from . import bulk as book_bulk
+from . import export as book_export
+from . import representation
+from rest_framework.utils.urls import replace_query_param
+from django.http import StreamingHttpResponse
+from asgiref.sync import sync_to_async
+from library_project.async_views import AsyncViewSetMixin
+
+
+# ============================================
+# ESKI RO'YXAT ENDPOINT'LARI UCHUN UMUMIY MIXIN
+# ============================================
+
+class LegacyBookListMixin:
+    """
+    Eski ro'yxat endpoint'lari uchun GET rejimlari:
+    - GET ?page=2&page_size=50  -> sahifalangan javob
+    - GET ?stream=true          -> streaming JSON (xotira doimiy)
+    - GET                       -> avvalgidek butun ro'yxat
+    Hammasida ?fields=id,title / ?exclude=subtitle ishlaydi (SELECT ham torayadi)
+    """
+    pagination_class = LegacyPageNumberPagination
+    stream_chunk_size = 500
+
+    def list_books(self, request, serializer_class, message):
+        params = request.query_params
+        fields = representation.parse_fields(params, serializer_class)
+
+        # Barqaror tartib: sahifalar so'rovdan so'rovga bir xil
+        queryset = Book.objects.order_by('pk')
+        if params.get('stream') in ('1', 'true', 'True'):
+            return streaming_json_response(
+                request, message, queryset, serializer_class, self.stream_chunk_size, fields
+            )
+
+        # Tezkor o'qish yo'li: .values() + oldindan tuzilgan converter'lar
+        books, to_data = representation.prepare(serializer_class, queryset, fields=fields)
+
+        if 'page' in params or 'page_size' in params:
+            paginator = self.pagination_class()
+            page = paginator.paginate_queryset(books, request, view=self)
+            return Response({
+                'message': message,
+                'count': paginator.page.paginator.count,
+                'next': paginator.get_next_link(),
+                'previous': paginator.get_previous_link(),
+                'results': to_data(page)
+            })
+
+        data = to_data(books)
+        return Response({
+            'message': message,
+            'count': len(data),
+            'results': data
+        })
 
 # ============================================
 # FIELD-LEVEL VALIDATION ENDPOINTS
 # ============================================
 
-class BookFieldValidationListView(APIView):
+class BookFieldValidationListView(LegacyBookListMixin, APIView):
     """
     Field-level validation bilan
     URL: /api/books/field-validation/
@@ -34,13 +101,7 @@ class BookFieldValidationListView(APIView):
     permission_classes = [IsAuthenticatedOrReadOnly]  # YANGI
     
     def get(self, request):
-        books = Book.objects.all()
-        serializer = BookFieldValidationSerializer(books, many=True)
-        return Response({
-            'message': 'Field-level validation',
-            'count': len(serializer.data),
-            'results': serializer.data
-        })
+        return self.list_books(request, BookFieldValidationSerializer, 'Field-level validation')
     
     def post(self, request):
         serializer = BookFieldValidationSerializer(data=request.data)
@@ -53,7 +114,7 @@ class BookFieldValidationListView(APIView):
 # OBJECT-LEVEL VALIDATION ENDPOINTS
 # ============================================
 
-class BookObjectValidationListView(APIView):
+class BookObjectValidationListView(LegacyBookListMixin, APIView):
     """
     Object-level validation bilan
     URL: /api/books/object-validation/
@@ -61,13 +122,7 @@ class BookObjectValidationListView(APIView):
     permission_classes = [IsAuthenticatedOrReadOnly]  # YANGI
     
     def get(self, request):
-        books = Book.objects.all()
-        serializer = BookObjectValidationSerializer(books, many=True)
-        return Response({
-            'message': 'Object-level validation',
-            'count': len(serializer.data),
-            'results': serializer.data
-        })
+        return self.list_books(request, BookObjectValidationSerializer, 'Object-level validation')
     
     def post(self, request):
         serializer = BookObjectValidationSerializer(data=request.data)
@@ -80,7 +135,7 @@ class BookObjectValidationListView(APIView):
 # CUSTOM VALIDATORS ENDPOINTS
 # ============================================
 
-class BookCustomValidatorsListView(APIView):
+class BookCustomValidatorsListView(LegacyBookListMixin, APIView):
     """
     Custom validators bilan
     URL: /api/books/custom-validators/
@@ -88,13 +143,7 @@ class BookCustomValidatorsListView(APIView):
     permission_classes = [IsAuthenticatedOrReadOnly] 
     
     def get(self, request):
-        books = Book.objects.all()
-        serializer = BookCustomValidatorsSerializer(books, many=True)
-        return Response({
-            'message': 'Custom validators',
-            'count': len(serializer.data),
-            'results': serializer.data
-        })
+        return self.list_books(request, BookCustomValidatorsSerializer, 'Custom validators')
     
     def post(self, request):
         serializer = BookCustomValidatorsSerializer(data=request.data)
@@ -109,20 +158,14 @@ class BookCustomValidatorsListView(APIView):
 # BUILT-IN VALIDATORS ENDPOINTS
 # ============================================
 
-class BookBuiltInValidatorsListView(APIView):
+class BookBuiltInValidatorsListView(LegacyBookListMixin, APIView):
     """
     Built-in validators bilan
     URL: /api/books/builtin-validators/
     """
     
     def get(self, request):
-        books = Book.objects.all()
-        serializer = BookBuiltInValidatorsSerializer(books, many=True)
-        return Response({
-            'message': 'Built-in validators',
-            'count': len(serializer.data),
-            'results': serializer.data
-        })
+        return self.list_books(request, BookBuiltInValidatorsSerializer, 'Built-in validators')
     
     def post(self, request):
         serializer = BookBuiltInValidatorsSerializer(data=request.data)
@@ -138,7 +181,7 @@ class BookBuiltInValidatorsListView(APIView):
 
 
 
-class BookListCreateView(APIView):
+class BookListCreateView(LegacyBookListMixin, APIView):
     """
     Barcha validation'lar bilan
     URL: /api/books/
@@ -146,13 +189,7 @@ class BookListCreateView(APIView):
     permission_classes = [IsAuthenticatedOrReadOnly]  # GET - hamma, POST - faqat auth
     
     def get(self, request):
-        books = Book.objects.all()
-        serializer = BookCompleteValidationSerializer(books, many=True)
-        return Response({
-            'message': 'Complete validation (field + object + custom)',
-            'count': len(serializer.data),
-            'results': serializer.data
-        })
+        return self.list_books(request, BookCompleteValidationSerializer, 'Complete validation (field + object + custom)')
     
     def post(self, request):
         serializer = BookCompleteValidationSerializer(data=request.data)
@@ -172,9 +209,18 @@ class BookDetailView(APIView):
         return get_object_or_404(Book, pk=pk)
     
     def get(self, request, pk):
-        book = self.get_object(pk)
-        serializer = BookCompleteValidationSerializer(book)
-        return Response(serializer.data)
+        pk = book_cache.normalize_pk(pk)
+        if 'HTTP_IF_NONE_MATCH' in request.META:
+            response = conditional.detail_not_modified(request, pk, book_cache.current_generation(pk))
+            if response is not None:
+                return response
+        data, generation = book_cache.get_entry(
+            pk, BookCompleteValidationSerializer,
+            loader=lambda: BookCompleteValidationSerializer(self.get_object(pk)).data
+        )
+        etag, last_modified = conditional.representation_validators(request, pk, generation, data)
+        response = conditional.not_modified(request, etag, last_modified) or Response(data)
+        return conditional.with_validators(response, etag, last_modified)
     
     def put(self, request, pk):
         book = self.get_object(pk)
@@ -204,20 +250,14 @@ class BookDetailView(APIView):
 # HOMEWORK ENDPOINTS
 # ============================================
 
-class BookHomeworkFieldValidationView(APIView):
+class BookHomeworkFieldValidationView(LegacyBookListMixin, APIView):
     """
     Homework Vazifa 1: Field-level validation test
     URL: /api/homework/field-validation/
     """
     
     def get(self, request):
-        books = Book.objects.all()
-        serializer = BookHomeworkFieldValidationSerializer(books, many=True)
-        return Response({
-            'message': 'Homework: Field-level validation',
-            'count': len(serializer.data),
-            'results': serializer.data
-        })
+        return self.list_books(request, BookHomeworkFieldValidationSerializer, 'Homework: Field-level validation')
     
     def post(self, request):
         serializer = BookHomeworkFieldValidationSerializer(data=request.data)
@@ -226,20 +266,14 @@ class BookHomeworkFieldValidationView(APIView):
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
-class BookHomeworkObjectValidationView(APIView):
+class BookHomeworkObjectValidationView(LegacyBookListMixin, APIView):
     """
     Homework Vazifa 2: Object-level validation test
     URL: /api/homework/object-validation/
     """
     
     def get(self, request):
-        books = Book.objects.all()
-        serializer = BookHomeworkObjectValidationSerializer(books, many=True)
-        return Response({
-            'message': 'Homework: Object-level validation',
-            'count': len(serializer.data),
-            'results': serializer.data
-        })
+        return self.list_books(request, BookHomeworkObjectValidationSerializer, 'Homework: Object-level validation')
     
     def post(self, request):
         serializer = BookHomeworkObjectValidationSerializer(data=request.data)
@@ -295,10 +329,86 @@ class BookViewSet(viewsets.ModelViewSet):
     - update (PUT /api/books/{id}/)
     - partial_update (PATCH /api/books/{id}/)
     - destroy (DELETE /api/books/{id}/)
+
+    Keyset pagination (opt-in): GET /api/books/?pagination=cursor
     """
-    queryset = Book.objects.all()
+    # Barqaror tartib: PageNumberPagination sahifalari deterministik
+    # (keyset pagination va qidiruv o'z tartibini qo'yadi)
+    queryset = Book.objects.order_by('id')
     serializer_class = BookSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+
+    def list(self, request, *args, **kwargs):
+        """
+        GET /api/books/
+        ETag / Last-Modified: mos kelsa 304 (serializer ishlamaydi)
+        """
+        etag, last_modified = conditional.collection_validators(request)
+        response = conditional.not_modified(request, etag, last_modified)
+        if response is None:
+            response = self.list_response(self.filter_queryset(self.get_queryset()))
+        return conditional.with_validators(response, etag, last_modified)
+
+    def list_response(self, queryset, paginate=True):
+        """
+        ListModelMixin.list bilan bir xil javob, lekin tezkor o'qish yo'li bilan
+        (books/representation.py) - JSON baytma-bayt bir xil.
+        ?fields= / ?exclude= javobni ham, SELECT'ni ham toraytiradi.
+        """
+        serializer_class = self.get_serializer_class()
+        fields = representation.parse_fields(self.request.query_params, serializer_class)
+        extra = ()
+        if paginate and isinstance(self.paginator, BookCursorPagination):
+            # Cursor pozitsiyasi tartiblash kalitidan olinadi
+            ordering = self.paginator.get_ordering(self.request, queryset, self)
+            extra = tuple(field.lstrip('-') for field in ordering)
+        queryset, to_data = representation.prepare(
+            serializer_class, queryset, self.get_serializer_context(), fields, extra
+        )
+        page = self.paginate_queryset(queryset) if paginate else None
+        if page is not None:
+            return self.get_paginated_response(to_data(page))
+        return Response(to_data(queryset))
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        GET /api/books/{id}/?fields=id,title
+        Serializer natijasi cache'dan (books/cache.py), ETag / Last-Modified bilan
+        """
+        fields = representation.parse_fields(request.query_params, self.get_serializer_class())
+        pk = book_cache.normalize_pk(kwargs[self.lookup_field])
+        # 304 bo'lsa representation (cache yoki baza) o'qilmaydi
+        if 'HTTP_IF_NONE_MATCH' in request.META:
+            response = conditional.detail_not_modified(request, pk, book_cache.current_generation(pk))
+            if response is not None:
+                return response
+        data, generation = book_cache.get_entry(
+            pk, self.get_serializer_class(),
+            loader=lambda: self.get_serializer(self.get_object()).data
+        )
+        return self.detail_response(pk, data, generation, fields)
+
+    def detail_response(self, pk, data, generation, fields):
+        """Cache'dagi representation'dan javob (?fields=, ETag / Last-Modified)"""
+        etag, last_modified = conditional.representation_validators(self.request, pk, generation, data)
+        response = (
+            conditional.not_modified(self.request, etag, last_modified)
+            or Response(representation.select(data, fields))
+        )
+        return conditional.with_validators(response, etag, last_modified)
+
+    @property
+    def paginator(self):
+        """
+        ?pagination=cursor yoki ?cursor= bo'lsa keyset pagination,
+        aks holda global PageNumberPagination
+        """
+        if not hasattr(self, '_paginator'):
+            if use_cursor_pagination(self.request):
+                self._paginator = BookCursorPagination()
+            else:
+                return super().paginator
+        return self._paginator
     
     # Custom action: Faqat published kitoblarni ko'rsatish
     @action(detail=False, methods=['get'])
@@ -307,27 +417,196 @@ class BookViewSet(viewsets.ModelViewSet):
         GET /api/books/published/
         Faqat published=True bo'lgan kitoblarni qaytaradi
         """
-        published_books = Book.objects.filter(published=True)
-        serializer = self.get_serializer(published_books, many=True)
-        return Response(serializer.data)
+        etag, last_modified = conditional.collection_validators(request)
+        response = conditional.not_modified(request, etag, last_modified)
+        if response is None:
+            response = self.list_response(Book.objects.filter(published=True), paginate=False)
+        return conditional.with_validators(response, etag, last_modified)
     
     # Custom action: Kitob statistikasi
     @action(detail=False, methods=['get'])
     def statistics(self, request):
         """
         GET /api/books/statistics/
-        Kitoblar statistikasini qaytaradi
+        GET /api/books/statistics/?breakdown=language,year
+        Kitoblar statistikasini qaytaradi (BookStatistics jadvalidan, COUNT'siz)
         """
-        total_books = Book.objects.count()
-        published_books = Book.objects.filter(published=True).count()
-        unpublished_books = total_books - published_books
-        
-        data = {
-            'total_books': total_books,
-            'published_books': published_books,
-            'unpublished_books': unpublished_books,
-        }
-        return Response(data)
+        breakdown = self.parse_breakdown(request)
+        if breakdown is None:
+            return self.invalid_breakdown_response()
+        return Response(book_statistics.get_statistics(breakdown=breakdown))
+
+    def parse_breakdown(self, request):
+        """?breakdown=language,year -> ('language', 'year'); noto'g'ri qiymat bo'lsa None"""
+        breakdown = [
+            dim.strip()
+            for dim in request.query_params.get('breakdown', '').split(',')
+            if dim.strip()
+        ]
+        if any(dim not in book_statistics.BREAKDOWN_DIMENSIONS for dim in breakdown):
+            return None
+        return tuple(dict.fromkeys(breakdown))
+
+    def invalid_breakdown_response(self):
+        return Response(
+            {'breakdown': f"Ruxsat etilgan qiymatlar: {', '.join(book_statistics.BREAKDOWN_DIMENSIONS)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    # Custom action: Full-text qidiruv
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        GET /api/books/search/?q=django
+        GET /api/books/search/?q=django&cursor=<opaque>
+        Title, subtitle va author bo'yicha FTS5 qidiruv,
+        relevance bo'yicha tartiblangan (keyset pagination)
+        """
+        query = request.query_params.get('q', '')
+        if not book_search.build_match_expression(query):
+            return Response(
+                {'q': "Qidiruv so'zi talab qilinadi"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        after = None
+        cursor = request.query_params.get('cursor')
+        if cursor:
+            after = book_search.decode_cursor(cursor)
+            if after is None:
+                return Response(
+                    {'cursor': "Noto'g'ri cursor"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        page_size = BookCursorPagination().get_page_size(request)
+        rows = book_search.search_ids(query, page_size + 1, after)
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+
+        books = Book.objects.in_bulk([pk for pk, _ in rows])
+        serializer = self.get_serializer(
+            [books[pk] for pk, _ in rows if pk in books], many=True
+        )
+
+        next_link = None
+        if has_next:
+            pk, score = rows[-1]
+            next_link = replace_query_param(
+                request.build_absolute_uri(), 'cursor', book_search.encode_cursor(score, pk)
+            )
+        return Response({
+            'next': next_link,
+            'results': serializer.data
+        })
+    
+    # Custom action: Delta sync
+    @action(detail=False, methods=['get'])
+    def changes(self, request):
+        """
+        GET /api/books/changes/?since=<version>&limit=100
+        since versiyasidan keyingi qo'shish/yangilash (upsert) va
+        o'chirish (delete) o'zgarishlari, versiya bo'yicha tartiblangan.
+        Keyingi sahifa: ?since=<next_since>
+        """
+        try:
+            since = int(request.query_params.get('since', 0))
+            limit = int(request.query_params.get('limit', book_sync.DEFAULT_LIMIT))
+        except ValueError:
+            return Response(
+                {'error': "since va limit butun son bo'lishi kerak"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        since = max(since, 0)
+        limit = min(max(limit, 1), book_sync.MAX_LIMIT)
+
+        changes, has_more = book_sync.get_changes(since, limit)
+        results = []
+        for version, operation, obj in changes:
+            if operation == 'delete':
+                results.append({
+                    'version': version,
+                    'op': operation,
+                    'id': obj.book_id,
+                    'isbn_number': obj.isbn_number,
+                })
+            else:
+                results.append({
+                    'version': version,
+                    'op': operation,
+                    'id': obj.pk,
+                    'book': self.get_serializer(obj).data,
+                })
+
+        return Response({
+            'since': since,
+            'next_since': changes[-1][0] if changes else since,
+            'has_more': has_more,
+            'results': results
+        })
+    
+    # Custom action: Paketli yaratish
+    @action(detail=False, methods=['post'], permission_classes=[IsAuthenticated])
+    def bulk(self, request):
+        """
+        POST /api/books/bulk/
+        Body: [{...}, {...}] yoki {"books": [...]}
+        Uniqueness butun paket uchun bir necha IN so'rov bilan tekshiriladi,
+        to'g'ri elementlar bulk_create bilan yoziladi, xatolar element
+        indeksi bilan qaytariladi.
+        """
+        records = request.data.get('books') if isinstance(request.data, dict) else request.data
+        if not isinstance(records, list) or not records:
+            return Response(
+                {'error': "Kitoblar ro'yxati yuborilishi kerak"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(records) > book_bulk.MAX_ITEMS:
+            return Response(
+                {'error': f"Bir so'rovda ko'pi bilan {book_bulk.MAX_ITEMS} ta kitob"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        valid, errors = book_bulk.validate_batch(records)
+        created, conflicts = book_bulk.create_books(valid)
+        errors.update(conflicts)
+
+        return Response({
+            'message': f"{len(created)} ta kitob yaratildi, {len(errors)} ta xato",
+            'created': [{'index': index, 'id': book.pk} for index, book in created],
+            'errors': [
+                {'index': index, 'errors': errors[index]}
+                for index in sorted(errors)
+            ]
+        }, status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST)
+    
+    # Custom action: Katalog eksporti
+    @action(detail=False, methods=['get'], renderer_classes=book_export.EXPORT_RENDERERS)
+    def export(self, request):
+        """
+        GET /api/books/export/?format=ndjson|csv
+        Butun katalog (list bilan bir xil filtrlar) oqim bo'yicha;
+        gzip / brotli - CompressionMiddleware (library_project/middleware.py)
+        """
+        renderer = request.accepted_renderer
+        chunks = renderer.iterator(
+            self.filter_queryset(self.get_queryset()), self.get_serializer_class()
+        )
+        response = StreamingHttpResponse(
+            streaming_content(request, book_export.encode_stream(chunks)),
+            content_type=f'{renderer.media_type}; charset=utf-8',
+        )
+        response['Content-Disposition'] = f'attachment; filename="books.{renderer.format}"'
+        return response
+    
+    # Custom action: Detail cache statistikasi
+    @action(detail=False, methods=['get'], url_path='cache-stats', permission_classes=[IsAdminUser])
+    def cache_stats(self, request):
+        """
+        GET /api/books/cache-stats/
+        Detail cache hit/miss hisoblagichlari (faqat admin)
+        """
+        return Response(book_cache.stats())
     
     # Custom action: Bitta kitobni publish qilish
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
@@ -353,4 +632,63 @@ class BookViewSet(viewsets.ModelViewSet):
         book.published = False
         book.save()
         serializer = self.get_serializer(book)
-        return Response(serializer.data)
\ No newline at end of file
+        return Response(serializer.data)
+
+
+# ============================================
+# ASGI profili: async list / retrieve / statistics
+# ============================================
+
+class AsyncBookViewSet(AsyncViewSetMixin, BookViewSet):
+    """
+    BookViewSet bilan bir xil javoblar, lekin list/retrieve/statistics async
+    ORM bilan (aget, acount, async for). settings.ASYNC_VIEWS bo'lsa (asgi.py)
+    router shu ViewSet'ni ishlatadi; qolgan action'lar sync_to_async orqali.
+    """
+
+    async def list(self, request, *args, **kwargs):
+        etag, last_modified = await conditional.acollection_validators(request)
+        response = conditional.not_modified(request, etag, last_modified)
+        if response is None:
+            queryset = self.filter_queryset(self.get_queryset())
+            if isinstance(self.paginator, BookCursorPagination):
+                # Keyset pagination (CursorPagination) - sync
+                response = await sync_to_async(self.list_response)(queryset)
+            else:
+                response = await self.alist_response(queryset)
+        return conditional.with_validators(response, etag, last_modified)
+
+    async def alist_response(self, queryset):
+        """list_response() ning PageNumberPagination uchun async varianti"""
+        serializer_class = self.get_serializer_class()
+        fields = representation.parse_fields(self.request.query_params, serializer_class)
+        queryset, to_data = representation.prepare(
+            serializer_class, queryset, self.get_serializer_context(), fields
+        )
+        if self.paginator is not None:
+            page = await apaginate_queryset(self.paginator, queryset, self.request)
+            if page is not None:
+                return self.get_paginated_response(to_data(page))
+        return Response(to_data([row async for row in queryset]))
+
+    async def retrieve(self, request, *args, **kwargs):
+        fields = representation.parse_fields(request.query_params, self.get_serializer_class())
+        pk = book_cache.normalize_pk(kwargs[self.lookup_field])
+        if 'HTTP_IF_NONE_MATCH' in request.META:
+            response = conditional.detail_not_modified(request, pk, await book_cache.acurrent_generation(pk))
+            if response is not None:
+                return response
+
+        async def aloader():
+            return self.get_serializer(await self.aget_object()).data
+
+        data, generation = await book_cache.aget_entry(pk, self.get_serializer_class(), aloader)
+        return self.detail_response(pk, data, generation, fields)
+
+    @action(detail=False, methods=['get'])
+    async def statistics(self, request):
+        """GET /api/books/statistics/?breakdown=language,year"""
+        breakdown = self.parse_breakdown(request)
+        if breakdown is None:
+            return self.invalid_breakdown_response()
+        return Response(await book_statistics.aget_statistics(breakdown=breakdown))
@@ -0,0 +1,42 @@
+"""
+Gunicorn sozlamalari
+====================
+
+    gunicorn -c gunicorn.conf.py                     # WSGI (sync worker'lar)
+    SERVER_MODE=asgi gunicorn -c gunicorn.conf.py    # ASGI (uvicorn worker'lar)
+
+- WSGI: library_project.wsgi; GUNICORN_THREADS > 1 bo'lsa gthread worker'lar
+- ASGI: library_project.asgi + uvicorn_worker.UvicornWorker; asgi.py
+  ASYNC_VIEWS ni yoqadi (kitob list/retrieve/statistics - async ORM)
+
+Worker'lar soni - WEB_CONCURRENCY, port - PORT (gunicorn o'zi o'qiydi).
+
+Parol xeshlash pool'i (accounts/hashing.py) navbati to'lsa 503 qaytaradi.
+WSGI worker'da jarayonda bir vaqtda ko'pi bilan `threads` ta so'rov bor,
+shuning uchun sozlamalardagi 2 + 16 chegaraga hech qachon yetilmaydi. WSGI'da
+chegara thread'lar soniga moslanadi: login to'lqinida ham bitta thread
+boshqa so'rovlar uchun bo'sh qoladi. Sync worker'da (1 thread) backpressure
+yo'q - ortiqcha so'rovlarni gunicorn backlog'i ushlaydi. PASSWORD_HASH_*
+muhitda berilgan bo'lsa o'zgartirilmaydi.
+"""
+
+import os
+
+# `config` - gunicorn sozlamasi nomi, shuning uchun modul orqali
+import decouple
+
+SERVER_MODE = decouple.config('SERVER_MODE', default='wsgi')
+
+if SERVER_MODE == 'asgi':
+    wsgi_app = 'library_project.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+elif SERVER_MODE == 'wsgi':
+    wsgi_app = 'library_project.wsgi:application'
+    threads = decouple.config('GUNICORN_THREADS', default=1, cast=int)
+    # Worker'lar master'ning muhitini meros oladi (settings.py shundan o'qiydi)
+    hash_limit = max(1, threads - 1)
+    hash_workers = min(2, hash_limit)
+    os.environ.setdefault('PASSWORD_HASH_WORKERS', str(hash_workers))
+    os.environ.setdefault('PASSWORD_HASH_QUEUE_SIZE', str(hash_limit - hash_workers))
+else:
+    raise ValueError(f"SERVER_MODE 'wsgi' yoki 'asgi' bo'lishi kerak, berilgan: {SERVER_MODE!r}")
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "library_project.settings")
+# Kitob endpoint'larining async variantlari (settings.ASYNC_VIEWS)
+os.environ.setdefault("ASYNC_VIEWS", "True")
 
 application = get_asgi_application()
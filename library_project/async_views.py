@@ -0,0 +1,129 @@
+"""
+Async DRF view'lar
+==================
+
+DRF APIView.dispatch sync - ASGI'da har bir sync view bitta umumiy oqimda
+(sync_to_async, thread_sensitive) navbat bilan ishlaydi. AsyncAPIViewMixin
+handler'larni (`async def post`) event loop'da bajaradi:
+
+- autentifikatsiya, ruxsatlar, throttle (initial) - sync_to_async orqali
+  (ular ORM/cache ishlatishi mumkin)
+- handler - await; ORM uchun async metodlar (aget, acreate ...) yoki
+  sync_to_async
+- xatolar odatdagidek handle_exception() orqali
+
+Sync handler'lar (masalan, ViewSet'dagi create/update) sync_to_async bilan
+chaqiriladi, shuning uchun bitta ViewSet'da ikkala turdagi action bo'lishi
+mumkin (AsyncViewSetMixin).
+
+WSGI (gunicorn sync) ostida ham ishlaydi - Django async view'ni
+async_to_sync bilan chaqiradi.
+
+    class LoginView(AsyncAPIView):
+        async def post(self, request): ...
+
+    class AsyncBookViewSet(AsyncViewSetMixin, BookViewSet):
+        async def list(self, request, *args, **kwargs): ...
+
+    @async_api_view(['POST'])
+    @permission_classes([AllowAny])
+    async def register_user(request): ...
+"""
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.core.exceptions import ValidationError
+from django.http import Http404
+from django.utils.decorators import classonlymethod
+from rest_framework.views import APIView
+
+# api_view bilan bir xil: funksiyaga decorator'lar qo'ygan atributlar
+VIEW_ATTRIBUTES = (
+    'renderer_classes',
+    'parser_classes',
+    'authentication_classes',
+    'throttle_classes',
+    'permission_classes',
+    'schema',
+)
+
+
+class AsyncAPIViewMixin:
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            if iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class AsyncAPIView(AsyncAPIViewMixin, APIView):
+    pass
+
+
+class AsyncViewSetMixin(AsyncAPIViewMixin):
+    """
+    ViewSet uchun: `async def` action'lar event loop'da, qolganlari
+    sync_to_async orqali
+    """
+
+    @classonlymethod
+    def as_view(cls, actions=None, **initkwargs):
+        # ViewSetMixin.as_view view'ni async deb belgilamaydi
+        view = super().as_view(actions, **initkwargs)
+        markcoroutinefunction(view)
+        return view
+
+    async def aget_object(self):
+        """GenericAPIView.get_object ning async varianti (queryset.aget)"""
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except queryset.model.DoesNotExist:
+            raise Http404(f'No {queryset.model._meta.object_name} matches the given query.')
+        except (TypeError, ValueError, ValidationError):
+            raise Http404
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+
+def async_api_view(http_method_names):
+    """@api_view ning async varianti"""
+
+    def decorator(func):
+        async def handler(self, *args, **kwargs):
+            return await func(*args, **kwargs)
+
+        attrs = {
+            '__doc__': func.__doc__,
+            '__module__': func.__module__,
+            'http_method_names': [method.lower() for method in http_method_names] + ['options'],
+        }
+        for method in http_method_names:
+            attrs[method.lower()] = handler
+        for name in VIEW_ATTRIBUTES:
+            if hasattr(func, name):
+                attrs[name] = getattr(func, name)
+
+        view_class = type(func.__name__, (AsyncAPIView,), attrs)
+        return view_class.as_view()
+
+    return decorator
@@ -0,0 +1,311 @@
+"""
+SQLite (WAL) asosidagi umumiy cache backend
+============================================
+
+LocMemCache har bir gunicorn worker uchun alohida - bir worker'da saqlangan
+password reset kodi boshqasida ko'rinmaydi. Bu backend bitta xostdagi barcha
+worker'lar uchun umumiy fayl (WAL rejimida) ishlatadi:
+
+- TTL (timeout)
+- MAX_ENTRIES dan oshsa LRU bo'yicha tozalash (MAX_ENTRIES=None - faqat
+  muddati o'tganlar o'chiriladi, masalan JWT deny-list uchun)
+- atomic add() / incr() (BEGIN IMMEDIATE)
+- get() va get_many() o'qilgan kalitlarning LRU vaqtini yangilaydi
+  (touch_resolution soniyada bir marta, bitta UPDATE)
+- async o'qish (aget, aget_many, ahas_key) event loop'da, thread'siz: WAL'da
+  o'qish lock kutmaydi. Ulanishni ochish (fayl, PRAGMA, CREATE TABLE) va LRU
+  vaqtini yozish, boshqa yozishlar (lock kutishi mumkin) - BaseCache kabi
+  thread'da
+
+CACHES = {
+    'default': {
+        'BACKEND': 'library_project.cache.SQLiteCache',
+        'LOCATION': '/var/tmp/library_cache.sqlite3',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    }
+}
+"""
+
+import asyncio
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS cache_entries (
+        key TEXT PRIMARY KEY,
+        value BLOB NOT NULL,
+        expires REAL,
+        accessed REAL NOT NULL
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS cache_entries_accessed ON cache_entries (accessed)",
+    "CREATE INDEX IF NOT EXISTS cache_entries_expires ON cache_entries (expires)",
+]
+
+# Ulanishlar (thread, fayl) bo'yicha, backend obyektida emas: ASGI'da Django har
+# so'rov uchun yangi backend yaratadi (caches - asgiref Local), ulanish esa
+# thread davomida qayta ishlatiladi
+_local = threading.local()
+# Fayl bo'yicha yozuvlar soni (cull tekshiruvi uchun)
+_writes = Counter()
+
+
+class SQLiteCache(BaseCache):
+    # LRU vaqtini har o'qishda yozmaslik uchun (soniya)
+    touch_resolution = 1.0
+    # Har nechta yozuvdan keyin hajm tekshiriladi
+    cull_check_interval = 32
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self._path = location
+        # BaseCache None'ni 300 ga aylantiradi - LRU tozalashni o'chirish uchun alohida
+        if params.get('OPTIONS', {}).get('MAX_ENTRIES', 0) is None:
+            self._max_entries = None
+
+    # ---------- connection ----------
+
+    def _connections(self):
+        connections = getattr(_local, 'connections', None)
+        # fork'dan keyin (gunicorn) ota jarayon ulanishini ishlatmaymiz
+        if connections is None or _local.pid != os.getpid():
+            connections = _local.connections = {}
+            _local.pid = os.getpid()
+        return connections
+
+    def _open(self):
+        # check_same_thread=False: event loop ulanishi thread'da ochiladi (_aconnect)
+        connection = sqlite3.connect(self._path, timeout=5, isolation_level=None, check_same_thread=False)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        for statement in SCHEMA:
+            connection.execute(statement)
+        return connection
+
+    def _connection(self):
+        connections = self._connections()
+        connection = connections.get(self._path)
+        if connection is None:
+            connection = connections[self._path] = self._open()
+        return connection
+
+    async def _aconnect(self):
+        """Event loop thread'i uchun ulanish: birinchi marta thread'da ochiladi"""
+        connections = self._connections()
+        if self._path not in connections:
+            connection = await asyncio.get_running_loop().run_in_executor(None, self._open)
+            if connections.setdefault(self._path, connection) is not connection:
+                connection.close()
+
+    @contextmanager
+    def _write(self):
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield connection
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        else:
+            connection.execute('COMMIT')
+
+    def _expiry(self, timeout):
+        # BaseCache: mutlaq vaqt (time.time() + timeout) yoki None
+        return self.get_backend_timeout(timeout)
+
+    @staticmethod
+    def _alive(expires, now):
+        return expires is None or expires > now
+
+    # ---------- read ----------
+
+    def _fetch(self, keys):
+        """
+        Tirik yozuvlar {key: pickled} va LRU vaqti (accessed) yangilanishi
+        kerak bo'lgan kalitlar (touch_resolution soniyadan eski)
+        """
+        now = time.time()
+        placeholders = ', '.join('?' * len(keys))
+        rows = self._connection().execute(
+            f'SELECT key, value, expires, accessed FROM cache_entries WHERE key IN ({placeholders})',
+            keys,
+        ).fetchall()
+        values, stale = {}, []
+        for key, value, expires, accessed in rows:
+            if self._alive(expires, now):
+                values[key] = value
+                if now - accessed > self.touch_resolution:
+                    stale.append(key)
+        return values, stale
+
+    def _touch(self, keys):
+        """O'qilgan kalitlarning LRU vaqti - bitta UPDATE; lock band bo'lsa o'tkazib yuboriladi"""
+        if not keys:
+            return
+        placeholders = ', '.join('?' * len(keys))
+        try:
+            self._connection().execute(
+                f'UPDATE cache_entries SET accessed = ? WHERE key IN ({placeholders})',
+                [time.time(), *keys],
+            )
+        except sqlite3.OperationalError:
+            pass
+
+    def _touch_later(self, keys):
+        # Yozish lock kutishi mumkin (busy timeout) - event loop'da emas, thread'da
+        if keys:
+            asyncio.get_running_loop().run_in_executor(None, self._touch, keys)
+
+    def _many(self, keys, version):
+        key_map = {self.make_and_validate_key(key, version=version): key for key in keys}
+        values, stale = self._fetch(list(key_map)) if key_map else ({}, [])
+        return {key_map[key]: pickle.loads(value) for key, value in values.items()}, stale
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        values, stale = self._fetch([key])
+        self._touch(stale)
+        return pickle.loads(values[key]) if key in values else default
+
+    def get_many(self, keys, version=None):
+        values, stale = self._many(keys, version)
+        self._touch(stale)
+        return values
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._connection().execute(
+            'SELECT expires FROM cache_entries WHERE key = ?', (key,)
+        ).fetchone()
+        return row is not None and self._alive(row[0], time.time())
+
+    async def aget(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        await self._aconnect()
+        values, stale = self._fetch([key])
+        self._touch_later(stale)
+        return pickle.loads(values[key]) if key in values else default
+
+    async def aget_many(self, keys, version=None):
+        await self._aconnect()
+        values, stale = self._many(keys, version)
+        self._touch_later(stale)
+        return values
+
+    async def ahas_key(self, key, version=None):
+        await self._aconnect()
+        return self.has_key(key, version)
+
+    # ---------- write ----------
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._write() as connection:
+            self._set(connection, key, value, timeout)
+        self._after_write()
+
+    def _set(self, connection, key, value, timeout):
+        connection.execute(
+            'INSERT OR REPLACE INTO cache_entries (key, value, expires, accessed) VALUES (?, ?, ?, ?)',
+            (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), self._expiry(timeout), time.time()),
+        )
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        with self._write() as connection:
+            for key, value in data.items():
+                key = self.make_and_validate_key(key, version=version)
+                self._set(connection, key, value, timeout)
+        self._after_write()
+        return []
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._write() as connection:
+            connection.execute(
+                'DELETE FROM cache_entries WHERE key = ? AND expires <= ?', (key, time.time())
+            )
+            cursor = connection.execute(
+                'INSERT OR IGNORE INTO cache_entries (key, value, expires, accessed) VALUES (?, ?, ?, ?)',
+                (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), self._expiry(timeout), time.time()),
+            )
+            added = cursor.rowcount == 1
+        if added:
+            self._after_write()
+        return added
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._write() as connection:
+            row = connection.execute(
+                'SELECT value, expires FROM cache_entries WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None or not self._alive(row[1], time.time()):
+                raise ValueError("Key '%s' not found" % key)
+            value = pickle.loads(row[0]) + delta
+            connection.execute(
+                'UPDATE cache_entries SET value = ?, accessed = ? WHERE key = ?',
+                (pickle.dumps(value, pickle.HIGHEST_PROTOCOL), time.time(), key),
+            )
+        return value
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._write() as connection:
+            cursor = connection.execute(
+                'UPDATE cache_entries SET expires = ?, accessed = ? '
+                'WHERE key = ? AND (expires IS NULL OR expires > ?)',
+                (self._expiry(timeout), time.time(), key, time.time()),
+            )
+            return cursor.rowcount == 1
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._write() as connection:
+            cursor = connection.execute('DELETE FROM cache_entries WHERE key = ?', (key,))
+            return cursor.rowcount == 1
+
+    def delete_many(self, keys, version=None):
+        keys = [self.make_and_validate_key(key, version=version) for key in keys]
+        if not keys:
+            return
+        with self._write() as connection:
+            connection.executemany('DELETE FROM cache_entries WHERE key = ?', [(key,) for key in keys])
+
+    def clear(self):
+        with self._write() as connection:
+            connection.execute('DELETE FROM cache_entries')
+
+    def close(self, **kwargs):
+        # Ulanish thread davomida qayta ishlatiladi (har so'rovda ochilmaydi)
+        pass
+
+    # ---------- eviction ----------
+
+    def _after_write(self):
+        _writes[self._path] += 1
+        if _writes[self._path] % self.cull_check_interval == 0:
+            self.cull()
+
+    def cull(self):
+        """Muddati o'tganlarni o'chirish va MAX_ENTRIES dan oshsa LRU tozalash"""
+        with self._write() as connection:
+            connection.execute('DELETE FROM cache_entries WHERE expires <= ?', (time.time(),))
+            count = connection.execute('SELECT COUNT(*) FROM cache_entries').fetchone()[0]
+            if self._max_entries is not None and count > self._max_entries:
+                if self._cull_frequency == 0:
+                    connection.execute('DELETE FROM cache_entries')
+                    return
+                excess = count - self._max_entries + self._max_entries // self._cull_frequency
+                connection.execute(
+                    'DELETE FROM cache_entries WHERE key IN ('
+                    'SELECT key FROM cache_entries ORDER BY accessed LIMIT ?)',
+                    (excess,),
+                )
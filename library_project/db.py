@@ -0,0 +1,82 @@
+"""
+SQLite: o'qish uchun alohida ulanish
+====================================
+
+SQLITE_PROFILE=production (settings.py) da DATABASES'da bitta faylga
+qaragan ikkita alias bor:
+
+- default  - yozishlar va xavfsiz bo'lmagan so'rovlardagi (POST, PATCH ...)
+  barcha o'qishlar; BEGIN IMMEDIATE
+- readonly - PRAGMA query_only=ON; GET/HEAD/OPTIONS so'rovlaridagi o'qishlar
+
+WAL rejimida o'quvchi yozuvchini kutmaydi. O'qishlar yozish lock'ini
+oladigan default ulanishning tranzaksiyalariga tushmaydi, GET ichida
+tasodifiy yozish esa (query_only) xato beradi - yozishlar baribir default'ga
+yo'naltiriladi.
+
+ReadOnlyDatabaseMiddleware so'rov metodini contextvar'ga yozadi,
+ReadOnlyRouter shunga qarab alias tanlaydi. default'da ochiq tranzaksiya
+bo'lsa (atomic) o'qishlar ham default'da - commit qilinmagan o'z
+yozuvlarini ko'rishi uchun.
+
+Testlarda readonly - default'ning mirror'i (TEST MIRROR): TestCase
+tranzaksiyasidagi ma'lumotlarni alohida ulanish ko'rmaydi, shuning uchun
+router bu holatda default qaytaradi.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+READ_ALIAS = 'readonly'
+
+_read_only = ContextVar('library_project.db.read_only', default=False)
+
+
+@contextmanager
+def read_only(enabled=True):
+    """Blok ichidagi o'qishlar (router orqali) readonly ulanishda"""
+    token = _read_only.set(enabled)
+    try:
+        yield
+    finally:
+        _read_only.reset(token)
+
+
+def is_test_mirror(alias):
+    # setup_databases() mirror'ga primary'ning settings_dict'ini beradi
+    return connections[alias].settings_dict is connections[DEFAULT_DB_ALIAS].settings_dict
+
+
+def read_alias():
+    """Joriy kontekstdagi o'qishlar uchun alias"""
+    if (
+        not _read_only.get()
+        or READ_ALIAS not in connections.settings
+        or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        or is_test_mirror(READ_ALIAS)
+    ):
+        return DEFAULT_DB_ALIAS
+    return READ_ALIAS
+
+
+class ReadOnlyRouter:
+    def db_for_read(self, model, **hints):
+        return read_alias()
+
+    def db_for_write(self, model, **hints):
+        # readonly'dan o'qilgan obyekt ham default'ga saqlanadi (aks holda
+        # Django instance._state.db ni oladi)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, READ_ALIAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == READ_ALIAS:
+            return False
+        return None
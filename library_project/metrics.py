@@ -0,0 +1,75 @@
+"""
+Oddiy hisoblagichlar (hit/miss va h.k.)
+=======================================
+
+Har bir so'rovda umumiy cache'ga yozmaslik uchun hisoblagichlar avval
+jarayon ichida yig'iladi va har `flush_every` hodisada cache.incr() bilan
+umumiy cache'ga qo'shiladi. snapshot() = umumiy + hali yuborilmagan qism.
+Async kodda aincr(): flush (cache'ga yozish, lock kutishi mumkin) event
+loop'da emas, thread'da.
+"""
+
+import threading
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+
+
+class Counters:
+    def __init__(self, prefix, names, flush_every=100):
+        self.prefix = prefix
+        self.names = tuple(names)
+        self.flush_every = flush_every
+        self._pending = dict.fromkeys(self.names, 0)
+        self._events = 0
+        self._lock = threading.Lock()
+
+    def _key(self, name):
+        return f'metrics:{self.prefix}:{name}'
+
+    def _add(self, name, value):
+        """Jarayon ichida qo'shish; True - flush vaqti keldi"""
+        with self._lock:
+            self._pending[name] += value
+            self._events += 1
+            return self._events >= self.flush_every
+
+    def incr(self, name, value=1):
+        if self._add(name, value):
+            self.flush()
+
+    async def aincr(self, name, value=1):
+        if self._add(name, value):
+            await sync_to_async(self.flush, thread_sensitive=False)()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, dict.fromkeys(self.names, 0)
+            self._events = 0
+        for name, value in pending.items():
+            if not value:
+                continue
+            key = self._key(name)
+            if not cache.add(key, value, timeout=None):
+                try:
+                    cache.incr(key, value)
+                except ValueError:
+                    cache.set(key, value, timeout=None)
+
+    def snapshot(self):
+        shared = cache.get_many([self._key(name) for name in self.names])
+        with self._lock:
+            return {
+                name: shared.get(self._key(name), 0) + self._pending[name]
+                for name in self.names
+            }
+
+    def reset(self):
+        with self._lock:
+            self._pending = dict.fromkeys(self.names, 0)
+            self._events = 0
+        cache.delete_many([self._key(name) for name in self.names])
+
+
+def ratio(part, total):
+    return round(part / total, 4) if total else None
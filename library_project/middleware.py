@@ -0,0 +1,391 @@
+"""
+Middleware
+==========
+
+CompressionMiddleware - API javoblarini gzip / brotli bilan siqish.
+
+- Accept-Encoding (q-qiymatlari bilan) bo'yicha: br (brotli o'rnatilgan
+  bo'lsa) yoki gzip
+- COMPRESSION_MIN_SIZE dan kichik javoblar siqilmaydi
+- Content-Type bo'yicha daraja (COMPRESSION_LEVELS); ro'yxatda yo'q turlar
+  (rasm, allaqachon siqilgan fayllar) siqilmaydi
+- StreamingHttpResponse (eksport, ?stream=true) oqim bo'yicha siqiladi
+- ASGI'da siqish event loop'da emas: COMPRESSION_INLINE_MAX_SIZE dan katta
+  yoki brotli bilan siqiladigan javoblar thread'da (response_blocks),
+  async oqimning har bir bo'lagi ham thread'da siqiladi
+- Content-Encoding allaqachon bor bo'lsa (WhiteNoise, eksport gzip) tegilmaydi
+
+MIDDLEWARE ro'yxatida SecurityMiddleware'dan keyin turadi.
+
+SessionRefreshMiddleware - sliding expiry, lekin har so'rovda yozmasdan.
+SESSION_SAVE_EVERY_REQUEST=False bilan session faqat o'zgarganda saqlanadi;
+bu middleware o'qilgan session'ni SESSION_REFRESH_INTERVAL soniyada bir marta
+"o'zgargan" deb belgilaydi - muddati (va cookie) uzayadi. SessionMiddleware'dan
+keyin turadi.
+
+StaticFilesMiddleware - WhiteNoiseMiddleware'ning async variantli nusxasi.
+WhiteNoise 6 faqat sync, ASGI'da esa sync middleware butun zanjirni
+har so'rovda thread'ga va qaytib event loop'ga o'tkazadi. Bu yerda statik
+bo'lmagan so'rovlar to'g'ridan-to'g'ri keyingi (async) qatlamga o'tadi.
+
+InlineHooksMixin - MiddlewareMixin ASGI'da har bir hook'ni (process_request,
+process_response) sync_to_async bilan chaqiradi: har so'rovda ~12 marta
+thread'ga o'tish. Bazaga/diskka murojaat qilmaydigan hook'lar event loop'da
+to'g'ridan-to'g'ri bajariladi. Django middleware'larining shu mixin'li
+nusxalari (SecurityMiddleware, SessionMiddleware ...) MIDDLEWARE'da
+ishlatiladi; WSGI'da xatti-harakat o'zgarmaydi.
+
+ReadOnlyDatabaseMiddleware - xavfsiz metodli so'rovlardagi o'qishlarni
+readonly SQLite ulanishiga yo'naltiradi (library_project/db.py).
+"""
+
+import re
+import time
+import zlib
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth import middleware as auth
+from django.contrib.messages import middleware as messages
+from django.contrib.sessions import middleware as sessions
+from django.middleware import clickjacking, common, csrf, security
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from rest_framework.permissions import SAFE_METHODS
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from library_project import db
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - ixtiyoriy
+    brotli = None
+
+DEFAULT_MIN_SIZE = 1024
+# ASGI: bundan kichik gzip javoblar event loop'da siqiladi (thread'ga o'tish qimmatroq)
+DEFAULT_INLINE_MAX_SIZE = 16 * 1024
+
+# Content-Type -> {'gzip': 1..9, 'br': 0..11}
+DEFAULT_LEVELS = {
+    'application/json': {'gzip': 6, 'br': 5},
+    'application/x-ndjson': {'gzip': 5, 'br': 4},
+    'text/csv': {'gzip': 5, 'br': 4},
+    'text/html': {'gzip': 6, 'br': 5},
+    'application/msgpack': {'gzip': 4, 'br': 3},
+    'application/vnd.oai.openapi': {'gzip': 6, 'br': 5},
+    'application/vnd.oai.openapi+json': {'gzip': 6, 'br': 5},
+}
+
+ACCEPT_ENCODING_RE = re.compile(r'\s*([^\s;,]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?')
+
+
+def accepted_encodings(header):
+    """'gzip, br;q=0.9, *;q=0' -> {'gzip': 1.0, 'br': 0.9, '*': 0.0}"""
+    encodings = {}
+    for part in header.split(','):
+        match = ACCEPT_ENCODING_RE.match(part)
+        if not match:
+            continue
+        try:
+            quality = float(match.group(2)) if match.group(2) else 1.0
+        except ValueError:
+            continue
+        encodings[match.group(1).lower()] = quality
+    return encodings
+
+
+class GzipStream:
+    name = 'gzip'
+
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        # Har bir chunk'dan keyin klient ma'lumotni darhol olishi uchun
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class BrotliStream:
+    name = 'br'
+
+    def __init__(self, level):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+STREAMS = {'gzip': GzipStream, 'br': BrotliStream}
+
+
+def compress(data, encoding, level):
+    if encoding == 'br':
+        return brotli.compress(data, quality=level)
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_chunk(stream, chunk):
+    data = stream.compress(chunk)
+    # Har bir chunk'dan keyin flush - klient ma'lumotni darhol oladi
+    return data + stream.flush() if data else data
+
+
+def compress_iterator(chunks, stream):
+    for chunk in chunks:
+        data = compress_chunk(stream, chunk)
+        if data:
+            yield data
+    yield stream.finish()
+
+
+async def compress_async_iterator(chunks, stream):
+    # Bo'laklar katta (yuzlab qator) - siqish thread'da, event loop band bo'lmaydi
+    acompress_chunk = sync_to_async(compress_chunk, thread_sensitive=False)
+    async for chunk in chunks:
+        data = await acompress_chunk(stream, chunk)
+        if data:
+            yield data
+    yield await sync_to_async(stream.finish, thread_sensitive=False)()
+
+
+class InlineHooksMixin:
+    """
+    ASGI'da hook'lar event loop'da; request_blocks() / response_blocks()
+    True qaytarsa (baza, session yuklash) - odatdagidek thread'da
+    """
+
+    def request_blocks(self, request):
+        return False
+
+    def response_blocks(self, request, response):
+        return False
+
+    async def __acall__(self, request):
+        response = None
+        if hasattr(self, 'process_request'):
+            response = await self._run(self.request_blocks(request), self.process_request, request)
+        response = response or await self.get_response(request)
+        if hasattr(self, 'process_response'):
+            response = await self._run(
+                self.response_blocks(request, response), self.process_response, request, response
+            )
+        return response
+
+    @staticmethod
+    async def _run(blocks, hook, *args):
+        if blocks:
+            return await sync_to_async(hook, thread_sensitive=True)(*args)
+        return hook(*args)
+
+
+class SecurityMiddleware(InlineHooksMixin, security.SecurityMiddleware):
+    pass
+
+
+class SessionMiddleware(InlineHooksMixin, sessions.SessionMiddleware):
+    def response_blocks(self, request, response):
+        # Session saqlanadi
+        session = getattr(request, 'session', None)
+        return session is not None and (session.modified or settings.SESSION_SAVE_EVERY_REQUEST)
+
+
+class CommonMiddleware(InlineHooksMixin, common.CommonMiddleware):
+    pass
+
+
+class CsrfViewMiddleware(InlineHooksMixin, csrf.CsrfViewMiddleware):
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        if iscoroutinefunction(self):
+            # Django sync process_view'ni sync_to_async bilan o'raydi
+            self.process_view = self.aprocess_view
+
+    async def aprocess_view(self, request, callback, callback_args, callback_kwargs):
+        process_view = super().process_view
+        # csrf_exempt (barcha DRF view'lari) va xavfsiz metodlar - tekshiruvsiz
+        if getattr(callback, 'csrf_exempt', False) or request.method in ('GET', 'HEAD', 'OPTIONS', 'TRACE'):
+            return process_view(request, callback, callback_args, callback_kwargs)
+        # POST body o'qiladi
+        return await sync_to_async(process_view, thread_sensitive=True)(
+            request, callback, callback_args, callback_kwargs
+        )
+
+    def request_blocks(self, request):
+        return settings.CSRF_USE_SESSIONS
+
+    def response_blocks(self, request, response):
+        return settings.CSRF_USE_SESSIONS
+
+
+class AuthenticationMiddleware(InlineHooksMixin, auth.AuthenticationMiddleware):
+    # request.user - lazy, DRF autentifikatsiyasi view ichida
+    pass
+
+
+class MessageMiddleware(InlineHooksMixin, messages.MessageMiddleware):
+    def response_blocks(self, request, response):
+        # Xabarlar session'ga yoziladi (session yuklanishi mumkin)
+        storage = getattr(request, '_messages', None)
+        return storage is not None and (storage.used or storage.added_new)
+
+
+class XFrameOptionsMiddleware(InlineHooksMixin, clickjacking.XFrameOptionsMiddleware):
+    pass
+
+
+class CompressionMiddleware(InlineHooksMixin, MiddlewareMixin):
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.min_size = getattr(settings, 'COMPRESSION_MIN_SIZE', DEFAULT_MIN_SIZE)
+        self.inline_max_size = getattr(settings, 'COMPRESSION_INLINE_MAX_SIZE', DEFAULT_INLINE_MAX_SIZE)
+        self.levels = getattr(settings, 'COMPRESSION_LEVELS', DEFAULT_LEVELS)
+
+    def content_levels(self, response):
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        return self.levels.get(content_type)
+
+    def response_blocks(self, request, response):
+        # Oqim bo'lsa process_response faqat iterator'ni o'raydi (siqish - bo'laklab)
+        if response.streaming or response.has_header('Content-Encoding') or request.method == 'HEAD':
+            return False
+        levels = self.content_levels(response)
+        size = len(response.content)
+        if not levels or size < self.min_size:
+            return False
+        encoding = self.choose_encoding(request, levels)
+        # brotli kichik javobda ham gzip'dan ancha sekin
+        return encoding == 'br' or (encoding is not None and size >= self.inline_max_size)
+
+    def choose_encoding(self, request, levels):
+        accepted = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        wildcard = accepted.get('*', 0)
+        candidates = [
+            encoding for encoding in ('br', 'gzip')
+            if encoding in levels
+            and (encoding != 'br' or brotli is not None)
+            and accepted.get(encoding, wildcard) > 0
+        ]
+        if not candidates:
+            return None
+        # Bir xil q bo'lsa br (yaxshiroq siqadi)
+        return max(candidates, key=lambda encoding: accepted.get(encoding, wildcard))
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding') or request.method == 'HEAD':
+            return response
+        if not response.streaming and len(response.content) < self.min_size:
+            return response
+
+        levels = self.content_levels(response)
+        if not levels:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = self.choose_encoding(request, levels)
+        if encoding is None:
+            return response
+        level = levels[encoding]
+
+        if response.streaming:
+            stream = STREAMS[encoding](level)
+            if response.is_async:
+                response.streaming_content = compress_async_iterator(response.streaming_content, stream)
+            else:
+                response.streaming_content = compress_iterator(response.streaming_content, stream)
+            del response.headers['Content-Length']
+        else:
+            compressed = compress(response.content, encoding, level)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+
+DEFAULT_SESSION_REFRESH_INTERVAL = 300
+SESSION_REFRESHED_KEY = '_session_refreshed_at'
+
+
+class SessionRefreshMiddleware(InlineHooksMixin, MiddlewareMixin):
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.interval = getattr(settings, 'SESSION_REFRESH_INTERVAL', DEFAULT_SESSION_REFRESH_INTERVAL)
+
+    def process_response(self, request, response):
+        session = getattr(request, 'session', None)
+        # O'qilmagan session'ni (masalan, Token so'rovidagi cookie) yuklamaymiz
+        if session is None or not session.accessed or session.is_empty():
+            return response
+        now = int(time.time())
+        if session.modified or now - session.get(SESSION_REFRESHED_KEY, 0) >= self.interval:
+            session[SESSION_REFRESHED_KEY] = now
+        return response
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            # Fayl ochiladi (disk) - thread'da
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
+
+
+class ReadOnlyDatabaseMiddleware:
+    """
+    GET/HEAD/OPTIONS so'rovlaridagi o'qishlar readonly ulanishda
+    (library_project.db); MIDDLEWARE ro'yxatida birinchi turadi
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with db.read_only(request.method in SAFE_METHODS):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        # contextvar sync_to_async orqali view oqimiga ham o'tadi
+        with db.read_only(request.method in SAFE_METHODS):
+            return await self.get_response(request)
@@ -0,0 +1,36 @@
+"""
+Content negotiation
+===================
+
+BrowsableAPIRenderer faqat quyidagilarga beriladi:
+- DEBUG=True
+- staff session (Django AuthenticationMiddleware'dagi request.user)
+- BROWSABLE_API_HOSTS ro'yxatidagi host (masalan, debug.example.com)
+
+Qolgan barcha so'rovlar (brauzer Accept: text/html yuborsa ham) to'g'ridan-
+to'g'ri JSON renderer'ga tushadi - HTML shablon, formalar va ulardagi
+qo'shimcha serializer/DB so'rovlari ishlamaydi.
+"""
+
+from django.conf import settings
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.renderers import BrowsableAPIRenderer
+
+
+def browsable_api_allowed(request):
+    if settings.DEBUG:
+        return True
+    if request.get_host().split(':')[0] in getattr(settings, 'BROWSABLE_API_HOSTS', ()):
+        return True
+    # DRF autentifikatsiyasini ishga tushirmaslik uchun faqat session foydalanuvchisi
+    user = getattr(request._request, 'user', None)
+    return bool(user is not None and user.is_active and user.is_staff)
+
+
+class BrowsableAPINegotiation(DefaultContentNegotiation):
+    def select_renderer(self, request, renderers, format_suffix=None):
+        renderer, media_type = super().select_renderer(request, renderers, format_suffix)
+        if not isinstance(renderer, BrowsableAPIRenderer) or browsable_api_allowed(request):
+            return renderer, media_type
+        renderers = [item for item in renderers if not isinstance(item, BrowsableAPIRenderer)]
+        return super().select_renderer(request, renderers, format_suffix)
@@ -0,0 +1,106 @@
+"""
+Tezkor JSON va MessagePack renderer/parser'lar
+==============================================
+
+FastJSONRenderer - DRF JSONRenderer bilan baytma-bayt bir xil natija
+(compact, unicode, U+2028/U+2029 escape), lekin orjson o'rnatilgan bo'lsa
+u orqali. datetime/date/time va Decimal DRF encoder'iga uzatiladi, shuning
+uchun `price` va sana formatlari o'zgarmaydi. orjson bo'lmasa yoki indent
+so'ralsa (BrowsableAPI) - oddiy JSONRenderer.
+
+MessagePack (ixtiyoriy, `pip install msgpack`):
+    Accept: application/msgpack         -> MessagePackRenderer
+    Content-Type: application/msgpack   -> MessagePackParser
+"""
+
+import json
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - ixtiyoriy
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - ixtiyoriy
+    msgpack = None
+
+_encoder = encoders.JSONEncoder()
+
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+def _escape(content):
+    # JSONRenderer bilan bir xil: JavaScript'da qator oxiri hisoblanadigan belgilar
+    return content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+def _stock_dumps(data):
+    return json.dumps(
+        data,
+        cls=encoders.JSONEncoder,
+        ensure_ascii=False,
+        allow_nan=not api_settings.STRICT_JSON,
+        separators=(',', ':'),
+    ).encode()
+
+
+def json_dumps(data):
+    """Compact unicode JSON (bytes) - JSONRenderer.render() natijasi bilan bir xil"""
+    if orjson is not None:
+        try:
+            return _escape(orjson.dumps(data, default=_encoder.default, option=ORJSON_OPTIONS))
+        except TypeError:
+            # orjson qo'llamaydigan qiymat (masalan, 64 bitdan katta int)
+            pass
+    return _escape(_stock_dumps(data))
+
+
+class FastJSONRenderer(JSONRenderer):
+    """DEFAULT_RENDERER_CLASSES'da JSONRenderer o'rnida"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        return json_dumps(data)
+
+
+def _msgpack_default(obj):
+    # Decimal, date, datetime, lazy str ... - JSON bilan bir xil ko'rinishda
+    return _encoder.default(obj)
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=_msgpack_default, use_bin_type=True)
+
+
+class MessagePackParser(BaseParser):
+    media_type = 'application/msgpack'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False, strict_map_key=False)
+        except (ValueError, msgpack.ExtraData, msgpack.FormatError, msgpack.StackError) as exc:
+            raise ParseError(f'MessagePack parse error - {exc or type(exc).__name__}')
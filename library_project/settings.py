@@ -1,5 +1,7 @@
 from pathlib import Path
+from importlib.util import find_spec
 from decouple import config, Csv
+from django.core.exceptions import ImproperlyConfigured
 from datetime import timedelta
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -59,11 +61,10 @@ REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 
     # Authentication Classes
+    # Authorization sxemasi bo'yicha bittasi ishlaydi (accounts/authentication.py):
+    # Bearer -> JWT, Token -> Token, Basic -> Basic, session cookie -> Session
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',  # JWT auth (birinchi)
-        'rest_framework.authentication.TokenAuthentication',      # Token auth (ikkinchi)
-        'rest_framework.authentication.SessionAuthentication',   # Session auth (browsable API)
-        'rest_framework.authentication.BasicAuthentication',     # Basic auth (test uchun)
+        'accounts.authentication.SchemeDispatchAuthentication',
     ],
     
     # Permission Classes
@@ -72,12 +73,35 @@ REST_FRAMEWORK = {
     ],
     
     # Renderer Classes
+    # FastJSONRenderer: JSONRenderer bilan bir xil natija, orjson bo'lsa tezroq
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'library_project.renderers.FastJSONRenderer',
         'rest_framework.renderers.BrowsableAPIRenderer',
     ],
+
+    # BrowsableAPI faqat DEBUG, staff session yoki BROWSABLE_API_HOSTS uchun
+    'DEFAULT_CONTENT_NEGOTIATION_CLASS': 'library_project.negotiation.BrowsableAPINegotiation',
+
+    'DEFAULT_PARSER_CLASSES': [
+        'rest_framework.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
+# CompressionMiddleware: shundan kichik javoblar siqilmaydi (bayt)
+COMPRESSION_MIN_SIZE = config('COMPRESSION_MIN_SIZE', default=1024, cast=int)
+# ASGI: shundan katta (yoki brotli) javoblar event loop'da emas, thread'da siqiladi
+COMPRESSION_INLINE_MAX_SIZE = config('COMPRESSION_INLINE_MAX_SIZE', default=16 * 1024, cast=int)
+
+# Browsable API ochiq bo'lgan debug host'lar (vergul bilan)
+BROWSABLE_API_HOSTS = config('BROWSABLE_API_HOSTS', default='', cast=Csv())
+
+# MessagePack (ixtiyoriy): Accept / Content-Type: application/msgpack
+if find_spec('msgpack') is not None:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'].append('library_project.renderers.MessagePackRenderer')
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'].append('library_project.renderers.MessagePackParser')
+
 # SPECTACULAR_SETTINGS
 # https://drf-spectacular.readthedocs.io/en/latest/settings.html
 SPECTACULAR_SETTINGS = {
@@ -96,15 +120,25 @@ SPECTACULAR_SETTINGS = {
     'COMPONENT_SPLIT_REQUEST': True,
 }
 
+# Django middleware'lari library_project.middleware'dagi nusxalari bilan:
+# ASGI'da hook'lar thread'ga o'tmasdan (InlineHooksMixin), WSGI'da bir xil
 MIDDLEWARE = [
-    "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
-    "django.middleware.common.CommonMiddleware",
-    "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
-    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    # GET/HEAD/OPTIONS'dagi o'qishlar readonly SQLite ulanishida (SQLITE_PROFILE=production)
+    "library_project.middleware.ReadOnlyDatabaseMiddleware",
+    "library_project.middleware.SecurityMiddleware",
+    # API javoblarini gzip/brotli bilan siqish (javob body'sini o'zgartiruvchi
+    # boshqa middleware'lardan oldin turishi kerak)
+    "library_project.middleware.CompressionMiddleware",
+    # WhiteNoise (ASGI'da ham thread'siz)
+    "library_project.middleware.StaticFilesMiddleware",
+    "library_project.middleware.SessionMiddleware",
+    # Session muddatini har N daqiqada bir marta uzaytirish (SessionMiddleware'dan keyin)
+    "library_project.middleware.SessionRefreshMiddleware",
+    "library_project.middleware.CommonMiddleware",
+    "library_project.middleware.CsrfViewMiddleware",
+    "library_project.middleware.AuthenticationMiddleware",
+    "library_project.middleware.MessageMiddleware",
+    "library_project.middleware.XFrameOptionsMiddleware",
     # allauth uchun middleware
     "allauth.account.middleware.AccountMiddleware",
 ]
@@ -128,18 +162,77 @@ TEMPLATES = [
     },
 ]
 
-# === WSGI ===
+# === WSGI / ASGI ===
 WSGI_APPLICATION = "library_project.wsgi.application"
+ASGI_APPLICATION = "library_project.asgi.application"
+
+# BookViewSet list/retrieve/statistics - async ORM bilan (AsyncBookViewSet).
+# asgi.py yoqadi; WSGI'da har bir async view async_to_sync orqali ishlardi
+ASYNC_VIEWS = config("ASYNC_VIEWS", default=False, cast=bool)
 
 
 # === DATABASE ===
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
-DATABASES = {
-    "default": {
+# SQLITE_PROFILE:
+#   basic (standart) - SQLite/Django standartlari (rollback journal, har so'rovda yangi ulanish)
+#   production       - WAL, PRAGMA'lar, busy timeout, doimiy ulanishlar va
+#                      GET/HEAD/OPTIONS uchun readonly ulanish (library_project/db.py).
+#                      Deploy muhitida yoqiladi: journal_mode=WAL faylda saqlanadi va
+#                      yoniga -wal/-shm fayllarini yaratadi
+SQLITE_PROFILE = config("SQLITE_PROFILE", default="basic")
+DB_PATH = BASE_DIR / config("DB_NAME", default="db.sqlite3")
+
+if SQLITE_PROFILE == "production":
+    SQLITE_PRAGMAS = [
+        # O'quvchilar yozuvchini (va aksincha) bloklamaydi; rejim faylda saqlanadi
+        "PRAGMA journal_mode=WAL",
+        # WAL'da commit'da fsync yo'q (checkpoint'da bor): elektr uzilsa oxirgi
+        # tranzaksiyalar yo'qolishi mumkin, baza buzilmaydi
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA mmap_size={config('SQLITE_MMAP_SIZE', default=256 * 1024 * 1024, cast=int)}",
+        # Manfiy qiymat - KiB (har bir ulanish uchun)
+        f"PRAGMA cache_size=-{config('SQLITE_CACHE_KB', default=16384, cast=int)}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+    # Lock band bo'lsa darhol "database is locked" emas - shuncha soniya kutadi (busy_timeout)
+    SQLITE_BUSY_TIMEOUT = config("SQLITE_BUSY_TIMEOUT", default=5, cast=int)
+    DB_CONNECTION = {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / config("DB_NAME", default="db.sqlite3"),
+        "NAME": DB_PATH,
+        # Ulanish so'rovlar orasida qayta ishlatiladi (gthread'da - har bir thread uchun)
+        "CONN_MAX_AGE": config("DB_CONN_MAX_AGE", default=600, cast=int),
+        "CONN_HEALTH_CHECKS": True,
     }
-}
+    DATABASES = {
+        "default": {
+            **DB_CONNECTION,
+            "OPTIONS": {
+                "init_command": ";".join(SQLITE_PRAGMAS),
+                "timeout": SQLITE_BUSY_TIMEOUT,
+                # Yozish lock'i tranzaksiya boshida olinadi: DEFERRED'da o'qishdan
+                # yozishga o'tishda busy_timeout ishlamaydi va darhol xato bo'ladi
+                "transaction_mode": "IMMEDIATE",
+            },
+        },
+        "readonly": {
+            **DB_CONNECTION,
+            "OPTIONS": {
+                "init_command": ";".join([*SQLITE_PRAGMAS, "PRAGMA query_only=ON"]),
+                "timeout": SQLITE_BUSY_TIMEOUT,
+            },
+            "TEST": {"MIRROR": "default"},
+        },
+    }
+    DATABASE_ROUTERS = ["library_project.db.ReadOnlyRouter"]
+elif SQLITE_PROFILE == "basic":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": DB_PATH,
+        }
+    }
+else:
+    raise ImproperlyConfigured(f"SQLITE_PROFILE 'production' yoki 'basic' bo'lishi kerak, berilgan: {SQLITE_PROFILE!r}")
 
 # === PASSWORD VALIDATION ===
 AUTH_PASSWORD_VALIDATORS = [
@@ -165,13 +258,29 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # === CACHE SETTINGS (Password Reset uchun) ===
+# Barcha gunicorn worker'lari uchun umumiy SQLite (WAL) cache
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
-    }
+        'BACKEND': 'library_project.cache.SQLiteCache',
+        'LOCATION': config('CACHE_LOCATION', default=str(BASE_DIR / 'cache.sqlite3')),
+        'TIMEOUT': 300,
+        'OPTIONS': {
+            'MAX_ENTRIES': config('CACHE_MAX_ENTRIES', default=10000, cast=int),
+            'CULL_FREQUENCY': 10,
+        },
+    },
+    # JWT deny-list (accounts/revocation.py): alohida fayl, LRU tozalashsiz -
+    # yozuvlar faqat token muddati tugaganda o'chadi
+    'revocations': {
+        'BACKEND': 'library_project.cache.SQLiteCache',
+        'LOCATION': config('REVOCATION_CACHE_LOCATION', default=str(BASE_DIR / 'revocations.sqlite3')),
+        'OPTIONS': {'MAX_ENTRIES': None},
+    },
 }
 
+# manage.py test: cache'lar vaqtinchalik fayllarda (library_project/test_runner.py)
+TEST_RUNNER = 'library_project.test_runner.TemporaryCacheRunner'
+
 # === JWT SETTINGS ===
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=30),     # 30 daqiqa
@@ -189,12 +298,28 @@ SIMPLE_JWT = {
     
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
     'TOKEN_TYPE_CLAIM': 'token_type',
+
+    # Deny-list (accounts/revocation.py) bilan
+    'TOKEN_REFRESH_SERIALIZER': 'accounts.serializers.DenyListTokenRefreshSerializer',
+    'TOKEN_VERIFY_SERIALIZER': 'accounts.serializers.DenyListTokenVerifySerializer',
 }
 
+# === PASSWORD HASHING POOL (accounts/hashing.py) ===
+# Login/register'dagi PBKDF2 shu pool'da; navbat to'lsa 503 + Retry-After.
+# Chegara jarayon uchun; WSGI worker'larda gunicorn.conf.py GUNICORN_THREADS
+# bo'yicha kichikroq qiymat beradi (aks holda navbat hech qachon to'lmaydi)
+PASSWORD_HASH_WORKERS = config('PASSWORD_HASH_WORKERS', default=2, cast=int)
+PASSWORD_HASH_QUEUE_SIZE = config('PASSWORD_HASH_QUEUE_SIZE', default=16, cast=int)
+
 # === SESSION SETTINGS ===
-SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+# Session cache orqali o'qiladi (bazaga faqat yozishda), har so'rovda saqlanmaydi:
+# muddat SESSION_REFRESH_INTERVAL soniyada bir marta uzaytiriladi
+# (library_project.middleware.SessionRefreshMiddleware).
+# Eskirgan qatorlar: python manage.py sweep_sessions --interval 3600
+SESSION_ENGINE = config('SESSION_ENGINE', default='django.contrib.sessions.backends.cached_db')
 SESSION_COOKIE_AGE = 86400  # 24 hours (seconds)
-SESSION_SAVE_EVERY_REQUEST = True
+SESSION_SAVE_EVERY_REQUEST = False
+SESSION_REFRESH_INTERVAL = config('SESSION_REFRESH_INTERVAL', default=300, cast=int)
 SESSION_COOKIE_NAME = 'library_sessionid'
 SESSION_COOKIE_HTTPONLY = True
 SESSION_COOKIE_SECURE = False  # Production'da True qiling
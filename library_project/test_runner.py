@@ -0,0 +1,33 @@
+"""
+Test runner
+===========
+
+DiscoverRunner + vaqtinchalik cache: settings.CACHES'dagi har bir alias
+(default - SQLiteCache, revocations - JWT deny-list) test davomida
+vaqtinchalik katalogdagi faylga qaraydi. Testlar BASE_DIR/cache.sqlite3 va
+revocations.sqlite3 ga yozmaydi, oldingi ishga tushirishlardan qolgan
+yozuvlar testlarga ta'sir qilmaydi.
+"""
+
+import os
+import tempfile
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TemporaryCacheRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._cache_directory = tempfile.TemporaryDirectory()
+        self._cache_override = override_settings(CACHES={
+            alias: {**options, 'LOCATION': os.path.join(self._cache_directory.name, f'cache-{alias}.sqlite3')}
+            for alias, options in settings.CACHES.items()
+        })
+        self._cache_override.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._cache_override.disable()
+        self._cache_directory.cleanup()
+        super().teardown_test_environment(**kwargs)